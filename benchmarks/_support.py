@@ -0,0 +1,85 @@
+"""Synthetic workloads shared by the benchmark scripts."""
+import os
+import subprocess
+from pathlib import Path
+
+
+def git(*args, cwd=None):
+    """Runs a git command quietly, raising on failure."""
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+
+
+def make_git_repo(path, files=50, file_size=4096, commits=5):
+    """
+    Creates a non-bare git repo with random content and a linear history.
+
+    Args:
+        path (Path): The directory to create.
+        files (int, optional): Files touched by each commit. Defaults to 50.
+        file_size (int, optional): Size of each file in bytes. Defaults to 4096.
+        commits (int, optional): Number of commits. Defaults to 5.
+
+    Returns:
+        str: The `file://` URL of the repo.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    git("init", "-q", "-b", "main", cwd=path)
+    for commit in range(commits):
+        for i in range(files):
+            target = path / "Widgets" / f"widget{i % 10}" / f"file{i}.bin"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(os.urandom(file_size))
+        git("add", "-A", cwd=path)
+        git("-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "-q", "-m", f"commit {commit}", cwd=path)
+    return path.resolve().as_uri()
+
+
+def make_bare_repo(path, files=50, file_size=4096, commits=5):
+    """
+    Creates a bare git repo with synthetic `Widgets/` and `AppConfig/` content.
+
+    Args:
+        path (Path): The bare repo directory to create, e.g. `origin/app1.git`.
+        files (int, optional): Files touched by each commit. Defaults to 50.
+        file_size (int, optional): Size of each file in bytes. Defaults to 4096.
+        commits (int, optional): Number of commits. Defaults to 5.
+
+    Returns:
+        str: The `file://` URL of the bare repo.
+    """
+    path = Path(path)
+    work = path.with_name(path.name + ".work")
+    make_git_repo(work, files, file_size, commits)
+    (work / "AppConfig").mkdir(exist_ok=True)
+    (work / "AppConfig" / "config.json").write_text("{}")
+    git("add", "-A", cwd=work)
+    git("-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "-q", "-m", "app config", cwd=work)
+    git("clone", "-q", "--bare", str(work), str(path))
+    return path.resolve().as_uri()
+
+
+def make_exb_zip(files=2000, file_size=2048):
+    """
+    Builds an in-memory zip shaped like an Experience Builder archive.
+
+    Args:
+        files (int, optional): Number of files under `ArcGISExperienceBuilder/`. Defaults to 2000.
+        file_size (int, optional): Size of each file in bytes. Half of each file is random so the
+            archive does not compress away. Defaults to 2048.
+
+    Returns:
+        bytes: The zip archive.
+    """
+    import io
+    import zipfile
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(files):
+            folder = ("client/dist/widgets", "client/jimu-core", "server/src")[i % 3]
+            content = os.urandom(file_size // 2) + b"x" * (file_size - file_size // 2)
+            zf.writestr(f"ArcGISExperienceBuilder/{folder}/pkg{i % 40}/file{i}.js", content)
+        zf.writestr("ArcGISExperienceBuilder/client/package.json", "{}")
+        zf.writestr("ArcGISExperienceBuilder/server/public/apps/.keep", "")
+    return buffer.getvalue()
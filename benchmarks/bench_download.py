@@ -0,0 +1,65 @@
+"""
+Compare single-stream and segmented downloads against a local throttled HTTP server.
+
+Each response is throttled independently, like a per-connection limit on the Esri host, so N
+connections should approach N times the throughput of one.
+
+Usage:
+    python -m benchmarks.bench_download --size-mb 8 --rate-mb 4 --connections 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from exb_dev_cli.utils.download import download_file, download_segmented
+from tests.http_server import ArchiveServer
+
+
+def run(size_mb, rate_mb, connections):
+    """
+    Times one download with a single stream and one with `connections` segments.
+
+    Args:
+        size_mb (float): Size of the synthetic archive in MiB.
+        rate_mb (float): Per-connection throttle in MiB/s.
+        connections (int): Number of connections for the segmented run.
+
+    Returns:
+        dict: Seconds taken by the `single` and the `segmented` run.
+    """
+    data = os.urandom(int(size_mb * 1024 * 1024))
+    timings = {}
+    with ArchiveServer({"/exb.zip": data}, bytes_per_second=int(rate_mb * 1024 * 1024)) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        url = server.url("/exb.zip")
+
+        start = time.perf_counter()
+        download_file(url, Path(tmp) / "single.zip")
+        timings["single"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        download_segmented(url, Path(tmp) / "segmented.zip", connections=connections)
+        timings["segmented"] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--rate-mb", type=float, default=4, help="Per-connection throttle in MiB/s.")
+    parser.add_argument("--connections", type=int, default=4)
+    args = parser.parse_args()
+    if args.connections < 2:
+        parser.error("--connections must be at least 2 to compare against a single stream")
+
+    timings = run(args.size_mb, args.rate_mb, args.connections)
+    for label, connections in (("single", 1), ("segmented", args.connections)):
+        seconds = timings[label]
+        print(f"{connections:>3} connection(s): {seconds:6.2f}s  {args.size_mb / seconds:6.2f} MiB/s")
+    print(f"Speed-up: {timings['single'] / timings['segmented']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare cold and warm clone times through the shared mirror cache using local `file://` repos.
+
+Cold: no mirror exists, so the clone creates one first. Warm: the mirror exists and only a fetch
+plus a local clone is needed. A direct clone without mirrors is shown for reference.
+
+Usage:
+    python -m benchmarks.bench_mirrors --repos 4 --commits 20 --files 100
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._support import make_git_repo
+from exb_dev_cli.utils.app_manager import clone_repo
+from exb_dev_cli.utils.mirrors import MirrorCache
+
+
+def time_clones(urls, workspace, mirrors):
+    """Clones every URL into `workspace` and returns the elapsed seconds."""
+    start = time.perf_counter()
+    for i, url in enumerate(urls):
+        clone_repo(url, workspace / f"repo{i}", quiet=True, mirrors=mirrors)
+    return time.perf_counter() - start
+
+
+def run(repos, commits, files, file_size):
+    """
+    Times direct, cold-mirror and warm-mirror clones of synthetic repos.
+
+    Returns:
+        dict: Seconds taken, keyed by scenario name.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        urls = [make_git_repo(tmp / "origin" / f"repo{i}", files, file_size, commits) for i in range(repos)]
+        mirrors = MirrorCache(tmp / "mirrors")
+        return {
+            "direct": time_clones(urls, tmp / "direct", None),
+            "cold": time_clones(urls, tmp / "cold", mirrors),
+            "warm": time_clones(urls, tmp / "warm", mirrors),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repos", type=int, default=4)
+    parser.add_argument("--commits", type=int, default=20)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--file-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    timings = run(args.repos, args.commits, args.files, args.file_size)
+    for scenario, seconds in timings.items():
+        print(f"{scenario:>7}: {seconds:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
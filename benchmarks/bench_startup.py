@@ -0,0 +1,77 @@
+"""
+Measure CLI cold start and fail if it regresses past a budget.
+
+Reports the median wall time of `python -m exb_dev_cli.cli --help` above a bare interpreter start,
+plus the slowest imports from an `-X importtime` run of `import exb_dev_cli.cli`.
+
+Usage:
+    python -m benchmarks.bench_startup --budget-ms 100 --runs 10
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def median_runtime(args, runs):
+    """Returns the median wall time in seconds of running `python <args>` from the repo root."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def import_breakdown(module="exb_dev_cli.cli"):
+    """
+    Runs `python -X importtime -c "import <module>"` and returns its imports sorted by cumulative time.
+
+    Returns:
+        list: (cumulative_microseconds, self_microseconds, module_name) tuples, slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    )
+    # importtime reports the interpreter's own start-up imports (site and friends) first; only keep
+    # the imports triggered by `module`, which are the lines after site finished.
+    lines = [line for line in result.stderr.splitlines() if line.startswith("import time:")][1:]
+    site_end = max((i for i, line in enumerate(lines) if line.rstrip().endswith("| site")), default=-1)
+    rows = []
+    for line in lines[site_end + 1:]:
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return sorted(rows, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100, help="Allowed start-up time above a bare interpreter.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show.")
+    args = parser.parse_args()
+
+    print("Slowest imports under exb_dev_cli.cli (cumulative / self, ms):")
+    for cumulative, own, name in import_breakdown()[:args.top]:
+        print(f"  {cumulative / 1000:7.1f} {own / 1000:7.1f}  {name}")
+
+    bare = median_runtime(["-c", "pass"], args.runs)
+    cli_help = median_runtime(["-m", "exb_dev_cli.cli", "--help"], args.runs)
+    overhead_ms = (cli_help - bare) * 1000
+    print(f"python -c pass:                   {bare * 1000:7.1f} ms")
+    print(f"python -m exb_dev_cli.cli --help: {cli_help * 1000:7.1f} ms ({overhead_ms:.1f} ms above a bare interpreter)")
+
+    if overhead_ms > args.budget_ms:
+        print(f"FAIL: start-up overhead {overhead_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"OK: start-up overhead within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+End-to-end benchmark suite over local git and HTTP stand-ins.
+
+Builds N bare git repos served over `file://` and a fake Experience Builder zip served by a local
+HTTP server, then times the main workflows. Results are written as JSON and can be compared with a
+stored baseline so regressions are caught before a release.
+
+Timings depend on the machine, so no baseline is committed. Record one on the machine that runs the
+comparison, from the commit to compare against, then compare later builds with it:
+
+    git checkout <release tag>
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    git checkout -
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --tolerance 0.25
+
+Usage:
+    python -m benchmarks.suite --repos 8 --zip-files 5000 --output bench_output.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks._support import make_bare_repo, make_exb_zip
+from exb_dev_cli.utils import app_manager
+from exb_dev_cli.utils.cache import ArchiveCache
+from tests.http_server import ArchiveServer
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silences the progress output of the timed functions."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class Workload:
+    """
+    Class to build and hold the synthetic workload for one suite run.
+
+    Attributes:
+        root (Path): The temporary directory everything is created in.
+        config_file (Path): An applications.json pointing at the bare repos.
+        archive (bytes): The fake Experience Builder zip.
+    """
+
+    def __init__(self, root: Path, repos: int, repo_files: int, repo_file_size: int, commits: int,
+                 zip_files: int, zip_file_size: int):
+        self.root = root
+        apps = {
+            f"app{i}": make_bare_repo(root / "origin" / f"app{i}.git", repo_files, repo_file_size, commits)
+            for i in range(repos)
+        }
+        core_widgets = make_bare_repo(root / "origin" / "widgets.git", repo_files, repo_file_size, commits)
+        self.config_file = root / "applications.json"
+        self.config_file.write_text(json.dumps({"Applications": apps, "Core_Widgets": core_widgets}))
+        self.archive = make_exb_zip(zip_files, zip_file_size)
+        self._run = 0
+
+    def fresh_dir(self, name):
+        """Returns a new, empty directory for one timed run."""
+        self._run += 1
+        path = self.root / "runs" / f"{name}-{self._run}"
+        path.mkdir(parents=True)
+        return path
+
+
+def bench_clone(workload, jobs):
+    def run():
+        with quiet():
+            app_manager.clone_repos_from_config(workload.config_file, workload.fresh_dir("clone"), jobs=jobs,
+                                                use_mirrors=False)
+    return run
+
+
+def bench_clone_warm_mirror(workload, jobs):
+    # Populate the mirrors once so every timed run is warm
+    with quiet():
+        app_manager.clone_repos_from_config(workload.config_file, workload.fresh_dir("clone-mirror"), jobs=jobs)
+
+    def run():
+        with quiet():
+            app_manager.clone_repos_from_config(workload.config_file, workload.fresh_dir("clone-mirror"), jobs=jobs)
+    return run
+
+
+def bench_install(workload, server, use_cache):
+    versions = workload.root / "versions.json"
+    versions.write_text(json.dumps({"Experience_Builder": {"vbench": server.url("/exb.zip")}}))
+    cache = ArchiveCache(workload.root / "archive-cache")
+
+    def run():
+        with quiet(), patch.object(app_manager, "VERSIONS_JSON", versions):
+            app_manager.install_experience_builder("vbench", workload.fresh_dir("install"),
+                                                   use_cache=use_cache, cache=cache)
+    return run
+
+
+def bench_clone_and_symlink(workload):
+    with quiet(), patch.object(app_manager, "VERSIONS_JSON", workload.root / "versions.json"):
+        exb_root = workload.fresh_dir("exb")
+        app_manager.install_experience_builder("vbench", exb_root, cache=ArchiveCache(workload.root / "archive-cache"))
+    exb_path = exb_root / "ArcGISExperienceBuilder"
+
+    def run():
+        with quiet(), working_directory(workload.fresh_dir("clone-and-symlink")):
+            app_manager.clone_and_symlink("app0", workload.config_file, exb_path, use_mirrors=False)
+            for link in [exb_path / "client" / "app0_widgets", exb_path / "server" / "public" / "apps" / "app0"]:
+                if link.is_symlink():
+                    link.unlink()
+    return run
+
+
+def bench_link(workload):
+    repos_dir = workload.fresh_dir("link-repos")
+    with quiet():
+        app_manager.clone_repos_from_config(workload.config_file, repos_dir, use_mirrors=False)
+
+    def run():
+        exb_path = workload.fresh_dir("link-exb")
+        (exb_path / "client").mkdir()
+        (exb_path / "server" / "public" / "apps").mkdir(parents=True)
+        with quiet():
+            app_manager.link_repos_from_config(workload.config_file, repos_dir, exb_path)
+    return run
+
+
+def measure(run, repeat):
+    """Runs a benchmark `repeat` times and returns its median and minimum wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+
+def run_suite(args):
+    """
+    Builds the workload, times every benchmark and returns the results document.
+
+    Returns:
+        dict: `meta` describing the run and `results` mapping benchmark names to timings.
+    """
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.dict(os.environ, {"EXB_DEV_CLI_CACHE": str(Path(tmp) / "cache")}):
+        workload = Workload(Path(tmp), args.repos, args.repo_files, args.repo_file_size, args.commits,
+                            args.zip_files, args.zip_file_size)
+        with ArchiveServer({"/exb.zip": workload.archive}) as server:
+            benchmarks = {
+                "clone_repos_from_config": bench_clone(workload, args.jobs),
+                "clone_repos_from_config_warm_mirror": bench_clone_warm_mirror(workload, args.jobs),
+                "install_experience_builder": bench_install(workload, server, use_cache=False),
+                "install_experience_builder_cached": bench_install(workload, server, use_cache=True),
+                "clone_and_symlink": bench_clone_and_symlink(workload),
+                "link_repos_from_config": bench_link(workload),
+            }
+            results = {}
+            for name, run in benchmarks.items():
+                if args.only and name not in args.only:
+                    continue
+                results[name] = measure(run, args.repeat)
+                print(f"{name:<40} median {results[name]['median']:7.3f}s  min {results[name]['min']:7.3f}s")
+
+    params = {k: v for k, v in vars(args).items()
+              if k not in ("output", "baseline", "save_baseline", "only", "tolerance", "min_delta")}
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "params": params},
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance, min_delta=0.005):
+    """
+    Compares median timings with a baseline.
+
+    Args:
+        results (dict): The `results` section of the current run.
+        baseline (dict): The `results` section of the baseline.
+        tolerance (float): Allowed slowdown as a fraction, e.g. 0.25 for 25%.
+        min_delta (float, optional): Slowdowns smaller than this many seconds are treated as noise.
+
+    Returns:
+        list: Names of benchmarks slower than the baseline by more than the tolerance.
+    """
+    regressions = []
+    for name, timing in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["median"], timing["median"]
+        change = (after - before) / before if before else 0.0
+        regressed = change > tolerance and after - before > min_delta
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<40} {before:7.3f}s -> {after:7.3f}s  {change:+7.1%}  {flag}".rstrip())
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repos", type=int, default=8, help="Number of application repos.")
+    parser.add_argument("--repo-files", type=int, default=50, help="Files touched per commit in each repo.")
+    parser.add_argument("--repo-file-size", type=int, default=4096)
+    parser.add_argument("--commits", type=int, default=5)
+    parser.add_argument("--zip-files", type=int, default=2000, help="Files in the fake Experience Builder zip.")
+    parser.add_argument("--zip-file-size", type=int, default=2048)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", help="Run only this benchmark. Repeatable.")
+    parser.add_argument("--output", default="bench_output.json", help="Where to write the results JSON.")
+    parser.add_argument("--baseline", help="Results JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline.")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="Ignore slowdowns below this many seconds.")
+    parser.add_argument("--save-baseline", help="Also write the results to this baseline path.")
+    args = parser.parse_args()
+
+    if args.baseline and not Path(args.baseline).is_file():
+        parser.error(f"baseline {args.baseline} not found; record one first with --save-baseline {args.baseline}")
+    baseline = json.loads(Path(args.baseline).read_text())["results"] if args.baseline else None
+
+    document = run_suite(args)
+    for path in filter(None, [args.output, args.save_baseline]):
+        Path(path).write_text(json.dumps(document, indent=2))
+        print(f"Results written to {path}")
+
+    if baseline is not None:
+        regressions = compare(document["results"], baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"FAIL: {len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+        print("OK: no regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from pathlib import Path
 import subprocess
 
-from utils.symlinks import create_symlink
+from exb_dev_cli.utils.symlinks import create_symlink
 
 
 class ApplicationRepo:
@@ -71,24 +71,42 @@ class ApplicationRepo:
 
         Args:
         """
-        config_symlink = self.exb_installation / 'server' / 'public' / '0'
+        config_symlink = self.exb_installation / 'server' / 'public' / 'apps' / self.app_name
         target_path = self.app_path / "AppConfig"
 
         create_symlink(target_path, config_symlink)
 
 
-    def create_symlinks(self, exb_installation: str):
+    def copy_folders(self):
+        """
+        Copy the widgets and app config folders into the Experience Builder installation.
+
+        Used instead of symlinks where they cannot be created. Only files that changed since the last
+        copy are written.
+        """
+        from exb_dev_cli.utils.copy_sync import TreeMirror
+
+        exb_installation = Path(self.exb_installation)
+        TreeMirror(self.app_path / "Widgets", exb_installation / 'client' / f"{self.app_name}_widgets").sync()
+        TreeMirror(self.app_path / "AppConfig", exb_installation / 'server' / 'public' / 'apps' / self.app_name).sync()
+
+    def create_symlinks(self, exb_installation: str, mode: str = "symlink"):
         """
         Create symlinks for the application repo, widgets, and app config in the Experience Builder installation.
 
         Args:
             exb_installation (ExperienceBuilderInstallation): The Experience Builder installation object.
+            mode (str, optional): `symlink`, or `copy` to mirror the folders instead. Defaults to `symlink`.
         """
         if not self.app_path.exists():
             raise FileNotFoundError(f"Application repo {self.app_name} not found at {self.app_path}")
 
         self.exb_installation = exb_installation
 
+        if mode == "copy":
+            self.copy_folders()
+            return
+
         # Create the symlinks for widgets (both app and common, if available)
         self.create_widgets_symlink()
 
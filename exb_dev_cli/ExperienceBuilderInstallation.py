@@ -1,6 +1,9 @@
 from pathlib import Path
 
-from ApplicationRepo import ApplicationRepo
+from exb_dev_cli.ApplicationRepo import ApplicationRepo
+from exb_dev_cli.utils.remove import remove_paths
+from exb_dev_cli.utils.state import AppRecord, InstallationState, link_target
+from exb_dev_cli.utils.symlinks import release_links
 
 class ExperienceBuilderInstallation:
     """
@@ -9,7 +12,7 @@ class ExperienceBuilderInstallation:
     Attributes:
         exb_path (Path): The path to the Experience Builder installation.
         exb_version (str): The version of the Experience Builder installation.
-        apps (dict): A dictionary of ApplicationRepo instances, mapping app names to repo instances.
+        apps (dict): A dictionary of AppRecord instances, mapping app names to their records.
     """
 
     def __init__(self, exb_path: Path, exb_version: str):
@@ -20,9 +23,12 @@ class ExperienceBuilderInstallation:
             exb_path (Path): The path to the Experience Builder installation.
             exb_version (str): The version of the Experience Builder installation.
         """
-        self.exb_path = exb_path
+        self.exb_path = Path(exb_path)
         self.exb_version = exb_version
-        self.apps = {}  # A dictionary to hold ApplicationRepo instances for each app
+        self.apps = {}  # A dictionary to hold AppRecord instances for each app
+        self._state = InstallationState(self.exb_path)
+        self._client_dir = None
+        self._server_dir = None
 
         # Load installed apps
         self._load_installed_apps()
@@ -37,8 +43,11 @@ class ExperienceBuilderInstallation:
         Raises:
             FileNotFoundError: If the client directory is not found.
         """
+        if self._client_dir is not None:
+            return self._client_dir
         client_dir = self.exb_path / "client"
         if client_dir.exists():
+            self._client_dir = client_dir
             return client_dir
         raise FileNotFoundError(f"Client directory not found at {client_dir}")
 
@@ -52,24 +61,29 @@ class ExperienceBuilderInstallation:
         Raises:
             FileNotFoundError: If the server directory is not found.
         """
+        if self._server_dir is not None:
+            return self._server_dir
         server_dir = self.exb_path / "server"/ "public" / "apps"
         if server_dir.exists():
+            self._server_dir = server_dir
             return server_dir
         raise FileNotFoundError(f"Server directory not found at {server_dir}")
 
     def _load_installed_apps(self):
         """
-        Loads the installed applications from the `server/public/apps` directory and associates them with their repos.
+        Loads the installed applications from the persisted state, rescanning `server/public/apps`
+        only when the installation changed since the state was saved. A rescan is saved so the next
+        load can skip it.
         """
-        apps_path = self.server_directory / "public" / "apps"
-        if apps_path.exists():
-            for app_folder in apps_path.iterdir():
-                if app_folder.is_dir():
-                    app_name = app_folder.name
-                    app_repo_path = Path(f"repos/{app_name}")  # Assuming repo is in a "repos" directory
-                    if app_repo_path.exists():
-                        app_repo = ApplicationRepo(app_repo_path, app_name)
-                        self.apps[app_name] = app_repo
+        self.apps, scanned = self._state.load()
+        if scanned:
+            self._save_state()
+
+    def _save_state(self):
+        """
+        Persists the current app records.
+        """
+        self._state.save(self.apps)
 
     def install_app(self, app_name: str, app_repo_url: str, branch: str = "main"):
         """
@@ -98,27 +112,52 @@ class ExperienceBuilderInstallation:
         """
         # Add the app repo to the installed apps
         app_repo_path = Path(f"./{app_name}")
-        self.apps[app_name] = app_repo_path
         
         app_repo = ApplicationRepo(app_name, app_repo_url, app_repo_path, self.exb_path)
 
         # # Create the symlinks for the app
         app_repo.create_symlinks(self.exb_path)
 
-    def remove_app(self, app_name: str):
+        # Record the targets the links actually point to, exactly as a rescan would read them
+        self.apps[app_name] = AppRecord(
+            app_name, app_name, app_repo_path.resolve(),
+            config_link=link_target(self.exb_path / "server" / "public" / "apps" / app_name),
+            widgets_link=link_target(self.exb_path / "client" / f"{app_name}_widgets"),
+        )
+        self._save_state()
+
+    def remove_app(self, app_name: str, delete_repo: bool = False, background: bool = False, force: bool = False):
         """
         Removes an app and its associated symlinks.
 
         Args:
             app_name (str): The name of the app to remove.
+            delete_repo (bool): Also delete the app's cloned repo. Defaults to False.
+            background (bool): Move the repo to the trash and delete it in the background. Defaults to False.
+            force (bool): Delete the repo even if it has uncommitted changes or unpushed commits. Defaults to False.
+
+        Raises:
+            ValueError: If the app is not installed, or its repo holds work that exists nowhere else.
         """
-        if app_name in self.apps:
-            app_repo = self.apps[app_name]
-            app_repo.remove_symlinks()  # Method to remove the symlinks (to be implemented)
-            del self.apps[app_name]
-        else:
+        from exb_dev_cli.utils.app_manager import _deletable_repo
+
+        if app_name not in self.apps:
             raise ValueError(f"App {app_name} not found.")
 
+        record = self.apps[app_name]
+        # Checked before anything is unlinked, so a refused delete leaves the app fully installed
+        repo_path = None
+        if delete_repo and record.repo_path is not None:
+            repo_path = _deletable_repo(record.repo_path.parent, record.repo_path.name, force=force)
+        release_links([
+            self.exb_path / "client" / f"{record.name}_widgets",
+            self.exb_path / "server" / "public" / "apps" / record.app_id,
+        ])
+        if repo_path is not None:
+            remove_paths([repo_path], background=background)
+        del self.apps[app_name]
+        self._save_state()
+
 if __name__ == "__main__":
     exb_install_path = Path("ArcGISExperienceBuilder")
 
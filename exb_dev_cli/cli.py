@@ -1,44 +1,113 @@
 import click
+import time
 from pathlib import Path
 
-from exb_dev_cli.utils.app_manager import load_config, get_repo_details, install_experience_builder, clone_repos_from_config, clone_repo, clone_and_symlink
+# Command implementations are imported inside each command so that `--help` and light commands do
+# not pay for loading requests, zipfile and the rest of the dependency graph.
 
 
 @click.group()
-def cli():
+@click.option('--trace', 'trace_file', default=None, type=click.Path(dir_okay=False),
+              help="Record timing spans to this file (Chrome trace JSON, or JSON lines if it ends in .jsonl).")
+@click.pass_context
+def cli(ctx, trace_file):
     """
     Experience Builder CLI for managing installations and repositories.
     
     This command-line tool allows users to install specific versions of Experience Builder
     and clone repositories based on a configuration file.
     """
-    pass
+    if trace_file:
+        from exb_dev_cli.utils.tracing import span, start_tracing, stop_tracing
+
+        def finish_trace():
+            tracer = stop_tracing(trace_file)
+            click.echo(f"\nTrace written to {trace_file}\n{tracer.summary()}")
+
+        start_tracing()
+        # Resources close in reverse order, so the command span ends before the trace is written
+        ctx.call_on_close(finish_trace)
+        ctx.with_resource(span(f"command {ctx.invoked_subcommand}", "cli", argv=ctx.args))
 
 @click.command()
 @click.option('--version', required=True, help="Experience Builder version to install.")
 @click.option('--destination', default='./', help="Directory where to install Experience Builder.")
-def install(version, destination):
+@click.option('--connections', default=1, show_default=True, type=click.IntRange(min=1), help="Parallel connections to download the archive with.")
+@click.option('--no-cache', is_flag=True, help="Download into the destination instead of using the shared archive cache.")
+@click.option('--workers', default=None, type=click.IntRange(min=1), help="Processes used to extract the archive. Defaults to the CPU count.")
+@click.option('--store', 'use_store', is_flag=True, help="Build the installation from hardlinks into the shared deduplicated file store.")
+@click.option('--lockfile', default=None, type=click.Path(dir_okay=False), help="Lockfile to check and update; skips the install if it is already in place.")
+@click.option('--frozen', is_flag=True, help="Install exactly the version and archive in the lockfile.")
+def install(version, destination, connections, no_cache, workers, use_store, lockfile, frozen):
     """
     Install a specific version of Experience Builder.
 
     Args:
         version (str): The version of Experience Builder to install.
         destination (str): The directory where to install Experience Builder.
+        connections (int): The number of parallel connections to download the archive with.
+        no_cache (bool): Skip the shared archive cache.
+        workers (int, optional): The number of processes used to extract the archive.
+        use_store (bool): Link files from the deduplicated file store instead of extracting a copy.
+        lockfile (str, optional): The workspace lockfile.
+        frozen (bool): Fail if the version or archive differ from the lockfile.
     
     Raises:
         click.ClickException: If an error occurs during installation.
     """
+    from exb_dev_cli.utils.app_manager import install_experience_builder
+
     try:
-        install_experience_builder(version, destination)
+        lock = None
+        if lockfile or frozen:
+            from exb_dev_cli.utils.lockfile import LOCK_FILE_NAME, Lockfile
+
+            lock = Lockfile(lockfile or LOCK_FILE_NAME, frozen=frozen)
+        install_experience_builder(version, destination, connections=connections, use_cache=not no_cache, workers=workers,
+                                   use_store=use_store, lock=lock)
         click.echo(f"Successfully installed Experience Builder version {version}.")
     except Exception as e:
         click.echo(f"Error: {e}")
 
+@click.command()
+@click.option('--from', 'from_version', required=True, help="Experience Builder version currently installed.")
+@click.option('--to', 'to_version', required=True, help="Experience Builder version to upgrade to.")
+@click.option('--destination', default='./', help="Directory where Experience Builder is installed.")
+@click.option('--connections', default=1, show_default=True, type=click.IntRange(min=1), help="Parallel connections to download archives with.")
+@click.option('--no-cache', is_flag=True, help="Download into the destination instead of using the shared archive cache.")
+@click.option('--workers', default=None, type=click.IntRange(min=1), help="Processes used to extract changed files. Defaults to the CPU count.")
+def upgrade(from_version, to_version, destination, connections, no_cache, workers):
+    """
+    Upgrade an installed Experience Builder to another version in place.
+
+    Args:
+        from_version (str): The version of Experience Builder currently installed.
+        to_version (str): The version of Experience Builder to upgrade to.
+        destination (str): The directory where Experience Builder is installed.
+        connections (int): The number of parallel connections to download archives with.
+        no_cache (bool): Skip the shared archive cache.
+        workers (int, optional): The number of processes used to extract changed files.
+    """
+    from exb_dev_cli.utils.app_manager import upgrade_experience_builder
+
+    try:
+        upgrade_experience_builder(from_version, to_version, destination, connections=connections,
+                                   use_cache=not no_cache, workers=workers)
+        click.echo(f"Successfully upgraded Experience Builder to version {to_version}.")
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
 @click.command()
 @click.option('--config-file', default='applications.json', help="Path to the applications config file.")
 @click.option('--destination', default='./', help="Directory where to clone repositories.")
 @click.option('--branch', default=None, help="Branch to check out for each repo.")
-def clone(config_file, destination, branch):
+@click.option('--jobs', default=4, show_default=True, type=click.IntRange(min=1), help="Number of repositories to clone at once.")
+@click.option('--no-mirror', is_flag=True, help="Clone straight from the remote instead of the shared mirror cache.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+@click.option('--lockfile', default=None, type=click.Path(dir_okay=False), help="Lockfile to check and update. Defaults to exb-dev.lock next to the config file.")
+@click.option('--frozen', is_flag=True, help="Reproduce the lockfile exactly and fail if anything differs from it.")
+def clone(config_file, destination, branch, jobs, no_mirror, patterns, tags, lockfile, frozen):
     """
     Clone repositories from the config file.
 
@@ -46,22 +115,64 @@ def clone(config_file, destination, branch):
         config_file (str): Path to the JSON configuration file containing the repository URLs.
         destination (str): The directory where the repositories will be cloned.
         branch (str, optional): The branch to check out for each repository. Defaults to None.
+        jobs (int): The number of repositories to clone at once.
+        no_mirror (bool): Skip the shared mirror cache.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+        lockfile (str, optional): The workspace lockfile.
+        frozen (bool): Check out the commits in the lockfile and fail if a repo is missing from it.
     
     Raises:
         click.ClickException: If an error occurs while cloning repositories.
     """
+    from exb_dev_cli.utils.app_manager import clone_repos_from_config
+    from exb_dev_cli.utils.lockfile import Lockfile
+
     try:
-        clone_repos_from_config(config_file, destination, branch)
+        lock = Lockfile.for_config(config_file, lockfile, frozen=frozen)
+        clone_repos_from_config(config_file, destination, branch, jobs=jobs, use_mirrors=not no_mirror,
+                                patterns=patterns, tags=tags, lock=lock)
         click.echo(f"Successfully cloned repositories from {config_file} into {destination}.")
     except Exception as e:
         click.echo(f"Error: {e}")
 
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option('--jobs', default=4, show_default=True, type=click.IntRange(min=1), help="Number of repositories to sync at once.")
+@click.option('--no-mirror', is_flag=True, help="Fetch straight from the remote instead of the shared mirror cache.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+def sync(config_file, destination, jobs, no_mirror, patterns, tags):
+    """
+    Clone missing repositories and fast-forward existing ones from the config file.
+
+    Repositories with uncommitted changes, unpushed commits or diverged history are reported and left alone.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        jobs (int): The number of repositories to sync at once.
+        no_mirror (bool): Skip the shared mirror cache.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+    """
+    from exb_dev_cli.utils.app_manager import sync_repos_from_config
+
+    try:
+        sync_repos_from_config(config_file, destination, jobs=jobs, use_mirrors=not no_mirror,
+                               patterns=patterns, tags=tags)
+        click.echo(f"Synced repositories from {config_file} in {destination}.")
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
 @click.command()
 @click.option('--app-name', required=True, help="The name of the application or 'Core_Widgets' to clone.")
 @click.option('--config-file', default='applications.json', help="Path to the applications config file.")
 @click.option('--destination', default='./', help="Directory where to clone the repository.")
 @click.option('--branch', default=None, help="Branch to check out for the repository.")
-def clone_single_repo(app_name, config_file, destination, branch):
+@click.option('--no-mirror', is_flag=True, help="Clone straight from the remote instead of the shared mirror cache.")
+def clone_single_repo(app_name, config_file, destination, branch, no_mirror):
     """
     Clone a single repository from the config file, including Core_Widgets.
 
@@ -70,10 +181,14 @@ def clone_single_repo(app_name, config_file, destination, branch):
         config_file (str): Path to the JSON configuration file containing the repository URLs.
         destination (str): The directory where the repository will be cloned.
         branch (str, optional): The branch to check out for the repository. Defaults to None.
+        no_mirror (bool): Skip the shared mirror cache.
     
     Raises:
         click.ClickException: If an error occurs while cloning the repository.
     """
+    from exb_dev_cli.utils.app_manager import get_repo_details, clone_repo
+    from exb_dev_cli.utils.mirrors import MirrorCache
+
     app_repo_url, repo_type = get_repo_details(app_name, config_file)
     try:
         if not app_repo_url:
@@ -81,7 +196,7 @@ def clone_single_repo(app_name, config_file, destination, branch):
         
         app_dest_dir = Path(destination) / app_name
         print(f"Cloning {app_name} from {app_repo_url} into {app_dest_dir}")
-        clone_repo(app_repo_url, app_dest_dir, branch)
+        clone_repo(app_repo_url, app_dest_dir, branch, mirrors=None if no_mirror else MirrorCache())
         click.echo(f"Successfully cloned {app_name} from {app_repo_url} into {app_dest_dir}.")
     
     except Exception as e:
@@ -91,7 +206,8 @@ def clone_single_repo(app_name, config_file, destination, branch):
 @click.option("--app-name", required=True, help="Name of the application to clone.")
 @click.option("--config-file", required=True, type=click.Path(exists=True), help="Path to the applications.json config file.")
 @click.option("--exb-path", required=True, type=click.Path(exists=True), help="Path to the Experience Builder installation.")
-def clone_app_and_symlink(app_name, config_file, exb_path):
+@click.option('--no-mirror', is_flag=True, help="Clone straight from the remote instead of the shared mirror cache.")
+def clone_app_and_symlink(app_name, config_file, exb_path, no_mirror):
     """
     CLI command to clone an app repo and create symlinks.
 
@@ -99,16 +215,563 @@ def clone_app_and_symlink(app_name, config_file, exb_path):
         app_name (str): The name of the application or 'Core_Widgets' to clone.
         config_file (str): Path to the JSON configuration file containing the repository URLs.
         exb_path (str): The directory of an install of Experience Builder Developer Edition.
+        no_mirror (bool): Skip the shared mirror cache.
     
     Raises:
         click.ClickException: If an error occurs while cloning the repository.
     """
-    clone_and_symlink(app_name, config_file, exb_path)
+    from exb_dev_cli.utils.app_manager import clone_and_symlink
+
+    clone_and_symlink(app_name, config_file, exb_path, use_mirrors=not no_mirror)
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option('--full', is_flag=True, help="Also fetch every file and check out every folder, not just the full history.")
+@click.option('--jobs', default=4, show_default=True, type=click.IntRange(min=1), help="Number of repositories to update at once.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+def unshallow(config_file, destination, full, jobs, patterns, tags):
+    """
+    Fetch the full history of repositories cloned with a shallow or sparse clone profile.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        full (bool): Also fetch every blob and turn off sparse checkout.
+        jobs (int): The number of repositories to update at once.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+    """
+    from exb_dev_cli.utils.app_manager import unshallow_repos_from_config
+
+    try:
+        unshallow_repos_from_config(config_file, destination, full=full, jobs=jobs, patterns=patterns, tags=tags)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option('--jobs', default=8, show_default=True, type=click.IntRange(min=1), help="Number of repositories to check at once.")
+@click.option('--json', 'as_json', is_flag=True, help="Print the statuses as JSON.")
+@click.option('--refresh', is_flag=True, help="Ignore cached results and run git status in every repository.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+def status(config_file, destination, jobs, as_json, refresh, patterns, tags):
+    """
+    Show which configured repositories are dirty, ahead or behind.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        jobs (int): The number of repositories to check at once.
+        as_json (bool): Print JSON instead of a table.
+        refresh (bool): Ignore cached results.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+    """
+    import json
+
+    from exb_dev_cli.utils.app_manager import status_from_config
+    from exb_dev_cli.utils.status import print_status_table
+
+    try:
+        statuses = status_from_config(config_file, destination, jobs=jobs, refresh=refresh, patterns=patterns, tags=tags)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+        return
+    if as_json:
+        click.echo(json.dumps([s.to_dict() for s in statuses], indent=2))
+    else:
+        print_status_table(statuses)
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option("--exb-path", required=True, type=click.Path(exists=True), help="Path to the Experience Builder installation.")
+@click.option('--dry-run', is_flag=True, help="Print the link changes without applying them.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+@click.option('--mode', type=click.Choice(["symlink", "copy"]), default="symlink", show_default=True,
+              help="Symlink the repo folders, or copy them where symlinks cannot be created.")
+@click.option('--lockfile', default=None, type=click.Path(dir_okay=False), help="Lockfile to record the links in. Defaults to exb-dev.lock next to the config file.")
+@click.option('--only-used-widgets', is_flag=True, help="Link only the widgets each app's config uses, so the dev server builds fewer widgets.")
+def link(config_file, destination, exb_path, dry_run, patterns, tags, mode, lockfile, only_used_widgets):
+    """
+    Create or repair the Experience Builder symlinks for every configured repository.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_path (str): The directory of an install of Experience Builder Developer Edition.
+        dry_run (bool): Only print the changes.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+        mode (str): `symlink` or `copy`.
+        lockfile (str, optional): The workspace lockfile.
+        only_used_widgets (bool): Link only the widgets the apps use.
+    """
+    from exb_dev_cli.utils.app_manager import link_repos_from_config
+    from exb_dev_cli.utils.lockfile import Lockfile
+
+    try:
+        changes = link_repos_from_config(config_file, destination, exb_path, dry_run=dry_run,
+                                         patterns=patterns, tags=tags, mode=mode,
+                                         lock=Lockfile.for_config(config_file, lockfile),
+                                         only_used_widgets=only_used_widgets)
+        verb = "would be" if dry_run else "were"
+        if mode == "copy":
+            click.echo(f"{len(changes)} folder(s) {verb} mirrored.")
+        else:
+            click.echo(f"{len(changes)} symlink(s) {verb} created or replaced.")
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option("--exb-path", required=True, type=click.Path(exists=True), help="Path to the Experience Builder installation.")
+@click.option('--interval', default=0.25, show_default=True, type=click.FloatRange(min=0.05), help="Seconds between checks for changes.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+@click.option('--only-used-widgets', is_flag=True, help="Copy only the widgets each app's config uses, so the dev server builds fewer widgets.")
+def watch(config_file, destination, exb_path, interval, patterns, tags, only_used_widgets):
+    """
+    Copy the repo folders into Experience Builder and keep pushing changed files until stopped.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_path (str): The directory of an install of Experience Builder Developer Edition.
+        interval (float): Seconds between checks for changes.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+        only_used_widgets (bool): Copy only the widgets the apps use.
+    """
+    from exb_dev_cli.utils.app_manager import watch_repos_from_config
+
+    try:
+        watch_repos_from_config(config_file, destination, exb_path, interval=interval, patterns=patterns, tags=tags,
+                                only_used_widgets=only_used_widgets)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option('--json', 'as_json', is_flag=True, help="Print the app to widget graph as JSON.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+def widgets(config_file, destination, as_json, patterns, tags):
+    """
+    Show which widgets each app's config uses.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        as_json (bool): Print JSON instead of a list.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+    """
+    import json
+
+    from exb_dev_cli.utils.app_manager import widget_index_from_config
+    from exb_dev_cli.utils.widgets import print_widget_graph
+
+    try:
+        index = widget_index_from_config(config_file, destination, patterns=patterns, tags=tags)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+        return
+    if as_json:
+        click.echo(json.dumps(index.graph(), indent=2))
+    else:
+        print_widget_graph(index)
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option("--exb-path", required=True, type=click.Path(exists=True), help="Path to the Experience Builder installation.")
+@click.option('--jobs', default=4, show_default=True, type=click.IntRange(min=1), help="Number of folders to install at once.")
+@click.option('--no-cache', is_flag=True, help="Always run the installer instead of using the shared node_modules cache.")
+@click.option('--installer', default="npm ci", show_default=True, help="Command that installs a folder's dependencies.")
+@click.option('--no-client', is_flag=True, help="Only install the widget folders, not the Experience Builder client.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+def deps(config_file, destination, exb_path, jobs, no_cache, installer, no_client, patterns, tags):
+    """
+    Install the npm dependencies of the Experience Builder client and every linked widget folder.
+
+    Each folder's node_modules is keyed on its lockfile and restored from the shared cache when an
+    identical install was done before; only new lockfiles run the installer.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_path (str): The directory of an install of Experience Builder Developer Edition.
+        jobs (int): The number of folders to install at once.
+        no_cache (bool): Skip the shared node_modules cache.
+        installer (str): The command that installs a folder's dependencies.
+        no_client (bool): Skip the Experience Builder client folder.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+    """
+    from exb_dev_cli.utils.app_manager import install_deps_from_config
+    from exb_dev_cli.utils.deps import CommandInstaller
+
+    try:
+        install_deps_from_config(config_file, destination, exb_path, jobs=jobs, use_cache=not no_cache,
+                                 installer=CommandInstaller(installer), patterns=patterns, tags=tags,
+                                 include_client=not no_client)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--version', required=True, help="Experience Builder version to install.")
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory where to install Experience Builder.")
+@click.option('--repos', 'repos_destination', default='./', help="Directory where to clone repositories.")
+@click.option('--mode', type=click.Choice(["symlink", "copy"]), default="symlink", show_default=True,
+              help="Symlink the repo folders, or copy them where symlinks cannot be created.")
+@click.option('--jobs', default=4, show_default=True, type=click.IntRange(min=1), help="Number of repositories to clone at once.")
+@click.option('--link-jobs', default=1, show_default=True, type=click.IntRange(min=1), help="Number of apps to link at once.")
+@click.option('--connections', default=1, show_default=True, type=click.IntRange(min=1), help="Parallel connections to download the archive with.")
+@click.option('--workers', default=None, type=click.IntRange(min=1), help="Processes used to extract the archive. Defaults to the CPU count.")
+@click.option('--no-cache', is_flag=True, help="Download into the destination instead of using the shared archive cache.")
+@click.option('--no-mirror', is_flag=True, help="Clone straight from the remote instead of the shared mirror cache.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+@click.option('--lockfile', default=None, type=click.Path(dir_okay=False), help="Lockfile to check and update. Defaults to exb-dev.lock next to the config file.")
+@click.option('--frozen', is_flag=True, help="Reproduce the lockfile exactly and fail if anything differs from it.")
+@click.option('--deps', is_flag=True, help="Install the npm dependencies of the client and each widget folder from the node_modules cache.")
+@click.option('--deps-jobs', default=2, show_default=True, type=click.IntRange(min=1), help="Number of dependency installs to run at once.")
+@click.option('--installer', default="npm ci", show_default=True, help="Command that installs a folder's dependencies.")
+@click.option('--only-used-widgets', is_flag=True, help="Link only the widgets each app's config uses, so the dev server builds fewer widgets.")
+def setup(version, config_file, destination, repos_destination, mode, jobs, link_jobs, connections, workers, no_cache,
+          no_mirror, patterns, tags, lockfile, frozen, deps, deps_jobs, installer, only_used_widgets):
+    """
+    Install Experience Builder, clone every configured repository and link the apps in one step.
+
+    Args:
+        version (str): The version of Experience Builder to install.
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory where to install Experience Builder.
+        repos_destination (str): The directory where the repositories will be cloned.
+        mode (str): `symlink` or `copy`.
+        jobs (int): The number of repositories to clone at once.
+        link_jobs (int): The number of apps to link at once.
+        connections (int): The number of parallel connections to download the archive with.
+        workers (int, optional): The number of processes used to extract the archive.
+        no_cache (bool): Skip the shared archive cache.
+        no_mirror (bool): Skip the shared mirror cache.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+        lockfile (str, optional): The workspace lockfile.
+        frozen (bool): Reproduce the lockfile exactly.
+        deps (bool): Install npm dependencies after linking.
+        deps_jobs (int): The number of dependency installs to run at once.
+        installer (str): The command that installs a folder's dependencies.
+        only_used_widgets (bool): Link only the widgets the apps use.
+    """
+    from exb_dev_cli.utils.app_manager import setup_workspace
+    from exb_dev_cli.utils.deps import CommandInstaller
+    from exb_dev_cli.utils.lockfile import Lockfile
+
+    try:
+        lock = Lockfile.for_config(config_file, lockfile, frozen=frozen)
+        setup_workspace(version, config_file, destination, repos_destination, connections=connections,
+                        use_cache=not no_cache, workers=workers, jobs=jobs, link_jobs=link_jobs,
+                        use_mirrors=not no_mirror, mode=mode, patterns=patterns, tags=tags, lock=lock,
+                        deps=deps, deps_jobs=deps_jobs, installer=CommandInstaller(installer),
+                        only_used_widgets=only_used_widgets)
+        click.echo(f"Successfully set up Experience Builder {version} with the apps from {config_file}.")
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--app-name', required=True, help="Name of the application to remove, or core_widgets.")
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory holding the cloned repositories.")
+@click.option("--exb-path", required=True, type=click.Path(exists=True), help="Path to the Experience Builder installation.")
+@click.option('--keep-repo', is_flag=True, help="Only remove the links, not the cloned repo.")
+@click.option('--background', is_flag=True, help="Move the repo to a trash folder and delete it in the background.")
+@click.option('--mode', type=click.Choice(["symlink", "copy"]), default="symlink", show_default=True,
+              help="How the app was linked; copy mode also deletes the copied folders.")
+@click.option('--jobs', default=8, show_default=True, type=click.IntRange(min=1), help="Number of folders to delete at once.")
+@click.option('--force', is_flag=True, help="Delete the repo even if it has uncommitted changes or unpushed commits.")
+def remove(app_name, config_file, destination, exb_path, keep_repo, background, mode, jobs, force):
+    """
+    Remove an app's links from Experience Builder and delete its cloned repo.
+
+    Args:
+        app_name (str): The name of the application to remove.
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_path (str): The directory of an install of Experience Builder Developer Edition.
+        keep_repo (bool): Only remove the links.
+        background (bool): Delete the repo in the background.
+        mode (str): `symlink` or `copy`.
+        jobs (int): The number of folders to delete at once.
+        force (bool): Delete the repo even if it has work that is not pushed.
+    """
+    from exb_dev_cli.utils.app_manager import remove_app_from_config
+
+    try:
+        remove_app_from_config(app_name, config_file, destination, exb_path, keep_repo=keep_repo, background=background,
+                               mode=mode, jobs=jobs, force=force)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--destination', default='./', help="Directory Experience Builder was installed into.")
+@click.option('--repos', 'repos_destination', default='./', help="Directory holding the cloned repositories.")
+@click.option('--keep-repos', is_flag=True, help="Only delete the Experience Builder installation.")
+@click.option('--background', is_flag=True, help="Move folders to a trash folder and delete them in the background.")
+@click.option('--jobs', default=8, show_default=True, type=click.IntRange(min=1), help="Number of folders to delete at once.")
+@click.option('--force', is_flag=True, help="Delete repos even if they have uncommitted changes or unpushed commits.")
+@click.confirmation_option(prompt="Delete the Experience Builder installation and its repositories?")
+def teardown(config_file, destination, repos_destination, keep_repos, background, jobs, force):
+    """
+    Delete the Experience Builder installation and every repository cloned for it.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory Experience Builder was installed into.
+        repos_destination (str): The directory holding the cloned repositories.
+        keep_repos (bool): Only delete the installation.
+        background (bool): Delete in the background.
+        jobs (int): The number of folders to delete at once.
+        force (bool): Delete repos even if they have work that is not pushed.
+    """
+    from exb_dev_cli.utils.app_manager import teardown_workspace
+
+    try:
+        teardown_workspace(config_file, destination, repos_destination, keep_repos=keep_repos, background=background,
+                           jobs=jobs, force=force)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.group()
+def bundle():
+    """
+    Pack a workspace into one file and provision workspaces from it without network access.
+    """
+    pass
+
+@bundle.command(name="export")
+@click.option('--output', required=True, type=click.Path(dir_okay=False), help="Bundle file to write.")
+@click.option('--version', default=None, help="Experience Builder version to pack. Defaults to the locked version.")
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--repos', 'repos_destination', default='./', help="Directory holding the cloned repositories.")
+@click.option('--jobs', default=4, show_default=True, type=click.IntRange(min=1), help="Number of git bundles to create at once.")
+@click.option('--connections', default=1, show_default=True, type=click.IntRange(min=1), help="Parallel connections to download the archive with.")
+@click.option('--no-cache', is_flag=True, help="Download the archive instead of using the shared archive cache.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+@click.option('--lockfile', default=None, type=click.Path(dir_okay=False), help="Lockfile to read the version from. Defaults to exb-dev.lock next to the config file.")
+@click.option('--only-used-widgets', is_flag=True, help="Link only the widgets each app's config uses.")
+def bundle_export(output, version, config_file, repos_destination, jobs, connections, no_cache, patterns, tags, lockfile,
+                  only_used_widgets):
+    """
+    Pack the Experience Builder archive, every cloned repository and the link plan into one bundle file.
+
+    Args:
+        output (str): The bundle file to write.
+        version (str, optional): The Experience Builder version to pack.
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        repos_destination (str): The directory holding the cloned repositories.
+        jobs (int): The number of git bundles to create at once.
+        connections (int): The number of parallel connections to download the archive with.
+        no_cache (bool): Skip the shared archive cache.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+        lockfile (str, optional): The workspace lockfile.
+        only_used_widgets (bool): Link only the widgets the apps use.
+    """
+    from exb_dev_cli.utils.app_manager import export_workspace_bundle
+    from exb_dev_cli.utils.lockfile import Lockfile
+
+    try:
+        lock = Lockfile.for_config(config_file, lockfile)
+        export_workspace_bundle(config_file, output, version, repos_destination, connections=connections,
+                                use_cache=not no_cache, jobs=jobs, patterns=patterns, tags=tags,
+                                only_used_widgets=only_used_widgets, lock=lock)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@bundle.command(name="import")
+@click.argument('bundle_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--config-file', default='applications.json', help="Path to the applications config file. The bundled one is written here if it does not exist.")
+@click.option('--destination', default='./', help="Directory to install Experience Builder into.")
+@click.option('--repos', 'repos_destination', default='./', help="Directory to clone the repositories into.")
+@click.option('--mode', type=click.Choice(["symlink", "copy"]), default="symlink", show_default=True,
+              help="Symlink the repo folders, or copy them where symlinks cannot be created.")
+@click.option('--jobs', default=4, show_default=True, type=click.IntRange(min=1), help="Number of members to unpack and repositories to clone at once.")
+@click.option('--workers', default=None, type=click.IntRange(min=1), help="Processes used to extract the archive. Defaults to the CPU count.")
+def bundle_import(bundle_path, config_file, destination, repos_destination, mode, jobs, workers):
+    """
+    Provision a workspace from a bundle file without any network access.
+
+    Args:
+        bundle_path (str): The bundle file.
+        config_file (str): Path to the JSON configuration file.
+        destination (str): The directory where to install Experience Builder.
+        repos_destination (str): The directory where the repositories will be cloned.
+        mode (str): `symlink` or `copy`.
+        jobs (int): The number of members to unpack and repositories to clone at once.
+        workers (int, optional): The number of processes used to extract the archive.
+    """
+    from exb_dev_cli.utils.app_manager import import_workspace_bundle
+
+    try:
+        import_workspace_bundle(bundle_path, config_file, destination, repos_destination, jobs=jobs, workers=workers,
+                                mode=mode)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--config-file', default='applications.json', help="Path to the applications config file.")
+@click.option('--version', 'versions', multiple=True, help="Only prefetch this Experience Builder version. Repeatable. Defaults to every version in versions.json.")
+@click.option('--only', 'patterns', multiple=True, help="Only include apps whose name matches this glob. Repeatable.")
+@click.option('--tag', 'tags', multiple=True, help="Only include apps with this tag. Repeatable.")
+@click.option('--limit-rate', default=None, help="Cap archive downloads at this many bytes per second, e.g. 2M.")
+@click.option('--jobs', default=1, show_default=True, type=click.IntRange(min=1), help="Number of mirrors to fetch at once.")
+@click.option('--no-nice', is_flag=True, help="Run at normal priority instead of lowering it.")
+def prefetch(config_file, versions, patterns, tags, limit_rate, jobs, no_nice):
+    """
+    Download new Experience Builder archives and fetch the repository mirrors in the background, e.g. from cron.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        versions (tuple): The Experience Builder versions to prefetch.
+        patterns (tuple): Globs selecting apps by name.
+        tags (tuple): Tags selecting apps.
+        limit_rate (str, optional): The download rate cap.
+        jobs (int): The number of mirrors to fetch at once.
+        no_nice (bool): Run at normal priority.
+    """
+    from exb_dev_cli.utils.app_manager import prefetch_from_config
+    from exb_dev_cli.utils.cache import parse_size
+
+    try:
+        rate_limit = parse_size(limit_rate) if limit_rate else None
+        prefetch_from_config(config_file, versions, patterns, tags, rate_limit=rate_limit, jobs=jobs,
+                             low_priority=not no_nice)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.option('--destination', default='./', help="Directory Experience Builder was installed into.")
+@click.option('--workers', default=None, type=click.IntRange(min=1), help="Processes used to hash files. Defaults to the CPU count.")
+def verify(destination, workers):
+    """
+    Check an installed Experience Builder tree against its extraction manifest.
+
+    Args:
+        destination (str): The directory where Experience Builder was installed.
+        workers (int, optional): The number of processes used to hash files.
+    """
+    from exb_dev_cli.utils.extract import verify_tree
+
+    try:
+        missing, modified = verify_tree(destination, workers=workers)
+    except Exception as e:
+        click.echo(f"Error: {e}")
+        return
+    for name in missing:
+        click.echo(f"missing   {name}")
+    for name in modified:
+        click.echo(f"modified  {name}")
+    if missing or modified:
+        click.echo(f"{len(missing)} missing and {len(modified)} modified file(s) in {destination}.")
+        raise SystemExit(1)
+    click.echo(f"All files in {destination} match the manifest.")
+
+@click.group()
+def cache():
+    """
+    Manage the shared Experience Builder archive cache and file store.
+    """
+    pass
+
+@cache.command(name="list")
+def cache_list():
+    """
+    List the cached Experience Builder archives, most recently used first.
+    """
+    from exb_dev_cli.utils.cache import ArchiveCache
+    from exb_dev_cli.utils.parallel_clone import format_size
+
+    archive_cache = ArchiveCache()
+    entries = archive_cache.entries()
+    if not entries:
+        click.echo(f"Cache at {archive_cache.root} is empty.")
+        return
+    for entry in entries:
+        last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+        click.echo(f"{entry['version']:<10} {entry['sha256'][:12]}  {format_size(entry['size']):>10}  {last_used}")
+    total = sum(entry["size"] for entry in entries)
+    click.echo(f"{len(entries)} archive(s), {format_size(total)} of {format_size(archive_cache.max_bytes)} in {archive_cache.root}")
+
+@cache.command(name="prune")
+@click.option('--max-size', default=None, help="Shrink the cache to this size, e.g. 2G. Defaults to the configured cap.")
+@click.option('--all', 'remove_all', is_flag=True, help="Remove every cached archive, including ones used in the last minute.")
+def cache_prune(max_size, remove_all):
+    """
+    Evict least recently used archives from the cache.
+
+    Args:
+        max_size (str, optional): The size to shrink the cache to.
+        remove_all (bool): Empty the cache.
+    """
+    from exb_dev_cli.utils.cache import ArchiveCache, parse_size
+    from exb_dev_cli.utils.parallel_clone import format_size
+
+    try:
+        max_bytes = 0 if remove_all else (parse_size(max_size) if max_size else None)
+        removed = ArchiveCache().prune(max_bytes, grace=0) if remove_all else ArchiveCache().prune(max_bytes)
+        for entry in removed:
+            click.echo(f"Removed {entry['version']} ({entry['sha256'][:12]}, {format_size(entry['size'])})")
+        click.echo(f"Pruned {len(removed)} archive(s).")
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@cache.command(name="gc")
+def cache_gc():
+    """
+    Remove files from the deduplicated store that no version or installation uses.
+    """
+    from exb_dev_cli.utils.parallel_clone import format_size
+    from exb_dev_cli.utils.store import FileStore
+
+    try:
+        store = FileStore()
+        removed, freed = store.gc()
+        click.echo(f"Removed {removed} unused file(s), freed {format_size(freed)} in {store.root}.")
+    except Exception as e:
+        click.echo(f"Error: {e}")
 
+cli.add_command(setup)
 cli.add_command(install)
+cli.add_command(upgrade)
 cli.add_command(clone)
+cli.add_command(sync)
+cli.add_command(status)
+cli.add_command(unshallow)
 cli.add_command(clone_single_repo)
 cli.add_command(clone_app_and_symlink)
+cli.add_command(link)
+cli.add_command(watch)
+cli.add_command(widgets)
+cli.add_command(deps)
+cli.add_command(remove)
+cli.add_command(teardown)
+cli.add_command(bundle)
+cli.add_command(prefetch)
+cli.add_command(verify)
+cli.add_command(cache)
 
 if __name__ == '__main__':
     cli()
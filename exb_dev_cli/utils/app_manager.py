@@ -1,26 +1,41 @@
-import os
-import subprocess
-import pytest
-import json
+from functools import partial
 from pathlib import Path
-import requests
-import zipfile
 
-from symlinks import create_symlinks_to_experience_builder
-from config import load_config, get_repo_details
+from exb_dev_cli.utils.symlinks import (
+    create_symlinks_to_experience_builder, plan_links, diff_links, apply_links, elevate_links, prepare_link_layout,
+    release_links,
+)
+from exb_dev_cli.utils.config import (
+    load_config, load_app_config, get_repo_details, get_version_details, select_entries, entry_url, entry_app_id,
+    entry_clone_profile, CORE_WIDGETS_NAME,
+)
+from exb_dev_cli.utils.git import run_git
+from exb_dev_cli.utils.mirrors import MirrorCache
+from exb_dev_cli.utils.parallel_clone import clone_repos_parallel, print_clone_summary
+from exb_dev_cli.utils.sync import sync_repos, print_sync_summary
 
 
 VERSIONS_JSON = Path("./exb_dev_cli/versions.json")
+# The folder Experience Builder archives extract into
+EXB_FOLDER_NAME = "ArcGISExperienceBuilder"
 
 
-def clone_repo(repo_url, destination_dir, branch=None):
+def clone_repo(repo_url, destination_dir, branch=None, quiet=False, mirrors=None, profile=None):
     """
     Clones a Git repository to the specified directory.
 
+    With a clone profile the repository is cloned straight from the remote, since the point of a
+    partial clone is not to download every blob, which a full mirror would. Sparse profiles check out
+    only the listed folders.
+
     Args:
         repo_url (str): The URL of the Git repository to clone.
         destination_dir (str): The directory to clone the repository into.
         branch (str, optional): The branch to check out after cloning. Defaults to None.
+        quiet (bool, optional): Capture git output instead of printing it. Defaults to False.
+        mirrors (MirrorCache, optional): Clone by way of a local mirror of the repository. Defaults to None.
+        profile (dict, optional): The `filter`, `depth` and `sparse` options from `entry_clone_profile`.
+            Defaults to None for a full clone.
 
     Returns: 
         destination_dir (str): The directory where Experience Builder will be installed.
@@ -28,52 +43,657 @@ def clone_repo(repo_url, destination_dir, branch=None):
     Raises:
         subprocess.CalledProcessError: If the `git clone` or `git checkout` command fails.
     """
-    subprocess.run(['git', 'clone', repo_url, destination_dir], check=True)
+    if profile:
+        args = ['clone']
+        if profile["filter"]:
+            args.append(f'--filter={profile["filter"]}')
+        if profile["depth"]:
+            args += ['--depth', profile["depth"]]
+        if branch:
+            args += ['--branch', branch]
+        if profile["sparse"]:
+            args.append('--no-checkout')
+        run_git([*args, repo_url, destination_dir], capture_output=quiet)
+        if profile["sparse"]:
+            run_git(['sparse-checkout', 'set', '--cone', *profile["sparse"]], cwd=destination_dir, capture_output=quiet)
+            run_git(['checkout', '-q', 'HEAD'], cwd=destination_dir, capture_output=quiet)
+        return destination_dir
+
+    if mirrors:
+        mirrors.clone(repo_url, destination_dir, quiet=quiet)
+    else:
+        run_git(['clone', repo_url, destination_dir], capture_output=quiet)
     if branch:
-        subprocess.run(['git', 'checkout', branch], cwd=destination_dir, check=True)
+        run_git(['checkout', branch], cwd=destination_dir, capture_output=quiet)
     
     return destination_dir
 
-def clone_repos_from_config(config_file, destination, branch=None):
+def config_clone_func(config, mirrors=None):
+    """
+    Returns a clone function that applies each repository's clone profile from the configuration.
+
+    Args:
+        config (dict): The loaded applications configuration.
+        mirrors (MirrorCache, optional): The mirror cache for repositories without a profile. Defaults to None.
+
+    Returns:
+        callable: Called as `clone_func(repo_url, destination, branch, quiet=False)`.
+    """
+    entries = select_entries(config)
+    profiles = {entry_url(entry): entry_clone_profile(entry) for entry in entries.values()}
+
+    def clone_func(repo_url, destination_dir, branch=None, quiet=False):
+        return clone_repo(repo_url, destination_dir, branch, quiet, mirrors=mirrors, profile=profiles.get(repo_url))
+
+    return clone_func
+
+def repos_from_config(config, destination, patterns=None, tags=None):
+    """
+    Lists the repositories in a loaded configuration with their clone destinations.
+
+    Args:
+        config (dict): The loaded applications configuration.
+        destination (str): The directory where the repositories will be cloned.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+
+    Returns:
+        list: (name, repo_url, destination_dir) tuples, applications first and core widgets last.
+    """
+    return [
+        (name, entry_url(entry), Path(destination) / name)
+        for name, entry in select_entries(config, patterns, tags).items()
+    ]
+
+def provision_repo(name, repo_url, destination, clone_func, lock, branch=None, quiet=True):
+    """
+    Clones a repository if it is missing and records its commit in the lockfile.
+
+    Existing repos are left as they are and their current commit is recorded. In frozen mode the repo
+    is instead moved to the locked commit, fetching it if needed.
+
+    Args:
+        name (str): The name of the application or core widgets repo.
+        repo_url (str): The URL of the Git repository.
+        destination (Path): The repo's working tree.
+        clone_func (callable): Called as `clone_func(repo_url, destination, branch, quiet=quiet)` for missing repos.
+        lock (Lockfile): The workspace lockfile.
+        branch (str, optional): The branch to check out after cloning. Defaults to None.
+        quiet (bool, optional): Capture git output instead of printing it. Defaults to True.
+
+    Raises:
+        LockMismatchError: In frozen mode, if the repo is not locked or has uncommitted changes.
+        subprocess.CalledProcessError: If a git command fails.
+    """
+    from exb_dev_cli.utils.git import read_head
+    from exb_dev_cli.utils.lockfile import checkout_commit
+
+    destination = Path(destination)
+    commit = lock.locked_commit(name, repo_url)
+    if not (destination / ".git").exists():
+        clone_func(repo_url, destination, branch, quiet=quiet)
+    if lock.frozen and read_head(destination) != commit:
+        checkout_commit(destination, commit)
+    lock.record_repo(name, repo_url, destination, read_head(destination))
+
+def _provision_from_clone(names, clone_func, lock, repo_url, destination_dir, branch=None, quiet=False):
+    """Adapts `provision_repo` to the clone function signature used by `clone_repos_parallel`."""
+    provision_repo(names[str(destination_dir)], repo_url, destination_dir, clone_func, lock, branch, quiet)
+
+def clone_repos_from_config(config_file, destination, branch=None, jobs=4, use_mirrors=True, patterns=None, tags=None,
+                            lock=None):
     """
     Clones repositories specified in the configuration JSON file.
 
+    Repositories are cloned concurrently. A failed clone does not stop the others; failures are
+    reported together once every clone has finished. With a lockfile, repos already at their locked
+    commit are skipped without starting git, existing repos are recorded rather than cloned again, and
+    in frozen mode every repo is checked out at its locked commit.
+
     Args:
         config_file (str): Path to the JSON configuration file containing the repository URLs.
         destination (str): The directory where the repositories will be cloned.
         branch (str, optional): The branch to check out for each repository. Defaults to None.
+        jobs (int, optional): Maximum number of clones to run at once. Defaults to 4.
+        use_mirrors (bool, optional): Clone from the shared mirror cache. Defaults to True.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        lock (Lockfile, optional): The workspace lockfile. Defaults to None.
 
     Returns: 
-        destination_dir (str): The directory where Experience Builder will be installed.
+        list: A CloneResult for each repository.
 
     Raises:
-        Exception: If there is an error loading or cloning the repositories.
+        RuntimeError: If one or more repositories failed to clone.
+        LockMismatchError: In frozen mode, if a repo is not in the lockfile.
     """
-    config = load_config(config_file)
-    
-    # Clone Applications
-    apps = config.get('Applications', {})
-    for app, repo_url in apps.items():
-        app_dest_dir = Path(destination) / app
-        print(f"Cloning {app} from {repo_url} into {app_dest_dir}")
-        clone_repo(repo_url, app_dest_dir, branch)
-    
-    # Clone Core Widgets
-    core_widgets_url = config.get('Core_Widgets')
-    if core_widgets_url:
-        core_widgets_dest_dir = Path(destination) / "core_widgets"
-        print(f"Cloning Core Widgets from {core_widgets_url} into {core_widgets_dest_dir}")
-        clone_repo(core_widgets_url, core_widgets_dest_dir, branch)
+    config = load_app_config(config_file)
+    repos = repos_from_config(config, destination, patterns, tags)
+    mirrors = MirrorCache() if use_mirrors else None
+    clone_func = config_clone_func(config, mirrors)
+
+    if lock is not None:
+        for name, repo_url, dest_dir in repos:
+            # Fails fast in frozen mode, before anything is cloned
+            lock.locked_commit(name, repo_url)
+        current = [repo for repo in repos if lock.repo_is_current(*repo)]
+        for name, _, _ in current:
+            print(f"{name} is at its locked commit, skipping.")
+        repos = [repo for repo in repos if repo not in current]
+        names = {str(dest_dir): name for name, _, dest_dir in repos}
+        clone_func = partial(_provision_from_clone, names, config_clone_func(config, mirrors), lock)
+
+    for name, repo_url, dest_dir in repos:
+        print(f"Cloning {name} from {repo_url} into {dest_dir}")
+
+    results = clone_repos_parallel(repos, clone_func, jobs=jobs, branch=branch)
+    print_clone_summary(results)
+    if lock is not None:
+        lock.save()
+
+    failed = [r.name for r in results if not r.ok]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(results)} repositories failed to clone: {', '.join(failed)}")
+
+    return results
+
+def sync_repos_from_config(config_file, destination, jobs=4, use_mirrors=True, patterns=None, tags=None):
+    """
+    Brings the repositories in the configuration JSON file up to date.
+
+    Missing repositories are cloned; existing ones are fetched and fast-forwarded in parallel.
+    Working trees with uncommitted changes are left untouched.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        jobs (int, optional): Maximum number of repositories to sync at once. Defaults to 4.
+        use_mirrors (bool, optional): Clone and fetch through the shared mirror cache. Defaults to True.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+
+    Returns:
+        list: A SyncResult for each repository.
+
+    Raises:
+        RuntimeError: If one or more repositories could not be synced.
+    """
+    config = load_app_config(config_file)
+    repos = repos_from_config(config, destination, patterns, tags)
+
+    mirrors = MirrorCache() if use_mirrors else None
+    results = sync_repos(repos, config_clone_func(config, mirrors), jobs=jobs, mirrors=mirrors)
+    print_sync_summary(results)
+
+    failed = [r.name for r in results if r.action == "failed"]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(results)} repositories failed to sync: {', '.join(failed)}")
+
+    return results
+
+def unshallow_repos_from_config(config_file, destination, full=False, jobs=4, patterns=None, tags=None):
+    """
+    Fetches the full history of repositories cloned with a clone profile.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        full (bool, optional): Also fetch every blob and turn off sparse checkout. Defaults to False.
+        jobs (int, optional): Maximum number of repositories to update at once. Defaults to 4.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+
+    Returns:
+        list: A SyncResult for each repository.
+
+    Raises:
+        RuntimeError: If one or more repositories failed.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from exb_dev_cli.utils.sync import unshallow_repo
+
+    config = load_app_config(config_file)
+    repos = repos_from_config(config, destination, patterns, tags)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        results = list(executor.map(lambda repo: unshallow_repo(repo[0], repo[2], full=full), repos))
+    print_sync_summary(results)
+
+    failed = [r.name for r in results if r.action == "failed"]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(results)} repositories failed: {', '.join(failed)}")
+    return results
+
+def status_from_config(config_file, destination, jobs=8, refresh=False, patterns=None, tags=None):
+    """
+    Reads the git status of every repository in the configuration JSON file.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        jobs (int, optional): Maximum number of repositories to check at once. Defaults to 8.
+        refresh (bool, optional): Ignore cached results. Defaults to False.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+
+    Returns:
+        list: A RepoStatus for each repository.
+    """
+    from exb_dev_cli.utils.status import repo_statuses
+
+    config = load_app_config(config_file)
+    repos = [(name, dest_dir) for name, _, dest_dir in repos_from_config(config, destination, patterns, tags)]
+    return repo_statuses(repos, jobs=jobs, refresh=refresh)
+
+def widget_index_from_config(config_file, destination, patterns=None, tags=None, jobs=8):
+    """
+    Indexes which widgets each app in the configuration JSON file uses.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        jobs (int, optional): Maximum number of files read at once. Defaults to 8.
+
+    Returns:
+        WidgetIndex: The app to widget index.
+    """
+    from exb_dev_cli.utils.widgets import WidgetIndex
+
+    selected = select_entries(load_app_config(config_file), patterns, tags)
+    apps = [(name, Path(destination) / name) for name in selected if name != CORE_WIDGETS_NAME]
+    core_widgets = (CORE_WIDGETS_NAME, Path(destination) / CORE_WIDGETS_NAME) if CORE_WIDGETS_NAME in selected else None
+    return WidgetIndex.build(apps, core_widgets, jobs=jobs)
+
+def _per_widget_dirs(exb_install_path, names):
+    """Returns the widgets folders in the installation that hold per-widget links for the given repos."""
+    client = Path(exb_install_path) / "client"
+    return [client / ("pc_core_widgets" if name == CORE_WIDGETS_NAME else f"{name}_widgets") for name in names]
+
+def plan_links_from_config(config_file, destination, exb_install_path, patterns=None, tags=None,
+                           only_used_widgets=False):
+    """
+    Builds the desired Experience Builder links for the repositories in the configuration JSON file.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_install_path (str): Path to the Experience Builder installation.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        only_used_widgets (bool, optional): Link only the widgets the selected apps' configs use, one
+            link per widget. Defaults to False.
+
+    Returns:
+        dict: Maps each link path in the installation to the repo folder it should show.
+    """
+    config = load_app_config(config_file)
+    selected = select_entries(config, patterns, tags)
+    apps = [
+        (name, Path(destination) / name, entry_app_id(entry))
+        for name, entry in selected.items() if name != CORE_WIDGETS_NAME
+    ]
+    core_widgets_path = Path(destination) / CORE_WIDGETS_NAME if CORE_WIDGETS_NAME in selected else None
+
+    if not only_used_widgets:
+        return plan_links(exb_install_path, apps, core_widgets_path)
+    index = widget_index_from_config(config_file, destination, patterns, tags)
+    used_widgets = {name: index.used_widgets(name) for name, _, _ in apps}
+    return plan_links(exb_install_path, apps, core_widgets_path, used_widgets, index.used_core_widgets())
+
+def link_repos_from_config(config_file, destination, exb_install_path, dry_run=False, patterns=None, tags=None,
+                           mode="symlink", lock=None, only_used_widgets=False):
+    """
+    Reconciles the Experience Builder symlinks for every repository in the configuration JSON file.
+
+    The desired links for all apps and the core widgets are compared with the installation and only
+    missing, stale or broken links are created. Links needing admin rights are created in one batch.
+    In copy mode the repo folders are mirrored into the installation instead, for machines where
+    symlinks cannot be created. With `only_used_widgets`, each app's widgets folder only links the
+    widgets its config uses, and links to widgets that are no longer used are removed.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_install_path (str): Path to the Experience Builder installation.
+        dry_run (bool, optional): Only print the changes. Defaults to False.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        mode (str, optional): `symlink` or `copy`. Defaults to `symlink`.
+        lock (Lockfile, optional): Records the applied links in the workspace lockfile. Defaults to None.
+        only_used_widgets (bool, optional): Link only the widgets the apps use. Defaults to False.
+
+    Returns:
+        list: The LinkChange instances that were (or would be) applied, or TreeMirror instances in copy mode.
+    """
+    desired = plan_links_from_config(config_file, destination, exb_install_path, patterns, tags, only_used_widgets)
+    names = select_entries(load_app_config(config_file), patterns, tags) if only_used_widgets else ()
+    prepare_link_layout(exb_install_path, desired, _per_widget_dirs(exb_install_path, names), dry_run=dry_run,
+                        remove_copies=mode == "copy")
+    if mode == "copy":
+        from exb_dev_cli.utils.copy_sync import mirror_pairs
+
+        changes = mirror_pairs(desired, dry_run=dry_run)
+    else:
+        changes = apply_links(diff_links(desired), dry_run=dry_run)
+    if lock is not None and not dry_run:
+        lock.record_links(desired)
+        lock.save()
+    return changes
+
+def watch_repos_from_config(config_file, destination, exb_install_path, interval=0.25, patterns=None, tags=None,
+                            stop_event=None, only_used_widgets=False):
+    """
+    Copies the repo folders into the Experience Builder installation and keeps pushing changed files.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_install_path (str): Path to the Experience Builder installation.
+        interval (float, optional): Seconds between checks for changes. Defaults to 0.25.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        stop_event (threading.Event, optional): Stops watching when set. Defaults to None.
+        only_used_widgets (bool, optional): Copy only the widgets the apps use. Defaults to False.
+    """
+    from exb_dev_cli.utils.copy_sync import mirror_pairs, watch
+
+    desired = plan_links_from_config(config_file, destination, exb_install_path, patterns, tags, only_used_widgets)
+    names = select_entries(load_app_config(config_file), patterns, tags) if only_used_widgets else ()
+    prepare_link_layout(exb_install_path, desired, _per_widget_dirs(exb_install_path, names), remove_copies=True)
+    mirrors = mirror_pairs(desired)
+    print(f"Watching {len(mirrors)} folder(s) for changes. Press Ctrl+C to stop.")
+    watch(mirrors, interval=interval, stop_event=stop_event)
+
+def deps_folders_from_config(config_file, destination, exb_install_path, patterns=None, tags=None, include_client=True):
+    """
+    Finds the folders in an Experience Builder installation that need a dependency install.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_install_path (str): Path to the Experience Builder installation.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        include_client (bool, optional): Include the Experience Builder `client` folder. Defaults to True.
+
+    Returns:
+        list: The client folder and each linked widget folder with a `package.json`.
+    """
+    from exb_dev_cli.utils.deps import package_folders
+
+    client = Path(exb_install_path) / "client"
+    desired = plan_links_from_config(config_file, destination, exb_install_path, patterns, tags)
+    widget_roots = sorted(link for link in desired if Path(link).parent == client)
+    folders = [client] if include_client and (client / "package.json").is_file() else []
+    return folders + package_folders(widget_roots)
+
+def install_deps_from_config(config_file, destination, exb_install_path, jobs=4, use_cache=True, installer=None,
+                             patterns=None, tags=None, include_client=True):
+    """
+    Installs the npm dependencies of the Experience Builder client and every linked widget folder.
+
+    Each folder's `node_modules` is keyed on its lockfile: folders already installed for the current
+    key are left alone, cached installs are restored from the shared cache, and only the rest run the
+    installer, whose output is cached for the next workspace.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_install_path (str): Path to the Experience Builder installation.
+        jobs (int, optional): Maximum number of folders handled at once. Defaults to 4.
+        use_cache (bool, optional): Use the shared `node_modules` cache. Defaults to True.
+        installer (CommandInstaller, optional): Runs the package manager. Defaults to `npm ci`.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        include_client (bool, optional): Include the Experience Builder `client` folder. Defaults to True.
+
+    Returns:
+        DepsResult: The outcome for each folder.
+
+    Raises:
+        RuntimeError: If any folder failed to install.
+    """
+    from exb_dev_cli.utils.deps import DepsResult, install_deps
+
+    folders = deps_folders_from_config(config_file, destination, exb_install_path, patterns, tags, include_client)
+    result = DepsResult()
+    try:
+        install_deps(folders, installer=installer, use_cache=use_cache, jobs=jobs, result=result)
+    finally:
+        result.print_summary()
+    return result
+
+def _print_remove_summary(what, result):
+    if result.trashed:
+        print(f"Moved {what} to the trash; it is being deleted in the background.")
+    else:
+        print(f"Removed {what}: {result.files} file(s) and {result.dirs} folder(s) in {result.seconds:.1f}s.")
+
+def _deletable_repo(destination, name, force=False):
+    """
+    Returns the clone folder of a repo after checking it is safe to delete.
+
+    Args:
+        destination (str): The directory holding the cloned repositories.
+        name (str): The name of the application or core widgets repo.
+        force (bool, optional): Delete even if the repo has uncommitted changes or unpushed commits. Defaults to False.
+
+    Returns:
+        Path: The repo folder.
+
+    Raises:
+        ValueError: If the name points outside `destination`, or the repo holds work that exists nowhere else.
+    """
+    import os
+
+    from exb_dev_cli.utils.sync import is_dirty, unpushed_commits
+
+    root = Path(os.path.abspath(destination))
+    path = Path(os.path.abspath(root / name))
+    if path.parent != root:
+        raise ValueError(f"Refusing to delete {path}: {name!r} is not a folder inside {root}.")
+    if force or not (path / ".git").exists():
+        return path
+    if is_dirty(path):
+        raise ValueError(f"{path} has uncommitted changes; commit them or pass --force to delete it anyway.")
+    unpushed = unpushed_commits(path)
+    if unpushed:
+        raise ValueError(f"{path} has {unpushed} unpushed commit(s); push them or pass --force to delete it anyway.")
+    return path
+
+def remove_app_from_config(app_name, config_file, destination, exb_install_path, keep_repo=False, background=False,
+                           mode="symlink", jobs=8, force=False):
+    """
+    Removes an app from an Experience Builder installation and deletes its cloned repo.
+
+    The app's links are removed first, so deleting the repo never leaves broken links behind. The repo,
+    including any `node_modules` folders in it, is then deleted with the parallel deleter, or moved to
+    the trash and deleted by a background process.
+
+    Args:
+        app_name (str): The name of the application, or `core_widgets`.
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str): The directory holding the cloned repositories.
+        exb_install_path (str): Path to the Experience Builder installation.
+        keep_repo (bool, optional): Only remove the links. Defaults to False.
+        background (bool, optional): Move the repo to the trash and delete it in the background. Defaults to False.
+        mode (str, optional): `symlink`, or `copy` to also delete the copied folders. Defaults to `symlink`.
+        jobs (int, optional): Maximum number of folders deleted at once. Defaults to 8.
+        force (bool, optional): Delete the repo even if it has uncommitted changes or unpushed commits. Defaults to False.
+
+    Returns:
+        RemoveResult: What was removed.
+
+    Raises:
+        ValueError: If the app is not in the configuration file, or its repo holds work that exists
+            nowhere else and `force` is not set.
+    """
+    from exb_dev_cli.utils.remove import remove_paths
+
+    selected = select_entries(load_app_config(config_file))
+    if app_name not in selected:
+        raise ValueError(f"{app_name} is not in {config_file}.")
+
+    # Checked before anything is removed, so a refused delete leaves the app fully linked
+    repo_path = None if keep_repo else _deletable_repo(destination, app_name, force)
+    link_paths = _per_widget_dirs(exb_install_path, [app_name])
+    if app_name != CORE_WIDGETS_NAME:
+        app_id = entry_app_id(selected[app_name]) or app_name
+        link_paths.append(Path(exb_install_path) / "server" / "public" / "apps" / str(app_id))
+    paths = release_links(link_paths, remove_copies=mode == "copy")
+    if repo_path is not None:
+        paths.append(repo_path)
+
+    result = remove_paths(paths, background=background, jobs=jobs)
+    _print_remove_summary(app_name, result)
+    return result
+
+def teardown_workspace(config_file, destination='./', repos_destination='./', keep_repos=False, background=False,
+                       jobs=8, force=False):
+    """
+    Deletes an Experience Builder installation and the repositories cloned for it.
+
+    The installation is deleted as a whole; the deleter removes links inside it without following
+    them, so the repos they point at are untouched until their own turn. The lockfile is kept, so
+    `setup --frozen` can rebuild the same workspace.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str, optional): The directory Experience Builder was installed into. Defaults to './'.
+        repos_destination (str, optional): The directory holding the cloned repositories. Defaults to './'.
+        keep_repos (bool, optional): Only delete the installation. Defaults to False.
+        background (bool, optional): Move folders to the trash and delete them in the background. Defaults to False.
+        jobs (int, optional): Maximum number of folders deleted at once. Defaults to 8.
+        force (bool, optional): Delete repos even if they have uncommitted changes or unpushed commits. Defaults to False.
+
+    Returns:
+        RemoveResult: What was removed.
+
+    Raises:
+        ValueError: If a repo holds work that exists nowhere else and `force` is not set. Nothing is deleted then.
+    """
+    from exb_dev_cli.utils.extract import MANIFEST_NAME
+    from exb_dev_cli.utils.lockfile import INSTALL_STAMP_NAME
+    from exb_dev_cli.utils.remove import remove_paths
+
+    paths = [Path(destination) / name for name in (EXB_FOLDER_NAME, MANIFEST_NAME, INSTALL_STAMP_NAME)]
+    if not keep_repos:
+        paths += [_deletable_repo(repos_destination, name, force) for name in select_entries(load_app_config(config_file))]
+
+    result = remove_paths([path for path in paths if path.exists() or path.is_symlink()], background=background,
+                          jobs=jobs)
+    _print_remove_summary("the workspace", result)
+    return result
+
+def fetch_experience_builder_archive(version, destination_dir, connections=1, use_cache=True, cache=None):
+    """
+    Returns a local copy of the Experience Builder archive for a version, downloading it if needed.
+
+    Args:
+        version (str): The version of Experience Builder.
+        destination_dir (str): Where to download the archive when the cache is not used.
+        connections (int, optional): Number of parallel connections for the download. Defaults to 1.
+        use_cache (bool, optional): Use the shared archive cache. Defaults to True.
+        cache (ArchiveCache, optional): The cache to use. Defaults to the user's default cache.
+
+    Returns:
+        Path: The path to the archive.
 
-    return 
+    Raises:
+        ValueError: If the version is not found in the versions.json.
+        requests.exceptions.RequestException: If there is an error downloading the file.
+        ChecksumMismatchError: If the download does not match the sha256 recorded in versions.json.
+    """
+    # Imported here so commands that never download do not pay for loading requests
+    from exb_dev_cli.utils.cache import ArchiveCache
+    from exb_dev_cli.utils.download import download_file, download_segmented
+
+    url, sha256 = get_version_details(version, VERSIONS_JSON)
+
+    if use_cache:
+        cache = cache or ArchiveCache()
+        return cache.fetch(version, url, sha256=sha256, connections=connections)
+
+    print(f"Downloading Experience Builder version {version} from {url}...")
+    # Stream the ZIP file to disk, resuming and verifying the checksum if one is recorded
+    zip_file_path = Path(destination_dir) / f"experience_builder_{version}.zip"
+    if connections > 1:
+        download_segmented(url, zip_file_path, connections=connections, sha256=sha256)
+    else:
+        download_file(url, zip_file_path, sha256=sha256)
+    return zip_file_path
+
+def prefetch_from_config(config_file, versions=None, patterns=None, tags=None, rate_limit=None, jobs=1,
+                         low_priority=True, cache=None, mirrors=None):
+    """
+    Warms the archive cache and the mirror cache, so later installs and clones run at local disk speed.
+
+    Archives of versions in versions.json that are not cached yet are downloaded one at a time, and
+    the mirror of every repo in the configuration is fetched (or created). Repos with a clone profile
+    are cloned straight from their remote and have no mirror to warm, so they are skipped. Failures
+    are collected and reported at the end instead of stopping the run, which suits cron jobs.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        versions (list, optional): Only prefetch these Experience Builder versions. Defaults to every version.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        rate_limit (int, optional): Cap archive downloads at this many bytes per second. Defaults to None.
+        jobs (int, optional): Maximum number of mirrors fetched at once. Defaults to 1.
+        low_priority (bool, optional): Run this process and its git commands at a lower priority. Defaults to True.
+        cache (ArchiveCache, optional): The archive cache. Defaults to the user's default cache.
+        mirrors (MirrorCache, optional): The mirror cache. Defaults to the user's default mirror cache.
+
+    Returns:
+        PrefetchResult: What was downloaded, fetched or failed.
+
+    Raises:
+        ValueError: If a requested version is not found in the versions.json.
+        RuntimeError: If any archive or mirror failed, once everything else has been prefetched.
+    """
+    from exb_dev_cli.utils.cache import ArchiveCache
+    from exb_dev_cli.utils.prefetch import PrefetchResult, lower_priority, prefetch_archives, prefetch_mirrors
+
+    if low_priority:
+        lower_priority()
+    if not versions:
+        versions = list(load_config(VERSIONS_JSON).get("Experience_Builder", {}))
+    archives = [(version, *get_version_details(version, VERSIONS_JSON)) for version in versions]
+    repo_urls = {
+        name: entry_url(entry) for name, entry in select_entries(load_app_config(config_file), patterns, tags).items()
+        if entry_clone_profile(entry) is None
+    }
 
-def install_experience_builder(version, destination_dir):
+    result = PrefetchResult()
+    try:
+        prefetch_archives(archives, cache or ArchiveCache(), rate_limit=rate_limit, result=result)
+        prefetch_mirrors(repo_urls, mirrors or MirrorCache(), jobs=jobs, result=result)
+    finally:
+        result.print_summary()
+    if result.failed:
+        raise RuntimeError(f"{len(result.failed)} prefetch(es) failed: {', '.join(entry[1] for entry in result.failed)}")
+    return result
+
+def install_experience_builder(version, destination_dir, connections=1, use_cache=True, cache=None, workers=None,
+                               use_store=False, store=None, lock=None):
     """
     Downloads and installs the specified version of Experience Builder.
 
     Args:
         version (str): The version of Experience Builder to install.
         destination_dir (str): The directory where Experience Builder will be installed.
+        connections (int, optional): Number of parallel connections for the download. Defaults to 1.
+        use_cache (bool, optional): Reuse archives from the shared cache instead of downloading into
+            the destination. Defaults to True.
+        cache (ArchiveCache, optional): The cache to use. Defaults to the user's default cache.
+        workers (int, optional): Number of processes used to extract the archive. Defaults to the CPU count.
+        use_store (bool, optional): Build the installation from links into the deduplicated file store
+            instead of extracting a full copy. Defaults to False.
+        store (FileStore, optional): The store to use. Defaults to the user's default store.
+        lock (Lockfile, optional): Skip the install if the lockfile shows it is already in place, and
+            record it otherwise. Defaults to None.
 
     Returns: 
         destination_dir (str): The directory where Experience Builder will be installed.
@@ -81,35 +701,435 @@ def install_experience_builder(version, destination_dir):
     Raises:
         ValueError: If the version is not found in the versions.json.
         requests.exceptions.RequestException: If there is an error downloading the file.
+        ChecksumMismatchError: If the download does not match the sha256 recorded in versions.json.
         zipfile.BadZipFile: If the downloaded file is not a valid zip file.
+        LockMismatchError: In frozen mode, if the version or archive differs from the lockfile.
     """
-    with open(VERSIONS_JSON, 'r') as f:
-        versions = json.load(f).get('Experience_Builder', {})
-    
-    if version not in versions:
-        raise ValueError(f"Version {version} not found in versions.json.")
-    
-    url = versions[version]
-    print(f"Downloading Experience Builder version {version} from {url}...")
-    
-    # Download the ZIP file
-    response = requests.get(url)
-    response.raise_for_status()
-    
-    # Save the ZIP file
-    zip_file_path = Path(destination_dir) / f"experience_builder_{version}.zip"
-    with open(zip_file_path, 'wb') as f:
-        f.write(response.content)
+    from exb_dev_cli.utils.extract import extract_archive
+
+    if lock is not None:
+        locked_sha256 = lock.locked_exb_sha256(version)
+        if lock.exb_is_current(version, destination_dir):
+            print(f"Experience Builder version {version} is already installed in {destination_dir}, skipping.")
+            return destination_dir
+
+    zip_file_path = fetch_experience_builder_archive(version, destination_dir, connections, use_cache, cache)
+
+    if lock is not None:
+        from exb_dev_cli.utils.download import file_sha256
+        from exb_dev_cli.utils.lockfile import LockMismatchError
+
+        sha256 = file_sha256(zip_file_path)
+        if lock.frozen and sha256 != locked_sha256:
+            raise LockMismatchError(f"The Experience Builder {version} archive ({sha256[:12]}) does not match "
+                                    f"the locked archive ({locked_sha256[:12]}).")
     
-    # Unzip the file
-    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-        zip_ref.extractall(destination_dir)
+    if use_store:
+        from exb_dev_cli.utils.store import FileStore
+
+        store = store or FileStore()
+        # Cached archives are named after their sha256, which saves hashing them again
+        archive_sha256 = sha256 if lock is not None else (Path(zip_file_path).stem if use_cache else None)
+        store.import_archive(zip_file_path, version, archive_sha256)
+        result = store.materialize(version, destination_dir)
+        print(f"Linked {result.linked} file(s) from the store, copied {result.copied}, {result.skipped} already in place.")
+    else:
+        # Unzip the file, skipping members that are already extracted
+        result = extract_archive(zip_file_path, destination_dir, workers=workers)
+        print(f"Extracted {result.written} file(s), {result.skipped} already up to date.")
     
     print(f"Experience Builder version {version} installed in {destination_dir}.")
+    if lock is not None:
+        lock.record_exb(version, sha256, destination_dir)
+        lock.save()
 
     return destination_dir
 
-def clone_and_symlink(app_name, config_file_path, exb_install_path):
+def upgrade_experience_builder(from_version, to_version, destination_dir, connections=1, use_cache=True, cache=None, workers=None):
+    """
+    Upgrades an installed Experience Builder to another version, writing only the files that changed.
+
+    Args:
+        from_version (str): The installed version of Experience Builder.
+        to_version (str): The version to upgrade to.
+        destination_dir (str): The directory Experience Builder is installed in.
+        connections (int, optional): Number of parallel connections for downloads. Defaults to 1.
+        use_cache (bool, optional): Use the shared archive cache. Defaults to True.
+        cache (ArchiveCache, optional): The cache to use. Defaults to the user's default cache.
+        workers (int, optional): Number of processes used to extract changed files. Defaults to the CPU count.
+
+    Returns:
+        ExtractResult: Counts of written, unchanged, removed and kept files and the bytes written.
+
+    Raises:
+        ValueError: If either version is not found in the versions.json.
+        requests.exceptions.RequestException: If there is an error downloading an archive.
+        ChecksumMismatchError: If a download does not match the sha256 recorded in versions.json.
+        zipfile.BadZipFile: If an archive is not a valid zip file.
+    """
+    from exb_dev_cli.utils.extract import upgrade_tree
+    from exb_dev_cli.utils.parallel_clone import format_size
+
+    old_zip_path = fetch_experience_builder_archive(from_version, destination_dir, connections, use_cache, cache)
+    new_zip_path = fetch_experience_builder_archive(to_version, destination_dir, connections, use_cache, cache)
+
+    result = upgrade_tree(old_zip_path, new_zip_path, destination_dir, workers=workers)
+    print(f"Wrote {result.written} changed file(s) ({format_size(result.bytes_written)}), "
+          f"removed {result.removed}, {result.skipped} unchanged.")
+    if result.kept:
+        print(f"Left {result.kept} file(s) inside linked app and widget folders untouched.")
+    print(f"Experience Builder in {destination_dir} upgraded from {from_version} to {to_version}.")
+    return result
+
+def setup_workspace(version, config_file, destination='./', repos_destination='./', connections=1, use_cache=True,
+                    workers=None, jobs=4, link_jobs=1, use_mirrors=True, mode="symlink", patterns=None, tags=None,
+                    lock=None, deps=False, deps_jobs=2, installer=None, only_used_widgets=False):
+    """
+    Installs Experience Builder, clones every configured repository and links each app, overlapping the steps.
+
+    The steps run as a dependency graph: the Experience Builder download and extraction runs alongside
+    the clones, and each app is linked (or copied) as soon as both its repo and the Experience Builder
+    tree are ready; links that need admin rights are created in one elevated batch once every app is
+    linked. Existing repos are brought up to date instead of re-cloned. A failed clone only
+    skips that app's link step; a failed install cancels everything that has not started. With a
+    lockfile, an installation and repos that still match it are skipped, so a warm workspace is
+    checked in well under a second; in frozen mode repos are checked out at their locked commits.
+    With `deps`, the npm dependencies of the client and of each linked widget folder are installed
+    from the `node_modules` cache as soon as the folder is in place.
+
+    Args:
+        version (str): The version of Experience Builder to install.
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        destination (str, optional): The directory to install Experience Builder into. Defaults to './'.
+        repos_destination (str, optional): The directory to clone the repositories into. Defaults to './'.
+        connections (int, optional): Number of parallel connections for the download. Defaults to 1.
+        use_cache (bool, optional): Use the shared archive cache. Defaults to True.
+        workers (int, optional): Number of processes used to extract the archive. Defaults to the CPU count.
+        jobs (int, optional): Maximum number of clones to run at once. Defaults to 4.
+        link_jobs (int, optional): Maximum number of apps to link at once. Defaults to 1.
+        use_mirrors (bool, optional): Clone from the shared mirror cache. Defaults to True.
+        mode (str, optional): `symlink` or `copy`. Defaults to `symlink`.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        lock (Lockfile, optional): The workspace lockfile. Defaults to None.
+        deps (bool, optional): Install npm dependencies after linking. Defaults to False.
+        deps_jobs (int, optional): Maximum number of dependency installs at once. Defaults to 2.
+        installer (CommandInstaller, optional): Runs the package manager. Defaults to `npm ci`.
+        only_used_widgets (bool, optional): Link only the widgets the apps use. The core widgets are
+            then linked once every repo is cloned. Defaults to False.
+
+    Returns:
+        list: The Task instances with their outcome.
+
+    Raises:
+        RuntimeError: If Experience Builder could not be installed, or if any repository failed to clone.
+        LockMismatchError: In frozen mode, if a repo or the Experience Builder version is not in the lockfile.
+    """
+    from exb_dev_cli.utils.deps import DepsResult, install_deps, package_folders
+    from exb_dev_cli.utils.git import read_head
+    from exb_dev_cli.utils.scheduler import TASK_FAILED, Task, run_tasks
+    from exb_dev_cli.utils.sync import sync_repo
+    from exb_dev_cli.utils.widgets import WidgetIndex
+
+    config = load_app_config(config_file)
+    repos = repos_from_config(config, repos_destination, patterns, tags)
+    selected = select_entries(config, patterns, tags)
+    exb_path = Path(destination) / EXB_FOLDER_NAME
+    mirrors = MirrorCache() if use_mirrors else None
+    clone_func = config_clone_func(config, mirrors)
+    deps_result = DepsResult()
+    # Links that need admin rights are created together after the run, so there is one prompt at most
+    privileged = []
+
+    def clone_step(name, repo_url, repo_path):
+        if lock is not None and lock.repo_is_current(name, repo_url, repo_path):
+            print(f"{name} is at its locked commit, skipping.")
+            return
+        if lock is not None and lock.frozen:
+            provision_repo(name, repo_url, repo_path, clone_func, lock)
+            return
+        result = sync_repo(name, repo_url, repo_path, clone_func, mirrors=mirrors)
+        if result.action == "failed":
+            raise RuntimeError(result.detail)
+        if lock is not None:
+            lock.record_repo(name, repo_url, repo_path, read_head(repo_path))
+
+    def app_links(name, repo_path, used=False):
+        if name == CORE_WIDGETS_NAME:
+            used_core = None
+            if used:
+                apps = [(app, app_path) for app, _, app_path in repos if app != CORE_WIDGETS_NAME]
+                used_core = WidgetIndex.build(apps, (name, repo_path)).used_core_widgets()
+            return plan_links(exb_path, [], repo_path, used_core_widgets=used_core)
+        used_widgets = {name: WidgetIndex.build([(name, repo_path)]).used_widgets(name)} if used else None
+        return plan_links(exb_path, [(name, repo_path, entry_app_id(selected[name]))], used_widgets=used_widgets)
+
+    def link_step(name, repo_path):
+        desired = app_links(name, repo_path, only_used_widgets)
+        per_widget_dirs = _per_widget_dirs(exb_path, [name]) if only_used_widgets else ()
+        prepare_link_layout(exb_path, desired, per_widget_dirs, remove_copies=mode == "copy")
+        if mode == "copy":
+            from exb_dev_cli.utils.copy_sync import mirror_pairs
+
+            mirror_pairs(desired)
+        else:
+            apply_links(diff_links(desired), privileged=privileged)
+        if lock is not None:
+            lock.record_links(desired)
+
+    def deps_step(find_folders):
+        # The folders are only known once the install or link step before this one has run
+        install_deps(find_folders(), installer=installer, jobs=1, result=deps_result)
+
+    def client_folders():
+        client = exb_path / "client"
+        return [client] if (client / "package.json").is_file() else []
+
+    def widget_folders(name, repo_path):
+        return package_folders([link for link in app_links(name, repo_path) if link.parent == exb_path / "client"])
+
+    if lock is not None:
+        # Fails fast in frozen mode, before anything is downloaded or cloned
+        lock.locked_exb_sha256(version)
+        for name, repo_url, _ in repos:
+            lock.locked_commit(name, repo_url)
+
+    tasks = [Task("install", partial(install_experience_builder, version, destination, connections=connections,
+                                     use_cache=use_cache, workers=workers, lock=lock), pool="install")]
+    for name, repo_url, repo_path in repos:
+        tasks.append(Task(f"clone {name}", partial(clone_step, name, repo_url, repo_path), pool="clone", fatal=False))
+        link_deps = ("install", f"clone {name}")
+        if only_used_widgets and name == CORE_WIDGETS_NAME:
+            # Which core widgets are used is only known once every app's config is on disk
+            link_deps += tuple(f"clone {app}" for app, _, _ in repos if app != name)
+        tasks.append(Task(f"link {name}", partial(link_step, name, repo_path), deps=link_deps, pool="link", fatal=False))
+        if deps:
+            tasks.append(Task(f"deps {name}", partial(deps_step, partial(widget_folders, name, repo_path)),
+                              deps=(f"link {name}",), pool="deps", fatal=False))
+    if deps:
+        tasks.append(Task("deps client", partial(deps_step, client_folders), deps=("install",), pool="deps", fatal=False))
+
+    try:
+        run_tasks(tasks, limits={"install": 1, "clone": jobs, "link": link_jobs, "deps": deps_jobs})
+        elevate_links(privileged)
+        if deps and privileged:
+            # These folders were not in place yet when their deps step ran
+            widget_links = [change.link for change in privileged if exb_path / "client" in change.link.parents]
+            install_deps(package_folders(widget_links), installer=installer, jobs=deps_jobs, result=deps_result)
+    finally:
+        if lock is not None:
+            lock.save()
+        if deps:
+            deps_result.print_summary()
+
+    failed = [task.name for task in tasks if task.state == TASK_FAILED]
+    if failed:
+        raise RuntimeError(f"{len(failed)} step(s) failed: {', '.join(failed)}")
+    return tasks
+
+def export_workspace_bundle(config_file, output, version=None, repos_destination='./', connections=1, use_cache=True,
+                            jobs=4, patterns=None, tags=None, only_used_widgets=False, lock=None):
+    """
+    Packs everything needed to provision a workspace into one bundle file, for machines without network access.
+
+    The bundle holds the Experience Builder archive, a `git bundle` with every branch and tag of each
+    cloned repo, the configuration file and the link plan, with the sha256 of every member in its
+    manifest. The git bundles are created in parallel while the archive is streamed into the bundle.
+
+    Args:
+        config_file (str): Path to the JSON configuration file containing the repository URLs.
+        output (str): The bundle file to write.
+        version (str, optional): The Experience Builder version to pack. Defaults to the lockfile's version.
+        repos_destination (str, optional): The directory holding the cloned repositories. Defaults to './'.
+        connections (int, optional): Number of parallel connections if the archive must be downloaded. Defaults to 1.
+        use_cache (bool, optional): Use the shared archive cache. Defaults to True.
+        jobs (int, optional): Maximum number of git bundles created at once. Defaults to 4.
+        patterns (list, optional): Only include names matching these globs. Defaults to None.
+        tags (list, optional): Only include entries with one of these tags. Defaults to None.
+        only_used_widgets (bool, optional): Plan links for only the widgets the apps use. Defaults to False.
+        lock (Lockfile, optional): Provides the version when none is given. Defaults to None.
+
+    Returns:
+        dict: The bundle manifest.
+
+    Raises:
+        ValueError: If no version is given or locked, or a repo is not cloned.
+        BundleError: If a repo is a shallow or partial clone.
+    """
+    import os
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    from exb_dev_cli.utils.bundle import BundleWriter, create_git_bundle
+    from exb_dev_cli.utils.download import file_sha256
+    from exb_dev_cli.utils.git import read_head
+    from exb_dev_cli.utils.sync import is_dirty
+
+    if version is None:
+        version = (lock.data.get("exb") or {}).get("version") if lock is not None else None
+        if version is None:
+            raise ValueError("No Experience Builder version given and none is locked; pass --version.")
+
+    repos = repos_from_config(load_app_config(config_file), repos_destination, patterns, tags)
+    for name, _, repo_path in repos:
+        if read_head(repo_path) is None:
+            raise ValueError(f"{name} is not cloned in {repos_destination}; run `clone` first.")
+        if is_dirty(repo_path):
+            print(f"Warning: {name} has uncommitted changes, which are not included in the bundle.")
+
+    # Links are stored relative to the installation and the repos folder, so they can be rebuilt anywhere
+    exb_path = Path(EXB_FOLDER_NAME)
+    desired = plan_links_from_config(config_file, repos_destination, exb_path, patterns, tags, only_used_widgets)
+    links = {
+        link.relative_to(exb_path).as_posix(): Path(os.path.relpath(target, repos_destination)).as_posix()
+        for link, target in desired.items()
+    }
+
+    zip_file_path = fetch_experience_builder_archive(version, Path(output).parent, connections, use_cache)
+    url, _ = get_version_details(version, VERSIONS_JSON)
+    manifest = {
+        "exb": {"version": version, "url": url, "archive": f"exb/{version}.zip", "sha256": None},
+        "repos": {},
+        "links": links,
+        "per_widget": [name for name, _, _ in repos] if only_used_widgets else [],
+    }
+
+    writer = BundleWriter(output)
+    try:
+        with tempfile.TemporaryDirectory(dir=Path(output).parent) as tmp_dir, \
+                ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = [
+                (name, repo_url, repo_path,
+                 executor.submit(create_git_bundle, repo_path, Path(tmp_dir) / f"{name}.bundle"))
+                for name, repo_url, repo_path in repos
+            ]
+            writer.add_json("applications.json", load_config(config_file))
+            manifest["exb"]["sha256"] = writer.add_file(manifest["exb"]["archive"], zip_file_path)
+            for name, repo_url, repo_path, future in futures:
+                future.result()
+                member = f"repos/{name}.bundle"
+                writer.add_file(member, Path(tmp_dir) / f"{name}.bundle")
+                manifest["repos"][name] = {"url": repo_url, "bundle": member, "commit": read_head(repo_path)}
+                print(f"Packed {name} at {manifest['repos'][name]['commit'][:12]}.")
+        writer.close(manifest)
+    except BaseException:
+        writer.abort()
+        raise
+    if not use_cache:
+        Path(zip_file_path).unlink(missing_ok=True)
+    print(f"Bundled Experience Builder {version}, {len(repos)} repo(s) and {len(links)} link(s) into {output}.")
+    return manifest
+
+def import_workspace_bundle(bundle_path, config_file, destination='./', repos_destination='./', jobs=4, workers=None,
+                            mode="symlink", cache=None):
+    """
+    Provisions a workspace from a bundle made by `export_workspace_bundle`, without any network access.
+
+    Bundle members are unpacked in parallel and checked against their recorded sha256. The archive
+    goes into the shared archive cache, so later installs of the same version also work offline.
+    Experience Builder is extracted while the repos are cloned from their git bundles; each clone's
+    `origin` is pointed at the configured URL, so later fetches use the real remote. Repos that
+    already exist are left alone. The links are then applied and everything is recorded in the
+    lockfile next to the configuration file.
+
+    Args:
+        bundle_path (str): The bundle file.
+        config_file (str): Path to the JSON configuration file. The bundled one is written there if it does not exist.
+        destination (str, optional): The directory to install Experience Builder into. Defaults to './'.
+        repos_destination (str, optional): The directory to clone the repositories into. Defaults to './'.
+        jobs (int, optional): Maximum number of members unpacked and repos cloned at once. Defaults to 4.
+        workers (int, optional): Number of processes used to extract the archive. Defaults to the CPU count.
+        mode (str, optional): `symlink` or `copy`. Defaults to `symlink`.
+        cache (ArchiveCache, optional): The cache to store the archive in. Defaults to the user's default cache.
+
+    Returns:
+        dict: The bundle manifest.
+
+    Raises:
+        BundleError: If the file is not a workspace bundle or a member does not match its checksum.
+        RuntimeError: If Experience Builder could not be extracted or any repo failed to clone.
+    """
+    import os
+    import tempfile
+
+    from exb_dev_cli.utils.bundle import clone_from_bundle, read_manifest, unpack_members
+    from exb_dev_cli.utils.cache import ArchiveCache
+    from exb_dev_cli.utils.extract import extract_archive
+    from exb_dev_cli.utils.git import read_head
+    from exb_dev_cli.utils.lockfile import Lockfile
+    from exb_dev_cli.utils.scheduler import TASK_FAILED, Task, run_tasks
+
+    manifest = read_manifest(bundle_path)
+    exb = manifest["exb"]
+    cache = cache or ArchiveCache()
+    exb_path = Path(destination) / EXB_FOLDER_NAME
+    Path(repos_destination).mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=repos_destination) as tmp_dir:
+        targets = {}
+        if not Path(config_file).exists():
+            targets["applications.json"] = Path(config_file)
+        zip_file_path = cache.lookup(exb["version"], exb["sha256"])
+        if zip_file_path is None:
+            # Unpacked next to the cache so it can be moved in without a copy
+            staged_zip = cache.root / "downloads" / f"{exb['version']}.{os.getpid()}.bundle.zip"
+            targets[exb["archive"]] = staged_zip
+        clones = {}
+        for name, repo in manifest["repos"].items():
+            repo_path = Path(repos_destination) / name
+            if repo_path.exists():
+                print(f"{repo_path} already exists, skipping.")
+                continue
+            clones[name] = (repo, repo_path, Path(tmp_dir) / f"{name}.bundle")
+            targets[repo["bundle"]] = clones[name][2]
+
+        try:
+            unpack_members(bundle_path, targets, jobs=jobs)
+            if zip_file_path is None:
+                zip_file_path = cache.add(exb["version"], exb["url"], staged_zip, exb["sha256"])
+        finally:
+            if zip_file_path is None:
+                staged_zip.unlink(missing_ok=True)
+
+        def install_step():
+            result = extract_archive(zip_file_path, destination, workers=workers)
+            print(f"Extracted {result.written} file(s), {result.skipped} already up to date.")
+
+        def clone_step(name, repo, repo_path, git_bundle):
+            clone_from_bundle(git_bundle, repo_path, repo["url"], repo["commit"])
+            print(f"Cloned {name} at {repo['commit'][:12]}.")
+
+        tasks = [Task("install", install_step, pool="install")]
+        tasks += [Task(f"clone {name}", partial(clone_step, name, *clone), pool="clone", fatal=False)
+                  for name, clone in clones.items()]
+        run_tasks(tasks, limits={"install": 1, "clone": jobs})
+
+    failed = [task.name for task in tasks if task.state == TASK_FAILED]
+    if failed:
+        raise RuntimeError(f"{len(failed)} step(s) failed: {', '.join(failed)}")
+
+    desired = {exb_path / link: Path(repos_destination) / target for link, target in manifest["links"].items()}
+    prepare_link_layout(exb_path, desired, _per_widget_dirs(exb_path, manifest.get("per_widget", [])),
+                        remove_copies=mode == "copy")
+    if mode == "copy":
+        from exb_dev_cli.utils.copy_sync import mirror_pairs
+
+        mirror_pairs(desired)
+    else:
+        apply_links(diff_links(desired))
+
+    lock = Lockfile.for_config(config_file)
+    lock.record_exb(exb["version"], exb["sha256"], destination)
+    for name, repo in manifest["repos"].items():
+        repo_path = Path(repos_destination) / name
+        lock.record_repo(name, repo["url"], repo_path, read_head(repo_path))
+    lock.record_links(desired)
+    lock.save()
+    print(f"Workspace provisioned from {bundle_path}: Experience Builder {exb['version']} in {destination}, "
+          f"{len(clones)} repo(s) cloned.")
+    return manifest
+
+def clone_and_symlink(app_name, config_file_path, exb_install_path, use_mirrors=True):
     """
     Clones a specified application repository and creates symlinks to the Experience Builder installation.
 
@@ -117,12 +1137,14 @@ def clone_and_symlink(app_name, config_file_path, exb_install_path):
         app_name (str): Name of the application to clone.
         config_file_path (str): Path to the config file containing repository URLs.
         exb_install_path (str): Path to the Experience Builder installation.
+        use_mirrors (bool, optional): Clone from the shared mirror cache. Defaults to True.
     """
     app_repo_url, repo_type = get_repo_details(app_name, config_file_path)      
 
-    # Clone the repo
+    # Clone the repo, applying its clone profile if it has one
     app_repo_path = Path(f"./{app_name}")
-    app_repo_path = clone_repo(app_repo_url, app_repo_path)
+    clone_func = config_clone_func(load_app_config(config_file_path), MirrorCache() if use_mirrors else None)
+    app_repo_path = clone_func(app_repo_url, app_repo_path)
 
     # Create symlinks
     if Path(exb_install_path).exists():
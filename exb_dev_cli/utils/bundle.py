@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from exb_dev_cli.utils.extract import READ_SIZE
+from exb_dev_cli.utils.git import read_head, run_git
+from exb_dev_cli.utils.tracing import span
+
+
+BUNDLE_FORMAT = 1
+BUNDLE_MANIFEST_NAME = "bundle.json"
+
+
+class BundleError(ValueError):
+    """Raised when a workspace bundle cannot be created or is damaged."""
+
+
+class BundleWriter:
+    """
+    Class to stream files into a workspace bundle, recording the sha256 of every member.
+
+    A bundle is a zip file. Members are written in chunks straight from disk, so even a multi-gigabyte
+    Experience Builder archive is never held in memory. Archives and git bundles are already
+    compressed and are stored as-is; JSON members are deflated.
+
+    Attributes:
+        path (Path): The bundle file.
+        files (dict): Maps member names to their sha256.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.files = {}
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", allowZip64=True)
+
+    def add_file(self, name: str, source, compress: bool = False):
+        """
+        Streams a file into the bundle.
+
+        Args:
+            name (str): The member name.
+            source (Path): The file to add.
+            compress (bool, optional): Deflate the member. Defaults to False.
+
+        Returns:
+            str: The member's sha256.
+        """
+        info = zipfile.ZipInfo(name)
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        digest = hashlib.sha256()
+        with open(source, "rb") as src, self._zip.open(info, "w", force_zip64=True) as dst:
+            for chunk in iter(lambda: src.read(READ_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+        self.files[name] = digest.hexdigest()
+        return self.files[name]
+
+    def add_json(self, name: str, data):
+        """Adds a JSON member. Returns its sha256."""
+        content = json.dumps(data, indent=2, sort_keys=True).encode()
+        self._zip.writestr(zipfile.ZipInfo(name), content, compress_type=zipfile.ZIP_DEFLATED)
+        self.files[name] = hashlib.sha256(content).hexdigest()
+        return self.files[name]
+
+    def close(self, manifest: dict):
+        """
+        Writes the manifest with every member's checksum and moves the finished bundle into place.
+
+        Args:
+            manifest (dict): What the bundle holds. The checksums are added under `files`.
+        """
+        manifest = dict(manifest, format=BUNDLE_FORMAT, files=dict(self.files))
+        self._zip.writestr(zipfile.ZipInfo(BUNDLE_MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True),
+                           compress_type=zipfile.ZIP_DEFLATED)
+        self._zip.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Discards a partly written bundle."""
+        self._zip.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def create_git_bundle(repo_path, output):
+    """
+    Packs every branch, tag and HEAD of a repo into a git bundle file.
+
+    Args:
+        repo_path (Path): The repo's working tree.
+        output (Path): The bundle file to write.
+
+    Raises:
+        BundleError: If the repo is shallow or partial, since its bundle could not be cloned on its own.
+        subprocess.CalledProcessError: If git fails.
+    """
+    from exb_dev_cli.utils.sync import is_partial, is_shallow
+
+    if is_shallow(repo_path) or is_partial(repo_path):
+        raise BundleError(f"{repo_path} is a shallow or partial clone; run `unshallow --full` before bundling it.")
+    run_git(['bundle', 'create', '-q', Path(output).resolve(), '--all'], cwd=repo_path, capture_output=True)
+
+
+def read_manifest(bundle_path):
+    """
+    Reads the manifest of a workspace bundle.
+
+    Args:
+        bundle_path (Path): The bundle file.
+
+    Returns:
+        dict: The manifest.
+
+    Raises:
+        BundleError: If the file is not a workspace bundle or has an unsupported format.
+    """
+    try:
+        with zipfile.ZipFile(bundle_path) as zf:
+            manifest = json.loads(zf.read(BUNDLE_MANIFEST_NAME))
+    except (zipfile.BadZipFile, KeyError, ValueError) as e:
+        raise BundleError(f"{bundle_path} is not a workspace bundle: {e}")
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"{bundle_path} has unsupported bundle format {manifest.get('format')}.")
+    return manifest
+
+
+def _unpack_member(bundle_path, name, target, expected):
+    digest = hashlib.sha256()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(bundle_path) as zf, zf.open(name) as src, open(target, "wb") as dst:
+        for chunk in iter(lambda: src.read(READ_SIZE), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    if digest.hexdigest() != expected:
+        target.unlink()
+        raise BundleError(f"{name} in the bundle is damaged: expected sha256 {expected}, got {digest.hexdigest()}.")
+
+
+def unpack_members(bundle_path, targets, jobs=4):
+    """
+    Extracts bundle members in parallel, verifying each against the manifest's checksum.
+
+    Each worker opens the bundle on its own, so large members are read and written concurrently.
+
+    Args:
+        bundle_path (Path): The bundle file.
+        targets (dict): Maps member names to the files to write them to.
+        jobs (int, optional): Maximum number of members extracted at once. Defaults to 4.
+
+    Raises:
+        BundleError: If a member is missing from the manifest or does not match its checksum.
+    """
+    files = read_manifest(bundle_path)["files"]
+    missing = [name for name in targets if name not in files]
+    if missing:
+        raise BundleError(f"The bundle manifest has no checksum for {', '.join(missing)}.")
+    with span("bundle unpack", "bundle", members=len(targets)):
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = [executor.submit(_unpack_member, bundle_path, name, Path(target), files[name])
+                       for name, target in targets.items()]
+            for future in futures:
+                future.result()
+
+
+def clone_from_bundle(bundle_file, destination, repo_url, commit=None):
+    """
+    Clones a repo from a git bundle and points it back at its real remote.
+
+    Args:
+        bundle_file (Path): The git bundle.
+        destination (Path): The working tree to create.
+        repo_url (str): The configured URL, set as `origin` so later fetches use the real remote.
+        commit (str, optional): The commit to check out. Defaults to the bundle's HEAD.
+
+    Raises:
+        subprocess.CalledProcessError: If git fails.
+    """
+    destination = Path(destination)
+    try:
+        run_git(['clone', '-q', Path(bundle_file).resolve(), destination], capture_output=True)
+        run_git(['remote', 'set-url', 'origin', repo_url], cwd=destination, capture_output=True)
+        if commit and read_head(destination) != commit:
+            run_git(['checkout', '-q', commit], cwd=destination, capture_output=True)
+    except Exception:
+        shutil.rmtree(destination, ignore_errors=True)
+        raise
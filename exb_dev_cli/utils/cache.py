@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from exb_dev_cli.utils.locking import file_lock
+from exb_dev_cli.utils.tracing import span
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "exb-dev-cli"
+DEFAULT_MAX_BYTES = 5 * 1024 ** 3
+# Archives used this recently are never evicted: another process may have just looked one up and
+# not opened it yet
+EVICTION_GRACE_SECONDS = 60
+
+
+def parse_size(value):
+    """
+    Parses a human readable size such as `500M` or `5G` into bytes.
+
+    Args:
+        value (str or int): The size. Plain numbers are bytes; K, M, G and T suffixes are powers of 1024.
+
+    Returns:
+        int: The size in bytes.
+
+    Raises:
+        ValueError: If the value cannot be parsed.
+    """
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit.upper() or " "))
+
+
+def default_cache_dir():
+    """Returns the cache directory, honouring the EXB_DEV_CLI_CACHE environment variable."""
+    return Path(os.environ.get("EXB_DEV_CLI_CACHE", DEFAULT_CACHE_DIR))
+
+
+def default_max_bytes():
+    """Returns the cache size cap, honouring the EXB_DEV_CLI_CACHE_MAX environment variable."""
+    return parse_size(os.environ.get("EXB_DEV_CLI_CACHE_MAX", DEFAULT_MAX_BYTES))
+
+
+def _entry_matches(sha256, entry, version, url, expected):
+    """Checks whether an index entry is the archive asked for."""
+    if expected:
+        return sha256 == expected.lower()
+    # Without a digest the version alone is not enough: a moved download URL may serve a new build
+    return entry["version"] == version and (url is None or entry.get("url") == url)
+
+
+class ArchiveCache:
+    """
+    Class to manage a shared, content-addressed cache of Experience Builder archives.
+
+    Archives are stored as `archives/<sha256>.zip` and described in `index.json`, which maps each
+    digest to its version, URL, size and last use. When the cache grows past `max_bytes` the least
+    recently used archives are evicted. All index updates happen under a file lock, and each version
+    is downloaded under its own lock, so parallel processes on one host share a single download.
+
+    Attributes:
+        root (Path): The cache directory.
+        max_bytes (int): The size cap for cached archives.
+    """
+
+    def __init__(self, root: Path = None, max_bytes: int = None):
+        """
+        Initializes the ArchiveCache instance.
+
+        Args:
+            root (Path, optional): The cache directory. Defaults to `default_cache_dir()`.
+            max_bytes (int, optional): The size cap in bytes. Defaults to `default_max_bytes()`.
+        """
+        self.root = Path(root) if root else default_cache_dir()
+        self.max_bytes = default_max_bytes() if max_bytes is None else max_bytes
+
+    @property
+    def archives_dir(self):
+        """Returns the directory holding the cached archives."""
+        return self.root / "archives"
+
+    @property
+    def index_path(self):
+        """Returns the path of the cache index."""
+        return self.root / "index.json"
+
+    def archive_path(self, sha256: str):
+        """Returns the path of the cached archive with the given digest."""
+        return self.archives_dir / f"{sha256}.zip"
+
+    def _lock(self, name="index"):
+        return file_lock(self.root / "locks" / f"{name}.lock")
+
+    def _read_index(self):
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def _write_index(self, index):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def entries(self):
+        """
+        Lists the cached archives, most recently used first.
+
+        Returns:
+            list: Dicts with `sha256`, `version`, `url`, `size` and `last_used` keys.
+        """
+        with self._lock():
+            index = self._read_index()
+        entries = [dict(entry, sha256=sha256) for sha256, entry in index.items()]
+        return sorted(entries, key=lambda e: e["last_used"], reverse=True)
+
+    def lookup(self, version: str, sha256: str = None, url: str = None):
+        """
+        Returns the cached archive for a version and marks it as recently used.
+
+        Args:
+            version (str): The Experience Builder version.
+            sha256 (str, optional): The expected digest. When given, the archive is looked up by content.
+            url (str, optional): The download URL. Without `sha256`, only an archive downloaded from
+                this URL is a hit. Defaults to None, which accepts any URL.
+
+        Returns:
+            Path: The cached archive, or None on a miss.
+        """
+        with span("cache lookup", "cache", version=version) as trace, self._lock():
+            index = self._read_index()
+            matches = [k for k, e in index.items() if _entry_matches(k, e, version, url, sha256)]
+            key = max(matches, key=lambda k: index[k]["last_used"]) if matches else None
+
+            if key is None or not self.archive_path(key).exists():
+                trace["hit"] = False
+                return None
+            trace["hit"] = True
+            index[key]["last_used"] = time.time()
+            self._write_index(index)
+            return self.archive_path(key)
+
+    def add(self, version: str, url: str, file_path: Path, sha256: str):
+        """
+        Moves a downloaded archive into the cache and evicts old entries if needed.
+
+        Args:
+            version (str): The Experience Builder version.
+            url (str): The URL the archive was downloaded from.
+            file_path (Path): The downloaded archive. It is moved into the cache.
+            sha256 (str): The digest of the archive.
+
+        Returns:
+            Path: The cached archive.
+        """
+        sha256 = sha256.lower()
+        self.archives_dir.mkdir(parents=True, exist_ok=True)
+        target = self.archive_path(sha256)
+        with self._lock():
+            os.replace(file_path, target)
+            index = self._read_index()
+            index[sha256] = {
+                "version": version,
+                "url": url,
+                "size": target.stat().st_size,
+                "last_used": time.time(),
+            }
+            self._evict(index, self.max_bytes, keep=sha256)
+            self._write_index(index)
+        return target
+
+    def fetch(self, version: str, url: str, sha256: str = None, connections: int = 1, rate_limit: int = None):
+        """
+        Returns the cached archive for a version, downloading it on a miss.
+
+        Args:
+            version (str): The Experience Builder version.
+            url (str): The URL to download from on a miss.
+            sha256 (str, optional): The expected digest of the archive. Defaults to None.
+            connections (int, optional): Parallel connections for the download. Defaults to 1.
+            rate_limit (int, optional): Cap the download at this many bytes per second, over a single
+                connection. Defaults to None.
+
+        Returns:
+            Path: The cached archive.
+        """
+        # Imported here so listing or pruning the cache does not load requests
+        from exb_dev_cli.utils.download import download_file, download_segmented, verify_sha256
+
+        cached = self.lookup(version, sha256, url)
+        if cached:
+            print(f"Using cached Experience Builder {version} archive: {cached}")
+            return cached
+
+        with self._lock(f"download-{version}"):
+            # Another process may have finished the download while we waited for the lock
+            cached = self.lookup(version, sha256, url)
+            if cached:
+                print(f"Using cached Experience Builder {version} archive: {cached}")
+                return cached
+
+            downloads_dir = self.root / "downloads"
+            downloads_dir.mkdir(parents=True, exist_ok=True)
+            # Named after the URL so a partial download is only ever resumed from the URL it came from
+            url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
+            download_path = downloads_dir / f"{version}-{url_hash}.zip"
+            stale_part = re.compile(rf"{re.escape(version)}-[0-9a-f]{{16}}\.zip\.part")
+            for stale in downloads_dir.iterdir():
+                if stale_part.fullmatch(stale.name) and stale.name != f"{download_path.name}.part":
+                    stale.unlink(missing_ok=True)
+            if connections > 1 and not rate_limit:
+                digest = download_segmented(url, download_path, connections=connections, sha256=sha256)
+            else:
+                digest = download_file(url, download_path, sha256=sha256, rate_limit=rate_limit)
+            verify_sha256(url, digest, sha256)
+            return self.add(version, url, download_path, digest)
+
+    def contains(self, version: str, sha256: str = None, url: str = None):
+        """
+        Checks whether an archive is cached, without marking it as recently used.
+
+        Args:
+            version (str): The Experience Builder version.
+            sha256 (str, optional): The expected digest. When given, the archive is looked up by content.
+            url (str, optional): The download URL, matched as in `lookup`. Defaults to None.
+
+        Returns:
+            bool: True if the archive is in the cache.
+        """
+        for entry in self.entries():
+            if _entry_matches(entry["sha256"], entry, version, url, sha256) \
+                    and self.archive_path(entry["sha256"]).exists():
+                return True
+        return False
+
+    def prune(self, max_bytes: int = None, grace: float = EVICTION_GRACE_SECONDS):
+        """
+        Evicts least recently used archives until the cache fits in `max_bytes`.
+
+        Args:
+            max_bytes (int, optional): The size to shrink to. Defaults to the cache's cap; 0 empties the cache.
+            grace (float, optional): Keep archives used within this many seconds, since another process
+                may be about to open them. Defaults to EVICTION_GRACE_SECONDS.
+
+        Returns:
+            list: The entries that were removed.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock():
+            index = self._read_index()
+            removed = self._evict(index, max_bytes, grace=grace)
+            self._write_index(index)
+        return removed
+
+    def _evict(self, index, max_bytes, keep=None, grace=EVICTION_GRACE_SECONDS):
+        """
+        Removes least recently used entries from `index` and disk until the total fits in `max_bytes`.
+
+        Entries used within `grace` seconds are kept even if the cache stays over `max_bytes`: `lookup`
+        hands out paths without holding a lock, so the process that just looked one up may not have
+        opened it yet.
+        """
+        removed = []
+        total = sum(entry["size"] for entry in index.values())
+        cutoff = time.time() - grace
+        for sha256 in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= max_bytes:
+                break
+            if sha256 == keep or index[sha256]["last_used"] > cutoff:
+                continue
+            entry = index.pop(sha256)
+            self.archive_path(sha256).unlink(missing_ok=True)
+            total -= entry["size"]
+            removed.append(dict(entry, sha256=sha256))
+        return removed
@@ -1,15 +1,106 @@
 import os
-import subprocess
-import pytest
 import json
-from pathlib import Path
-import requests
-import zipfile
+import fnmatch
+import re
+import threading
+from urllib.parse import urlparse
+
+
+CORE_WIDGETS_NAME = "core_widgets"
+URL_SCHEMES = ("http", "https", "ssh", "git", "file")
+# `[user@]host:path`, as git reads it: a colon before any slash. One-letter hosts are Windows drives.
+SCP_LIKE_URL = re.compile(r"^(?:[\w.-]+@[\w.-]+|[\w.-]{2,}):(?!//)[^\s]+$")
+# Absolute paths, home-relative paths and explicitly relative paths, on POSIX and Windows
+LOCAL_PATH = re.compile(r"^(?:/|~|\.{1,2}[\\/]|[A-Za-z]:[\\/]|\\\\).+")
+# The repo folders the CLI links into Experience Builder, and so the only ones a sparse clone checks out
+SPARSE_PATHS = ["Widgets", "AppConfig"]
+CLONE_PROFILES = {
+    "full": None,
+    "sparse": {"filter": "blob:none", "depth": 1, "sparse": SPARSE_PATHS},
+}
+CLONE_KEYS = ("filter", "depth", "sparse")
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """
+    Raised when a configuration file fails validation.
+
+    Attributes:
+        errors (list): One message per problem, each prefixed with its location.
+    """
+
+    def __init__(self, file_path, errors):
+        self.errors = errors
+        super().__init__(f"Invalid config file {file_path}:\n  " + "\n  ".join(errors))
+
+
+class _CacheEntry:
+    __slots__ = ("stamp", "data", "duplicates", "validated")
+
+    def __init__(self, stamp, data, duplicates):
+        self.stamp = stamp
+        self.data = data
+        self.duplicates = duplicates
+        self.validated = False
+
+
+def _parse(file_path):
+    """Parses a JSON file, recording keys that appear more than once in the same object."""
+    duplicates = []
+
+    def collect_pairs(pairs):
+        obj = {}
+        for key, value in pairs:
+            if key in obj:
+                duplicates.append(key)
+            obj[key] = value
+        return obj
+
+    with open(file_path, 'r') as f:
+        text = f.read()
+    try:
+        data = json.loads(text, object_pairs_hook=collect_pairs)
+    except json.JSONDecodeError as e:
+        raise ConfigError(file_path, [f"line {e.lineno}, column {e.colno}: {e.msg}"]) from None
+    return data, duplicates
+
+
+def _cached_entry(file_path):
+    """Returns the cache entry for a file, re-parsing it only if its mtime or size changed."""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Config file not found: {file_path}")
+
+    key = os.path.abspath(file_path)
+    stat = os.stat(key)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or entry.stamp != stamp:
+            data, duplicates = _parse(key)
+            entry = _CacheEntry(stamp, data, duplicates)
+            _cache[key] = entry
+        return entry
+
+
+def clear_config_cache():
+    """
+    Forgets every cached configuration file.
+    """
+    with _cache_lock:
+        _cache.clear()
+
 
 def load_config(file_path):
     """
     Loads a JSON configuration file.
 
+    The parsed document is cached per path and only re-read when the file's modification time or
+    size changes, so repeated calls within a process are cheap. The returned data is shared between
+    callers and must not be modified.
+
     Args:
         file_path (str): Path to the JSON configuration file.
 
@@ -18,12 +109,239 @@ def load_config(file_path):
 
     Raises:
         FileNotFoundError: If the configuration file does not exist.
+        ConfigError: If the file is not valid JSON.
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Config file not found: {file_path}")
-    
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    return _cached_entry(file_path).data
+
+
+def load_app_config(file_path):
+    """
+    Loads and validates an applications configuration file.
+
+    The whole document is validated the first time it is loaded, so every problem is reported up
+    front instead of partway through a batch operation.
+
+    Args:
+        file_path (str): Path to the applications.json file.
+
+    Returns:
+        dict: The loaded JSON data.
+
+    Raises:
+        FileNotFoundError: If the configuration file does not exist.
+        ConfigError: If the file is not valid JSON or does not match the expected shape.
+    """
+    entry = _cached_entry(file_path)
+    if not entry.validated:
+        errors = validate_config(entry.data, entry.duplicates)
+        if errors:
+            with open(file_path, 'r') as f:
+                text = f.read()
+            raise ConfigError(file_path, [_with_line(text, error) for error in errors])
+        entry.validated = True
+    return entry.data
+
+
+def _with_line(text, error):
+    """Prefixes an error with the line of the key it refers to, when that key can be found."""
+    location, key, message = error
+    # A duplicated JSON key is reported at its second occurrence
+    occurrence = 2 if location == "document" and message.startswith("duplicate key") else 1
+    matches = list(re.finditer(r'"' + re.escape(key) + r'"\s*:', text)) if key else []
+    if len(matches) >= occurrence:
+        line = text.count("\n", 0, matches[occurrence - 1].start()) + 1
+        return f"line {line}, {location}: {message}"
+    return f"{location}: {message}"
+
+
+def is_valid_repo_url(url):
+    """
+    Checks whether a string looks like a Git remote URL.
+
+    Args:
+        url (str): The URL to check.
+
+    Returns:
+        bool: True for http(s), ssh, git and file URLs, for scp-like `[user@]host:path` remotes and
+        for local paths such as `/srv/git/app.git`, `../app` or `C:\\repos\\app`.
+    """
+    if not isinstance(url, str) or not url.strip() or url != url.strip():
+        return False
+    if SCP_LIKE_URL.match(url) or LOCAL_PATH.match(url):
+        return True
+    parsed = urlparse(url)
+    if parsed.scheme not in URL_SCHEMES:
+        return False
+    return bool(parsed.path) if parsed.scheme == "file" else bool(parsed.netloc)
+
+
+def _validate_clone_profile(location, key, profile, errors):
+    """Validates a clone profile, which is a profile name or an object with `filter`, `depth` and `sparse`."""
+    if isinstance(profile, str):
+        if profile not in CLONE_PROFILES:
+            errors.append((location, key, f"unknown clone profile {profile!r}, expected one of {', '.join(CLONE_PROFILES)}"))
+        return
+    if not isinstance(profile, dict):
+        errors.append((location, key, "must be a profile name or an object"))
+        return
+    for name in profile:
+        if name not in CLONE_KEYS:
+            errors.append((location, key, f"unknown option {name!r}, expected one of {', '.join(CLONE_KEYS)}"))
+    if "filter" in profile and not isinstance(profile["filter"], str):
+        errors.append((f"{location}.filter", key, "must be a string such as 'blob:none'"))
+    depth = profile.get("depth")
+    if depth is not None and (isinstance(depth, bool) or not isinstance(depth, int) or depth < 1):
+        errors.append((f"{location}.depth", key, "must be a positive integer"))
+    sparse = profile.get("sparse")
+    if sparse is not None and not isinstance(sparse, bool) and \
+            (not isinstance(sparse, list) or not all(isinstance(path, str) for path in sparse)):
+        errors.append((f"{location}.sparse", key, "must be true, false or a list of folders"))
+
+
+def _validate_entry(location, key, entry, errors):
+    """Validates an app or core widgets entry, which is a URL or an object with a `url`."""
+    if isinstance(entry, str):
+        url = entry
+    elif isinstance(entry, dict):
+        if "url" not in entry:
+            errors.append((location, key, "missing required 'url'"))
+            return
+        url = entry["url"]
+        tags = entry.get("tags", [])
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            errors.append((f"{location}.tags", key, "must be a list of strings"))
+        if "app_id" in entry and not isinstance(entry["app_id"], (str, int)):
+            errors.append((f"{location}.app_id", key, "must be a string or number"))
+        if "clone" in entry:
+            _validate_clone_profile(f"{location}.clone", key, entry["clone"], errors)
+    else:
+        errors.append((location, key, f"must be a URL string or an object with a 'url', not {type(entry).__name__}"))
+        return
+    if not is_valid_repo_url(url):
+        errors.append((f"{location}.url" if isinstance(entry, dict) else location, key, f"invalid repository URL {url!r}"))
+
+
+def validate_config(config, duplicates=()):
+    """
+    Validates the shape of an applications configuration.
+
+    `Applications` must map app names to a repository URL or to an object with a `url` and optional
+    `tags`, `app_id` and `clone` profile. `Core_Widgets`, if present, is a URL or an object with a `url`.
+
+    Args:
+        config (dict): The loaded configuration.
+        duplicates (list, optional): Keys that appeared more than once while parsing. Defaults to ().
+
+    Returns:
+        list: (location, key, message) tuples, empty if the configuration is valid.
+    """
+    errors = [("document", key, f"duplicate key '{key}'") for key in duplicates]
+    if not isinstance(config, dict):
+        return errors + [("document", None, "must be a JSON object")]
+
+    apps = config.get("Applications", {})
+    if not isinstance(apps, dict):
+        errors.append(("Applications", "Applications", "must be an object mapping app names to repositories"))
+        apps = {}
+
+    seen = {}
+    for name, entry in apps.items():
+        location = f"Applications.{name}"
+        folded = name.casefold()
+        if not name.strip() or name in (".", "..") or any(c in name for c in '\\/:*?"<>|'):
+            errors.append((location, name, "app name is not a valid folder name"))
+        elif folded in seen or folded == CORE_WIDGETS_NAME:
+            other = seen.get(folded, CORE_WIDGETS_NAME)
+            errors.append((location, name, f"duplicate app name, clashes with '{other}'"))
+        seen[folded] = name
+        _validate_entry(location, name, entry, errors)
+
+    if "Core_Widgets" in config and config["Core_Widgets"] is not None:
+        _validate_entry("Core_Widgets", "Core_Widgets", config["Core_Widgets"], errors)
+
+    return errors
+
+
+def entry_url(entry):
+    """
+    Returns the repository URL of an app or core widgets entry.
+
+    Args:
+        entry (str or dict): The configuration entry.
+
+    Returns:
+        str: The repository URL.
+    """
+    return entry["url"] if isinstance(entry, dict) else entry
+
+
+def entry_tags(entry):
+    """Returns the tags of an app or core widgets entry."""
+    return entry.get("tags", []) if isinstance(entry, dict) else []
+
+
+def entry_app_id(entry):
+    """Returns the `server/public/apps` folder name of an app entry, or None to use the app name."""
+    app_id = entry.get("app_id") if isinstance(entry, dict) else None
+    return str(app_id) if app_id is not None else None
+
+
+def entry_clone_profile(entry):
+    """
+    Returns how an app or core widgets entry should be cloned.
+
+    The `clone` key is either a profile name from CLONE_PROFILES or an object with any of `filter`
+    (a `git clone --filter` spec), `depth` (a history depth) and `sparse` (true for the folders the CLI
+    links, or a list of folders to check out).
+
+    Args:
+        entry (str or dict): The configuration entry.
+
+    Returns:
+        dict: The `filter`, `depth` and `sparse` (a list of folders or None) to clone with, or None for a full clone.
+    """
+    profile = entry.get("clone") if isinstance(entry, dict) else None
+    if isinstance(profile, str):
+        profile = CLONE_PROFILES[profile]
+    if not profile:
+        return None
+    sparse = profile.get("sparse")
+    return {
+        "filter": profile.get("filter"),
+        "depth": profile.get("depth"),
+        "sparse": list(SPARSE_PATHS) if sparse is True else (sparse or None),
+    }
+
+
+def select_entries(config, patterns=None, tags=None):
+    """
+    Selects the app and core widgets entries matching glob patterns or tags.
+
+    Core widgets are selected under the name `core_widgets`. With no patterns and no tags every
+    entry is selected; otherwise an entry is selected if its name matches any pattern or it has any
+    of the tags.
+
+    Args:
+        config (dict): The loaded configuration.
+        patterns (list, optional): fnmatch-style globs such as `app*`. Defaults to None.
+        tags (list, optional): Tags to select. Defaults to None.
+
+    Returns:
+        dict: Maps names to entries, applications first and core widgets last.
+    """
+    entries = dict(config.get("Applications", {}))
+    if config.get("Core_Widgets"):
+        entries[CORE_WIDGETS_NAME] = config["Core_Widgets"]
+    if not patterns and not tags:
+        return entries
+
+    wanted_tags = set(tags or [])
+    return {
+        name: entry for name, entry in entries.items()
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns or [])
+        or wanted_tags.intersection(entry_tags(entry))
+    }
+
 
 def get_repo_details(app_name, config_file_path):
     """
@@ -36,15 +354,42 @@ def get_repo_details(app_name, config_file_path):
     Returns:
         (str, str): Repository URL and type ("core-widgets" or "application").
     """
-    config = load_config(config_file_path)
+    config = load_app_config(config_file_path)
 
     if app_name == "core-widgets":
-        repo_url = config.get("Core_Widgets")
+        repo_url = entry_url(config["Core_Widgets"]) if config.get("Core_Widgets") else None
         repo_type = "core-widgets"
     elif app_name in config.get("Applications", {}):
-        repo_url = config["Applications"][app_name]
+        repo_url = entry_url(config["Applications"][app_name])
         repo_type = "application"
     else:
         raise ValueError(f"'{app_name}' not found in the configuration file.")
 
-    return repo_url, repo_type
\ No newline at end of file
+    return repo_url, repo_type
+
+
+def get_version_details(version, versions_file_path):
+    """
+    Return the download URL and optional sha256 for an Experience Builder version.
+
+    Entries in versions.json are either a plain URL or an object with `url` and `sha256` keys.
+
+    Args:
+        version (str): The Experience Builder version, e.g. `v1.16`.
+        versions_file_path (str or Path): Path to versions.json.
+
+    Returns:
+        (str, str): The download URL and the expected sha256 (None when not recorded).
+
+    Raises:
+        ValueError: If the version is not found in versions.json.
+    """
+    versions = load_config(versions_file_path).get("Experience_Builder", {})
+
+    if version not in versions:
+        raise ValueError(f"Version {version} not found in versions.json.")
+
+    entry = versions[version]
+    if isinstance(entry, dict):
+        return entry["url"], entry.get("sha256")
+    return entry, None
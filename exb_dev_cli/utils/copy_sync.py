@@ -0,0 +1,324 @@
+import hashlib
+import os
+import shutil
+import stat
+import time
+from pathlib import Path
+
+from exb_dev_cli.utils.tracing import span
+
+
+# node_modules is installed on each side separately (see `deps`), so it is never mirrored
+IGNORED_NAMES = {".git", "node_modules"}
+
+
+# A folder listing is only reused once its mtime is this old; a change landing in the same timestamp
+# tick as the listing would otherwise go unnoticed on filesystems with coarse timestamps
+RACY_LISTING_NS = 2_000_000_000
+
+
+def _stat_listed(folder, prefix, names, files):
+    for name in names:
+        try:
+            st = os.stat(os.path.join(folder, name), follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            files[prefix + name] = (st.st_size, st.st_mtime_ns)
+
+
+def snapshot(root, listings=None):
+    """
+    Records the size and modification time of every file below a folder.
+
+    With `listings`, the entries of each folder are remembered together with the folder's modification
+    time. Adding, removing or renaming an entry changes that time, so a folder whose time is unchanged
+    is not read again: its known files are only stat-ed, since editing a file in place leaves the
+    folder's time alone.
+
+    Args:
+        root (str or Path): The folder to scan.
+        listings (dict, optional): Folder listings from the previous scan of the same root, updated in
+            place. Defaults to None, which reads every folder.
+
+    Returns:
+        dict: Maps POSIX-style relative paths to (size, mtime_ns) tuples. Missing folders give an empty dict.
+    """
+    files = {}
+    root = str(root)
+    stack = [("", root)]
+    visited = set()
+    while stack:
+        prefix, folder = stack.pop()
+        try:
+            if listings is not None:
+                mtime = os.stat(folder).st_mtime_ns
+                visited.add(prefix)
+                cached = listings.get(prefix)
+                if cached is not None and cached[0] == mtime:
+                    _, subfolders, names = cached
+                    stack.extend((prefix + name + "/", os.path.join(folder, name)) for name in subfolders)
+                    _stat_listed(folder, prefix, names, files)
+                    continue
+            subfolders, names = [], []
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name in IGNORED_NAMES:
+                        continue
+                    name = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((name + "/", entry.path))
+                        subfolders.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        files[name] = (st.st_size, st.st_mtime_ns)
+                        names.append(entry.name)
+            if listings is not None:
+                if time.time_ns() - mtime >= RACY_LISTING_NS:
+                    listings[prefix] = (mtime, subfolders, names)
+                else:
+                    listings.pop(prefix, None)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    if listings is not None:
+        for prefix in listings.keys() - visited:
+            del listings[prefix]
+    return files
+
+
+def _digest(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def files_match(source, target, source_meta, target_meta):
+    """
+    Checks whether a copied file is up to date, rsync style.
+
+    Equal size and modification time is trusted. Equal size with a different modification time falls
+    back to comparing hashes, and on a match the target's modification time is updated so the next
+    comparison is cheap again.
+
+    Args:
+        source (Path): The source file.
+        target (Path): The copied file.
+        source_meta (tuple): The source's (size, mtime_ns).
+        target_meta (tuple): The target's (size, mtime_ns), or None if it does not exist.
+
+    Returns:
+        bool: True if the target does not need to be copied again.
+    """
+    if target_meta is None or source_meta[0] != target_meta[0]:
+        return False
+    if source_meta[1] == target_meta[1]:
+        return True
+    if _digest(source) != _digest(target):
+        return False
+    os.utime(target, ns=(source_meta[1], source_meta[1]))
+    return True
+
+
+def copy_file(source, target):
+    """
+    Copies a file with its modification time, replacing the target atomically.
+
+    The copy is written next to the target and renamed over it, so a running dev server never reads a
+    half-written file.
+
+    Args:
+        source (Path): The file to copy.
+        target (Path): Where to copy it.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.exb-tmp")
+    shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def _remove_file(path):
+    try:
+        os.unlink(path)
+    except PermissionError:
+        # Read-only files (e.g. checked out read-only on Windows) cannot be deleted until made writable
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _remove_empty_parents(path, root):
+    folder = path.parent
+    while folder != root and folder.is_dir() and not any(folder.iterdir()):
+        folder.rmdir()
+        folder = folder.parent
+
+
+class CopyResult:
+    """
+    Class to summarize mirroring a folder.
+
+    Attributes:
+        copied (list): Relative paths of files that were copied.
+        removed (list): Relative paths of files deleted because the source no longer has them.
+        skipped (int): Files that were already up to date.
+        bytes_copied (int): Bytes written by copies.
+    """
+
+    def __init__(self):
+        self.copied = []
+        self.removed = []
+        self.skipped = 0
+        self.bytes_copied = 0
+
+    @property
+    def changed(self):
+        """Returns True if any file was copied or removed."""
+        return bool(self.copied or self.removed)
+
+
+class TreeMirror:
+    """
+    Class to keep a folder in the Experience Builder tree a copy of a folder in an app repo.
+
+    This is the alternative to symlinks on machines where creating them is not allowed. `sync` compares
+    both sides once; after that `poll` only rescans the source's metadata and compares it with the
+    previous snapshot, so the copied tree is never read again and only changed files are pushed. Source
+    folders whose modification time is unchanged are not listed again (see `snapshot`).
+
+    Attributes:
+        source (Path): The folder in the app repo, e.g. `Widgets`.
+        target (Path): The folder in the Experience Builder tree, e.g. `client/<app>_widgets`.
+    """
+
+    def __init__(self, source: Path, target: Path):
+        self.source = Path(source)
+        self.target = Path(target)
+        self._snapshot = None
+        self._listings = {}
+
+    def sync(self, dry_run: bool = False):
+        """
+        Brings the target fully up to date with the source.
+
+        A symlink left at the target by the symlink mode is replaced by a real folder.
+
+        Args:
+            dry_run (bool, optional): Only report what would change. Defaults to False.
+
+        Returns:
+            CopyResult: The files copied, removed and skipped.
+
+        Raises:
+            FileExistsError: If the target is a file.
+        """
+        result = CopyResult()
+        with span("copy sync", "copy", source=str(self.source)) as trace:
+            if self.target.is_symlink():
+                if not dry_run:
+                    self.target.unlink()
+            elif self.target.exists() and not self.target.is_dir():
+                raise FileExistsError(f"{self.target} exists and is not a folder.")
+
+            source_files = snapshot(self.source, self._listings)
+            target_files = {} if self.target.is_symlink() else snapshot(self.target)
+            for name, meta in source_files.items():
+                source, target = self.source / name, self.target / name
+                if files_match(source, target, meta, target_files.get(name)):
+                    result.skipped += 1
+                    continue
+                if not dry_run:
+                    copy_file(source, target)
+                result.copied.append(name)
+                result.bytes_copied += meta[0]
+
+            for name in sorted(set(target_files) - set(source_files)):
+                if not dry_run:
+                    _remove_file(self.target / name)
+                    _remove_empty_parents(self.target / name, self.target)
+                result.removed.append(name)
+
+            if not dry_run:
+                self._snapshot = source_files
+            trace.update(copied=len(result.copied), removed=len(result.removed), bytes=result.bytes_copied)
+        return result
+
+    def poll(self):
+        """
+        Pushes the source files that changed since the last `sync` or `poll`.
+
+        Returns:
+            CopyResult: The files copied and removed.
+        """
+        if self._snapshot is None:
+            return self.sync()
+
+        result = CopyResult()
+        current = snapshot(self.source, self._listings)
+        for name, meta in current.items():
+            if self._snapshot.get(name) == meta:
+                continue
+            try:
+                copy_file(self.source / name, self.target / name)
+            except FileNotFoundError:
+                # Deleted between the scan and the copy; the next poll removes it from the target
+                current.pop(name, None)
+                continue
+            result.copied.append(name)
+            result.bytes_copied += meta[0]
+
+        for name in sorted(set(self._snapshot) - set(current)):
+            _remove_file(self.target / name)
+            _remove_empty_parents(self.target / name, self.target)
+            result.removed.append(name)
+
+        self._snapshot = current
+        return result
+
+
+def mirror_pairs(pairs, dry_run=False):
+    """
+    Mirrors several source folders into the Experience Builder tree.
+
+    Args:
+        pairs (dict): Maps target folders to source folders, as returned by `plan_links`.
+        dry_run (bool, optional): Only print the changes. Defaults to False.
+
+    Returns:
+        list: A TreeMirror per pair, already in sync unless `dry_run` is set.
+    """
+    mirrors = []
+    for target, source in sorted(pairs.items(), key=lambda pair: str(pair[0])):
+        mirror = TreeMirror(source, target)
+        result = mirror.sync(dry_run=dry_run)
+        if result.changed:
+            print(f"{target}: {len(result.copied)} copied, {len(result.removed)} removed, {result.skipped} up to date")
+        mirrors.append(mirror)
+    return mirrors
+
+
+def watch(mirrors, interval=0.25, stop_event=None):
+    """
+    Pushes changed files from each source folder until interrupted.
+
+    Args:
+        mirrors (list): TreeMirror instances, normally from `mirror_pairs`.
+        interval (float, optional): Seconds between polls. Defaults to 0.25.
+        stop_event (threading.Event, optional): Stops the loop when set. Defaults to None, which runs
+            until KeyboardInterrupt.
+    """
+    try:
+        while stop_event is None or not stop_event.is_set():
+            started = time.perf_counter()
+            for mirror in mirrors:
+                result = mirror.poll()
+                for name in result.copied:
+                    print(f"Copied {mirror.source / name} -> {mirror.target / name}")
+                for name in result.removed:
+                    print(f"Removed {mirror.target / name}")
+            elapsed = time.perf_counter() - started
+            if stop_event is not None:
+                stop_event.wait(max(0.0, interval - elapsed))
+            else:
+                time.sleep(max(0.0, interval - elapsed))
+    except KeyboardInterrupt:
+        print("Stopped watching.")
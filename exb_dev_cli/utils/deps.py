@@ -0,0 +1,359 @@
+import hashlib
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from exb_dev_cli.utils.cache import default_cache_dir
+from exb_dev_cli.utils.locking import file_lock
+from exb_dev_cli.utils.remove import remove_tree
+from exb_dev_cli.utils.tracing import span
+
+
+# Checked in this order; the first one present describes the folder's dependencies
+LOCKFILE_NAMES = ("package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml")
+DEPS_STAMP_NAME = ".exb-deps.json"
+DEPS_CURRENT = "current"
+DEPS_RESTORED = "restored"
+DEPS_INSTALLED = "installed"
+DEPS_FAILED = "failed"
+
+
+class CommandInstaller:
+    """
+    Class to install a folder's dependencies by running a package manager command in it.
+
+    Any object with a `key()` method and an `install(folder)` method can be used in its place, e.g. a
+    fake package manager in tests.
+
+    Attributes:
+        command (list): The command to run, e.g. `["npm", "ci"]`.
+    """
+
+    def __init__(self, command=("npm", "ci")):
+        self.command = shlex.split(command) if isinstance(command, str) else list(command)
+        self._key = None
+
+    def key(self):
+        """
+        Returns a string identifying the installer, so results from a different command or Node.js
+        version are not restored.
+        """
+        if self._key is None:
+            try:
+                node = subprocess.run(["node", "--version"], capture_output=True, text=True, check=False).stdout.strip()
+            except OSError:
+                node = ""
+            self._key = f"{' '.join(self.command)} node={node}"
+        return self._key
+
+    def install(self, folder):
+        """
+        Runs the command in a folder.
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails.
+        """
+        # npm is a .cmd script on Windows, which needs the shell to run
+        subprocess.run(self.command, cwd=folder, check=True, capture_output=True, text=True, shell=os.name == "nt")
+
+
+def find_lockfile(folder):
+    """Returns the folder's package manager lockfile, or None if it has none."""
+    for name in LOCKFILE_NAMES:
+        if (Path(folder) / name).is_file():
+            return Path(folder) / name
+    return None
+
+
+def deps_key(folder, installer):
+    """
+    Computes the cache key of a folder's `node_modules`.
+
+    The key covers the lockfile, `package.json`, the installer and the platform, since packages with
+    native code differ between operating systems and architectures.
+
+    Args:
+        folder (Path): A folder with a `package.json`.
+        installer (CommandInstaller): The installer that would build `node_modules`.
+
+    Returns:
+        str: A sha256 hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{installer.key()}\0{sys.platform}\0{platform.machine()}\0".encode())
+    for path in (find_lockfile(folder), Path(folder) / "package.json"):
+        if path is not None and path.is_file():
+            digest.update(path.name.encode() + b"\0")
+            with open(path, "rb") as f:
+                digest.update(hashlib.file_digest(f, "sha256").digest())
+    return digest.hexdigest()
+
+
+def package_folders(roots):
+    """
+    Finds the folders that need a dependency install.
+
+    Each root is included if it has a `package.json`, and so is each of its direct subfolders (e.g. a
+    widget in an `<app>_widgets` folder). Symlinked roots are followed.
+
+    Args:
+        roots (list): Linked widget folders, e.g. `client/<app>_widgets`.
+
+    Returns:
+        list: The folders with a `package.json`, in a stable order.
+    """
+    folders = []
+    for root in roots:
+        root = Path(root)
+        if (root / "package.json").is_file():
+            folders.append(root)
+        try:
+            with os.scandir(root) as entries:
+                children = sorted(entry.path for entry in entries if entry.is_dir() and entry.name != "node_modules")
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        folders.extend(Path(child) for child in children if (Path(child) / "package.json").is_file())
+    return folders
+
+
+def read_stamp(folder):
+    """Returns the cache key recorded in a folder's `node_modules`, or None."""
+    try:
+        with open(Path(folder) / "node_modules" / DEPS_STAMP_NAME, "r") as f:
+            return json.load(f).get("key")
+    except (OSError, ValueError):
+        return None
+
+
+def _write_stamp(folder, key):
+    with open(Path(folder) / "node_modules" / DEPS_STAMP_NAME, "w") as f:
+        json.dump({"key": key}, f)
+
+
+class DepsCache:
+    """
+    Class to store `node_modules` folders as tarballs addressed by their cache key.
+
+    Tarballs keep the symlinks npm creates in `node_modules/.bin` and can be restored into any
+    workspace without sharing files with it, so a later `npm install` in the workspace cannot change
+    the cached copy.
+
+    Attributes:
+        root (Path): The cache directory.
+    """
+
+    def __init__(self, root: Path = None):
+        """
+        Initializes the DepsCache instance.
+
+        Args:
+            root (Path, optional): The cache directory. Defaults to `deps` in the shared cache directory.
+        """
+        self.root = Path(root) if root else default_cache_dir() / "deps"
+
+    def tarball_path(self, key: str):
+        """Returns the path of the tarball stored under a key."""
+        return self.root / key[:2] / f"{key}.tar"
+
+    def lock_path(self, key: str):
+        """Returns the lock file serializing installs for a key across processes."""
+        return self.root / "locks" / f"{key}.lock"
+
+    def has(self, key: str):
+        """Returns True if a tarball is stored under the key."""
+        return self.tarball_path(key).is_file()
+
+    def save(self, key: str, folder):
+        """
+        Stores a folder's `node_modules` under a key.
+
+        Args:
+            key (str): The cache key.
+            folder (Path): The folder holding `node_modules`.
+
+        Returns:
+            int: The size of the tarball in bytes.
+        """
+        target = self.tarball_path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with tarfile.open(tmp_path, "w") as tar:
+            tar.add(Path(folder) / "node_modules", arcname="node_modules")
+        os.replace(tmp_path, target)
+        return target.stat().st_size
+
+    def restore(self, key: str, folder):
+        """
+        Replaces a folder's `node_modules` with the one stored under a key.
+
+        The tarball is extracted next to the folder first and moved into place, so an interrupted
+        restore never leaves a half-filled `node_modules` behind.
+
+        Args:
+            key (str): The cache key.
+            folder (Path): The folder to restore `node_modules` into.
+
+        Raises:
+            tarfile.TarError: If the tarball is damaged or has members outside `node_modules`.
+        """
+        folder = Path(folder)
+        tmp_dir = folder / f".node_modules.{os.getpid()}.{threading.get_ident()}.exb-tmp"
+        try:
+            with tarfile.open(self.tarball_path(key), "r") as tar:
+                tar.extractall(tmp_dir, filter="data")
+            remove_tree(folder / "node_modules")
+            os.replace(tmp_dir / "node_modules", folder / "node_modules")
+        finally:
+            remove_tree(tmp_dir)
+
+
+class DepsResult:
+    """
+    Class to collect the outcome of dependency installs, for a summary at the end.
+
+    Attributes:
+        entries (list): (folder, action, seconds, detail) tuples, where action is DEPS_CURRENT,
+            DEPS_RESTORED, DEPS_INSTALLED or DEPS_FAILED.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def add(self, folder, action, seconds=0.0, detail=""):
+        """Records the outcome for one folder."""
+        with self._lock:
+            self.entries.append((Path(folder), action, seconds, detail))
+
+    def _select(self, action):
+        return [entry for entry in self.entries if entry[1] == action]
+
+    @property
+    def hits(self):
+        """Returns the number of folders restored from the cache or already up to date."""
+        return len(self._select(DEPS_RESTORED)) + len(self._select(DEPS_CURRENT))
+
+    @property
+    def misses(self):
+        """Returns the number of folders the installer had to run for."""
+        return len(self._select(DEPS_INSTALLED)) + len(self._select(DEPS_FAILED))
+
+    @property
+    def restore_seconds(self):
+        """Returns the total time spent restoring from the cache."""
+        return sum(entry[2] for entry in self._select(DEPS_RESTORED))
+
+    @property
+    def install_seconds(self):
+        """Returns the total time spent running the installer."""
+        return sum(entry[2] for entry in self._select(DEPS_INSTALLED))
+
+    @property
+    def failed(self):
+        """Returns the folders whose install failed."""
+        return [entry[0] for entry in self._select(DEPS_FAILED)]
+
+    def print_summary(self):
+        """Prints the hit/miss counts and where the time went."""
+        for folder, action, seconds, detail in self.entries:
+            if action == DEPS_FAILED:
+                print(f"  {folder}: FAILED: {detail}")
+        total = self.hits + self.misses
+        rate = f"{100 * self.hits / total:.0f}%" if total else "n/a"
+        print(f"Dependencies: {len(self._select(DEPS_CURRENT))} up to date, "
+              f"{len(self._select(DEPS_RESTORED))} restored from cache in {self.restore_seconds:.1f}s, "
+              f"{len(self._select(DEPS_INSTALLED))} installed in {self.install_seconds:.1f}s, "
+              f"{len(self.failed)} failed (hit rate {rate}).")
+
+
+def install_folder_deps(folder, installer, cache=None, result=None):
+    """
+    Brings one folder's `node_modules` up to date, from the cache where possible.
+
+    A `node_modules` whose stamp matches the current key is left alone. Otherwise it is restored from
+    the cache, or the installer is run and its output stored for the next workspace. The per-key lock
+    makes concurrent runs wait for the first install instead of installing the same packages twice.
+
+    Args:
+        folder (Path): A folder with a `package.json`.
+        installer (CommandInstaller): Runs the package manager.
+        cache (DepsCache, optional): The cache to use. Defaults to None, which always runs the installer.
+        result (DepsResult, optional): Collects the outcome. Defaults to a new DepsResult.
+
+    Returns:
+        DepsResult: The collected outcomes.
+    """
+    result = result or DepsResult()
+    folder = Path(folder)
+    key = deps_key(folder, installer)
+    if read_stamp(folder) == key:
+        result.add(folder, DEPS_CURRENT)
+        return result
+
+    with span("deps", "deps", folder=str(folder)) as trace:
+        start = time.perf_counter()
+        try:
+            if cache is None:
+                installer.install(folder)
+                _write_stamp(folder, key)
+                result.add(folder, DEPS_INSTALLED, time.perf_counter() - start)
+                return result
+            with file_lock(cache.lock_path(key)):
+                if cache.has(key):
+                    cache.restore(key, folder)
+                    result.add(folder, DEPS_RESTORED, time.perf_counter() - start)
+                    trace.update(action=DEPS_RESTORED)
+                    return result
+                installer.install(folder)
+                _write_stamp(folder, key)
+                size = cache.save(key, folder)
+                result.add(folder, DEPS_INSTALLED, time.perf_counter() - start)
+                trace.update(action=DEPS_INSTALLED, bytes=size)
+        except (OSError, subprocess.CalledProcessError, tarfile.TarError) as e:
+            detail = e.stderr.strip().splitlines()[-1] if getattr(e, "stderr", None) else str(e)
+            result.add(folder, DEPS_FAILED, time.perf_counter() - start, detail)
+    return result
+
+
+def install_deps(folders, installer=None, use_cache=True, cache=None, jobs=4, result=None):
+    """
+    Installs the dependencies of several folders in parallel, restoring cached `node_modules` where possible.
+
+    Args:
+        folders (list): Folders with a `package.json`, normally from `package_folders`.
+        installer (CommandInstaller, optional): Runs the package manager. Defaults to `npm ci`.
+        use_cache (bool, optional): Restore from and save to the cache. Defaults to True.
+        cache (DepsCache, optional): The cache to use. Defaults to the user's default cache.
+        jobs (int, optional): Maximum number of folders handled at once. Defaults to 4.
+        result (DepsResult, optional): Collects the outcomes, e.g. across several calls. Defaults to a new DepsResult.
+
+    Returns:
+        DepsResult: The collected outcomes.
+
+    Raises:
+        RuntimeError: If any folder failed to install, once every folder has been handled.
+    """
+    installer = installer or CommandInstaller()
+    cache = (cache or DepsCache()) if use_cache else None
+    result = result or DepsResult()
+    own = DepsResult()
+
+    def handle(folder):
+        install_folder_deps(folder, installer, cache, own)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        list(executor.map(handle, folders))
+
+    for entry in own.entries:
+        result.add(*entry)
+    if own.failed:
+        raise RuntimeError(f"{len(own.failed)} dependency install(s) failed: {', '.join(map(str, own.failed))}")
+    return result
@@ -0,0 +1,358 @@
+import hashlib
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+
+from exb_dev_cli.utils.tracing import span, tracing_enabled
+
+
+CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 30
+
+
+class ChecksumMismatchError(ValueError):
+    """Raised when a downloaded file does not match its expected sha256."""
+
+
+class RateLimiter:
+    """
+    Class to cap the average transfer rate of a download by sleeping between chunks.
+
+    Attributes:
+        bytes_per_second (int): The cap.
+    """
+
+    def __init__(self, bytes_per_second: int):
+        self.bytes_per_second = bytes_per_second
+        self._start = time.monotonic()
+        self._consumed = 0
+        self._lock = threading.Lock()
+
+    def consume(self, num_bytes: int):
+        """Records transferred bytes and sleeps until they fit under the cap."""
+        with self._lock:
+            self._consumed += num_bytes
+            delay = self._start + self._consumed / self.bytes_per_second - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def part_path(destination):
+    """
+    Returns the path of the in-progress `.part` file for a download destination.
+
+    Args:
+        destination (str or Path): The final path of the download.
+
+    Returns:
+        Path: The `.part` file next to the destination.
+    """
+    destination = Path(destination)
+    return destination.with_name(destination.name + ".part")
+
+
+def _hash_existing(path, chunk_size):
+    """Returns a sha256 object primed with the contents of a partially downloaded file."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher
+
+
+def file_sha256(path, chunk_size=CHUNK_SIZE):
+    """
+    Computes the sha256 of a file without reading it into memory at once.
+
+    Args:
+        path (str or Path): The file to hash.
+        chunk_size (int, optional): The read size in bytes. Defaults to CHUNK_SIZE.
+
+    Returns:
+        str: The hex digest.
+    """
+    return _hash_existing(path, chunk_size).hexdigest()
+
+
+def verify_sha256(path, actual, expected):
+    """
+    Compares a computed digest against an expected one.
+
+    Args:
+        path (str or Path): The file the digest belongs to, used in the error message.
+        actual (str): The computed hex digest.
+        expected (str, optional): The expected hex digest. Nothing is checked if it is empty.
+
+    Raises:
+        ChecksumMismatchError: If the digests differ.
+    """
+    if expected and actual.lower() != expected.lower():
+        raise ChecksumMismatchError(f"Checksum mismatch for {path}: expected sha256 {expected}, got {actual}")
+
+
+def _trace_dns(url):
+    """Times a name lookup for the download host. Only done while tracing, to split DNS from transfer time."""
+    if not tracing_enabled():
+        return
+    host = urlparse(url).hostname
+    if not host:
+        return
+    with span("dns lookup", "download", host=host) as trace:
+        try:
+            trace["addresses"] = len(socket.getaddrinfo(host, None))
+        except OSError as e:
+            trace["error"] = str(e)
+
+
+def download_file(url, destination, sha256=None, chunk_size=CHUNK_SIZE, session=None, retries=3, rate_limit=None):
+    """
+    Streams a file to disk in fixed-size chunks, resuming after interruptions.
+
+    Data is written to `<destination>.part` and hashed as it arrives. If the connection drops, the
+    download continues from the current offset with an HTTP `Range` request, and a `.part` file left
+    behind by an earlier run is resumed the same way. The `.part` file is only renamed to the
+    destination once the digest matches `sha256` (when given).
+
+    Args:
+        url (str): The URL to download.
+        destination (str or Path): The path to write the file to.
+        sha256 (str, optional): The expected hex digest of the file. Defaults to None.
+        chunk_size (int, optional): The size of each chunk read from the response. Defaults to CHUNK_SIZE.
+        session (requests.Session, optional): The session to use. Defaults to a new session.
+        retries (int, optional): How many times to resume after a dropped connection. Defaults to 3.
+        rate_limit (int, optional): The maximum average transfer rate in bytes per second. Defaults to None.
+
+    Returns:
+        str: The sha256 hex digest of the downloaded file.
+
+    Raises:
+        requests.exceptions.RequestException: If the download still fails after all retries.
+        ChecksumMismatchError: If the file does not match `sha256`. The `.part` file is removed.
+    """
+    destination = Path(destination)
+    part = part_path(destination)
+    session = session or requests.Session()
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    if limiter:
+        # Smaller reads keep the transfer smooth instead of bursting a whole chunk and then pausing
+        chunk_size = max(1, min(chunk_size, rate_limit // 4))
+
+    if part.exists():
+        offset = part.stat().st_size
+        hasher = _hash_existing(part, chunk_size)
+    else:
+        offset = 0
+        hasher = hashlib.sha256()
+
+    _trace_dns(url)
+    with span("download", "download", url=url, connections=1, resumed_from=offset) as trace:
+        attempt = 0
+        received = 0
+        while True:
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            try:
+                with session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                    if offset and response.status_code == 416:
+                        # The .part file already holds the whole file
+                        break
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        # The server ignored the Range header, start over
+                        offset = 0
+                        hasher = hashlib.sha256()
+                    mode = "ab" if offset else "wb"
+                    with open(part, mode) as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            offset += len(chunk)
+                            received += len(chunk)
+                            if limiter:
+                                limiter.consume(len(chunk))
+                break
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout) as e:
+                attempt += 1
+                if attempt > retries:
+                    raise
+                print(f"Download interrupted at {offset} bytes ({e}), resuming ({attempt}/{retries})...")
+
+        trace["bytes"] = received
+
+    digest = hasher.hexdigest()
+    try:
+        verify_sha256(url, digest, sha256)
+    except ChecksumMismatchError:
+        part.unlink()
+        raise
+
+    os.replace(part, destination)
+    return digest
+
+
+def _probe_with_range_get(url, session):
+    """Probes with a one-byte `Range` GET, for servers that refuse HEAD requests."""
+    with session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code == 206:
+            # Content-Range: bytes 0-0/<size>, where the size may be `*` when unknown
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            return (int(total) if total.isdigit() else None), True
+        length = response.headers.get("Content-Length")
+        return (int(length) if length is not None else None), False
+
+
+def probe_download(url, session=None):
+    """
+    Asks the server for the size of a download and whether it accepts byte ranges.
+
+    Some download hosts refuse HEAD requests (e.g. with 403 or 405). In that case the first byte is
+    requested with a `Range` GET instead: a 206 response means ranges are accepted and its
+    `Content-Range` carries the size.
+
+    Args:
+        url (str): The URL to probe.
+        session (requests.Session, optional): The session to use. Defaults to a new session.
+
+    Returns:
+        (int, bool): The content length (None if unknown) and whether byte ranges are accepted.
+
+    Raises:
+        requests.exceptions.RequestException: If both the HEAD and the range GET fail.
+    """
+    session = session or requests.Session()
+    response = session.head(url, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+    try:
+        response.raise_for_status()
+    except requests.exceptions.HTTPError:
+        return _probe_with_range_get(url, session)
+    length = response.headers.get("Content-Length")
+    accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    return (int(length) if length is not None else None), accepts_ranges
+
+
+def split_ranges(size, connections):
+    """
+    Splits a byte count into contiguous, inclusive ranges.
+
+    Args:
+        size (int): The total number of bytes.
+        connections (int): The number of ranges to produce.
+
+    Returns:
+        list: (start, end) tuples covering `0..size - 1`.
+    """
+    connections = max(1, min(connections, size))
+    step = size // connections
+    ranges = []
+    for i in range(connections):
+        start = i * step
+        end = size - 1 if i == connections - 1 else start + step - 1
+        ranges.append((start, end))
+    return ranges
+
+
+def _fetch_range(session, url, path, start, end, chunk_size, retries):
+    """Downloads `start..end` of a URL into the same offsets of a preallocated file."""
+    position = start
+    attempt = 0
+    with span("download range", "download", start=start, end=end, bytes=end - start + 1), open(path, "r+b") as f:
+        while position <= end:
+            headers = {"Range": f"bytes={position}-{end}"}
+            try:
+                with session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise requests.exceptions.HTTPError(
+                            f"Server ignored range request for bytes {position}-{end}", response=response)
+                    f.seek(position)
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        chunk = chunk[:end + 1 - position]
+                        f.write(chunk)
+                        position += len(chunk)
+                        if position > end:
+                            break
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout):
+                attempt += 1
+                if attempt > retries:
+                    raise
+    return end - start + 1
+
+
+def download_segmented(url, destination, connections=4, sha256=None, chunk_size=CHUNK_SIZE, session=None, retries=3):
+    """
+    Downloads a file over several parallel connections, one byte range each.
+
+    The `.part` file is preallocated to the full size and every range is written straight to its
+    offset. When the server does not accept ranges, the size is unknown or the probe fails, this falls
+    back to a single resumable stream with `download_file`.
+
+    Args:
+        url (str): The URL to download.
+        destination (str or Path): The path to write the file to.
+        connections (int, optional): The number of parallel connections. Defaults to 4.
+        sha256 (str, optional): The expected hex digest of the file. Defaults to None.
+        chunk_size (int, optional): The size of each chunk read from a response. Defaults to CHUNK_SIZE.
+        session (requests.Session, optional): The session to use. Defaults to a new session pooled for `connections`.
+        retries (int, optional): How many times each range is resumed after a dropped connection. Defaults to 3.
+
+    Returns:
+        str: The sha256 hex digest of the downloaded file.
+
+    Raises:
+        requests.exceptions.RequestException: If a range still fails after all retries.
+        ChecksumMismatchError: If the file does not match `sha256`. The `.part` file is removed.
+    """
+    destination = Path(destination)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, connections))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    try:
+        size, accepts_ranges = probe_download(url, session)
+    except requests.exceptions.RequestException:
+        size, accepts_ranges = None, False
+    if connections <= 1 or not accepts_ranges or not size:
+        if connections > 1:
+            print("Server does not support range requests, downloading over a single connection.")
+        return download_file(url, destination, sha256=sha256, chunk_size=chunk_size, session=session, retries=retries)
+
+    part = part_path(destination)
+    with open(part, "wb") as f:
+        f.truncate(size)
+
+    _trace_dns(url)
+    ranges = split_ranges(size, connections)
+    try:
+        with span("download", "download", url=url, connections=len(ranges), bytes=size), \
+                ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_fetch_range, session, url, part, start, end, chunk_size, retries)
+                for start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+    except Exception:
+        part.unlink(missing_ok=True)
+        raise
+
+    with span("hash", "download", bytes=size):
+        digest = file_sha256(part, chunk_size)
+    try:
+        verify_sha256(url, digest, sha256)
+    except ChecksumMismatchError:
+        part.unlink()
+        raise
+
+    os.replace(part, destination)
+    return digest
@@ -0,0 +1,352 @@
+import json
+import os
+import shutil
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from exb_dev_cli.utils.tracing import span
+
+
+MANIFEST_NAME = ".exb-manifest.json"
+READ_SIZE = 1024 * 1024
+# Below this many members the process pool costs more than it saves
+PARALLEL_THRESHOLD = 500
+
+
+def default_workers():
+    """Returns the default number of extraction/verification processes."""
+    return os.cpu_count() or 1
+
+
+def member_path(destination, name):
+    """
+    Returns the on-disk path of an archive member, rejecting names that escape the destination.
+
+    Args:
+        destination (str or Path): The extraction directory.
+        name (str): The member name from the archive.
+
+    Returns:
+        Path: The target path below `destination`.
+
+    Raises:
+        ValueError: If the member name is absolute or contains `..`.
+    """
+    parts = PurePosixPath(name.replace("\\", "/")).parts
+    if not parts or name.startswith(("/", "\\")) or ".." in parts or ":" in parts[0]:
+        raise ValueError(f"Refusing to extract unsafe archive member: {name}")
+    return Path(destination, *parts)
+
+
+def file_crc32(path):
+    """
+    Computes the CRC32 of a file the same way zip archives record it.
+
+    Args:
+        path (str or Path): The file to checksum.
+
+    Returns:
+        int: The unsigned CRC32.
+    """
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc & 0xFFFFFFFF
+
+
+def file_matches(path, size, crc):
+    """
+    Checks whether a file on disk has the given size and CRC32.
+
+    Args:
+        path (Path): The file to check.
+        size (int): The expected size in bytes.
+        crc (int): The expected CRC32.
+
+    Returns:
+        bool: True if the file exists and matches.
+    """
+    try:
+        if os.stat(path).st_size != size:
+            return False
+    except OSError:
+        return False
+    return file_crc32(path) == crc
+
+
+def _extract_batch(zip_path, destination, names):
+    """Extracts a batch of members, skipping files that already match. Runs in a worker process."""
+    written = skipped = bytes_written = 0
+    with zipfile.ZipFile(zip_path) as zf:
+        for name in names:
+            info = zf.getinfo(name)
+            target = member_path(destination, name)
+            if file_matches(target, info.file_size, info.CRC):
+                skipped += 1
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Replace rather than overwrite, so symlinks and hardlinks into a shared store are never written through
+            if os.path.lexists(target):
+                target.unlink()
+            with zf.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, READ_SIZE)
+            written += 1
+            bytes_written += info.file_size
+    return written, skipped, bytes_written
+
+
+def _batches(infos, count):
+    """Splits members into `count` batches of roughly equal uncompressed size."""
+    batches = [[] for _ in range(count)]
+    sizes = [0] * count
+    for info in sorted(infos, key=lambda i: i.file_size, reverse=True):
+        smallest = sizes.index(min(sizes))
+        batches[smallest].append(info.filename)
+        sizes[smallest] += info.file_size
+    return [batch for batch in batches if batch]
+
+
+class ExtractResult:
+    """
+    Class to summarize an extraction.
+
+    Attributes:
+        written (int): Members written to disk.
+        skipped (int): Members skipped because the file on disk already matched.
+        bytes_written (int): Uncompressed bytes written.
+        removed (int): Files deleted because the new archive no longer contains them.
+        kept (int): Files left in place because they are inside a symlinked app or widget folder.
+    """
+
+    def __init__(self, written: int = 0, skipped: int = 0, bytes_written: int = 0):
+        self.written = written
+        self.skipped = skipped
+        self.bytes_written = bytes_written
+        self.removed = 0
+        self.kept = 0
+
+    def __repr__(self):
+        return f"ExtractResult(written={self.written}, skipped={self.skipped}, bytes_written={self.bytes_written})"
+
+    def add(self, counts):
+        """Adds the (written, skipped, bytes_written) counts of extracted batches."""
+        for written, skipped, bytes_written in counts:
+            self.written += written
+            self.skipped += skipped
+            self.bytes_written += bytes_written
+
+
+def _extract_members(zip_path, destination, files, workers):
+    """Extracts members in a process pool, or in this process when there are too few to be worth it."""
+    if workers <= 1 or len(files) < PARALLEL_THRESHOLD:
+        return [_extract_batch(zip_path, destination, [info.filename for info in files])]
+    batches = _batches(files, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_extract_batch, [zip_path] * len(batches), [destination] * len(batches), batches))
+
+
+def extract_archive(zip_path, destination, workers=None):
+    """
+    Extracts a zip archive using a pool of processes, skipping members that are already on disk.
+
+    A member is skipped when the existing file has the same size and CRC32 as the archive's central
+    directory entry, so re-running into an existing tree only rewrites changed files. A manifest of
+    every file's size and CRC32 is written to `<destination>/.exb-manifest.json` for `verify_tree`.
+
+    Args:
+        zip_path (str or Path): The archive to extract.
+        destination (str or Path): The directory to extract into.
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+
+    Returns:
+        ExtractResult: Counts of written and skipped members.
+
+    Raises:
+        zipfile.BadZipFile: If the archive is not a valid zip file.
+        ValueError: If a member would be written outside `destination`.
+    """
+    destination = Path(destination)
+    workers = workers or default_workers()
+
+    with span("extract", "extract", archive=str(zip_path), workers=workers) as trace:
+        with zipfile.ZipFile(zip_path) as zf:
+            infos = zf.infolist()
+        files = [info for info in infos if not info.is_dir()]
+
+        for info in infos:
+            target = member_path(destination, info.filename)
+            (target if info.is_dir() else target.parent).mkdir(parents=True, exist_ok=True)
+
+        result = ExtractResult()
+        result.add(_extract_members(zip_path, destination, files, workers))
+
+        write_manifest(destination, Path(zip_path).name, files)
+        trace.update(members=len(files), written=result.written, skipped=result.skipped, bytes=result.bytes_written)
+    return result
+
+
+def _crosses_symlink(destination, parts, checked):
+    """Returns True if any folder along `parts` below `destination` is a symlink. `checked` caches lookups."""
+    for depth in range(1, len(parts) + 1):
+        folder = parts[:depth]
+        if folder not in checked:
+            checked[folder] = os.path.islink(Path(destination, *folder))
+        if checked[folder]:
+            return True
+    return False
+
+
+def upgrade_tree(old_zip_path, new_zip_path, destination, workers=None):
+    """
+    Moves an extracted tree from one archive to another by writing only the members that changed.
+
+    The two archives' central directories are compared: members that are new or whose size or CRC32
+    differ are extracted, and files that only the old archive contains are deleted along with folders
+    left empty. Nothing inside a symlinked folder is written or deleted, so the `client/*_widgets` and
+    `server/public/apps/*` links to app repos survive the upgrade. Unchanged members are only rewritten
+    if they are missing from disk.
+
+    Args:
+        old_zip_path (str or Path): The archive the tree was extracted from.
+        new_zip_path (str or Path): The archive to upgrade to.
+        destination (str or Path): The extracted tree.
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+
+    Returns:
+        ExtractResult: Counts of written, unchanged, removed and kept files and the bytes written.
+
+    Raises:
+        zipfile.BadZipFile: If either archive is not a valid zip file.
+        ValueError: If a member would be written outside `destination`.
+    """
+    destination = Path(destination)
+    workers = workers or default_workers()
+
+    with span("upgrade", "extract", old=str(old_zip_path), new=str(new_zip_path), workers=workers) as trace:
+        with zipfile.ZipFile(old_zip_path) as zf:
+            old = {info.filename: (info.file_size, info.CRC) for info in zf.infolist() if not info.is_dir()}
+        with zipfile.ZipFile(new_zip_path) as zf:
+            new_infos = zf.infolist()
+        files = [info for info in new_infos if not info.is_dir()]
+
+        result = ExtractResult()
+        checked = {}
+        changed = []
+        for info in files:
+            target = member_path(destination, info.filename)
+            if _crosses_symlink(destination, PurePosixPath(info.filename).parts[:-1], checked):
+                result.kept += 1
+            elif old.get(info.filename) != (info.file_size, info.CRC) or not os.path.lexists(target):
+                changed.append(info)
+            else:
+                result.skipped += 1
+
+        for info in new_infos:
+            if info.is_dir() and not _crosses_symlink(destination, PurePosixPath(info.filename).parts, checked):
+                member_path(destination, info.filename).mkdir(parents=True, exist_ok=True)
+        result.add(_extract_members(new_zip_path, destination, changed, workers))
+
+        new_names = {info.filename for info in files}
+        emptied = set()
+        for name in sorted(set(old) - new_names):
+            target = member_path(destination, name)
+            if _crosses_symlink(destination, PurePosixPath(name).parts[:-1], checked):
+                result.kept += 1
+            elif os.path.lexists(target) and not os.path.isdir(target):
+                target.unlink()
+                result.removed += 1
+                emptied.add(target.parent)
+
+        # Remove folders the deleted files leave empty, deepest first
+        for folder in sorted(emptied, key=lambda p: len(p.parts), reverse=True):
+            while folder != destination and folder.is_dir() and not folder.is_symlink() and not any(folder.iterdir()):
+                folder.rmdir()
+                folder = folder.parent
+
+        write_manifest(destination, Path(new_zip_path).name, files)
+        trace.update(written=result.written, removed=result.removed, kept=result.kept, bytes=result.bytes_written)
+    return result
+
+
+def write_manifest(destination, archive_name, infos):
+    """
+    Writes the manifest describing an extracted tree.
+
+    Args:
+        destination (Path): The extraction directory.
+        archive_name (str): The name of the archive the tree came from.
+        infos (list): The `zipfile.ZipInfo` entries of the extracted files.
+    """
+    manifest = {
+        "archive": archive_name,
+        "files": {info.filename: {"size": info.file_size, "crc32": info.CRC} for info in infos},
+    }
+    with open(Path(destination) / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f)
+
+
+def load_manifest(destination):
+    """
+    Loads the manifest written by `extract_archive`.
+
+    Args:
+        destination (str or Path): The extraction directory.
+
+    Returns:
+        dict: The manifest.
+
+    Raises:
+        FileNotFoundError: If the directory has no manifest.
+    """
+    manifest_path = Path(destination) / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No extraction manifest found at {manifest_path}")
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def _verify_batch(destination, entries):
+    """Returns (missing, modified) member names for a batch. Runs in a worker process."""
+    missing, modified = [], []
+    for name, size, crc in entries:
+        target = member_path(destination, name)
+        if not target.exists():
+            missing.append(name)
+        elif not file_matches(target, size, crc):
+            modified.append(name)
+    return missing, modified
+
+
+def verify_tree(destination, workers=None):
+    """
+    Checks an extracted tree against its manifest by hashing files in parallel.
+
+    Args:
+        destination (str or Path): The extraction directory.
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+
+    Returns:
+        (list, list): Names of missing files and of files whose size or CRC32 changed.
+
+    Raises:
+        FileNotFoundError: If the directory has no manifest.
+    """
+    destination = Path(destination)
+    workers = workers or default_workers()
+    entries = [(name, meta["size"], meta["crc32"]) for name, meta in load_manifest(destination)["files"].items()]
+
+    with span("verify", "extract", members=len(entries), workers=workers):
+        if workers <= 1 or len(entries) < PARALLEL_THRESHOLD:
+            results = [_verify_batch(destination, entries)]
+        else:
+            batch_count = workers * 4
+            batches = [entries[i::batch_count] for i in range(batch_count)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_verify_batch, [destination] * batch_count, batches))
+
+    missing = sorted(name for batch_missing, _ in results for name in batch_missing)
+    modified = sorted(name for _, batch_modified in results for name in batch_modified)
+    return missing, modified
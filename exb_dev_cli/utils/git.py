@@ -0,0 +1,66 @@
+import subprocess
+from pathlib import Path
+
+from exb_dev_cli.utils.tracing import span
+
+
+def run_git(args, cwd=None, check=True, capture_output=False):
+    """
+    Runs a git command.
+
+    Args:
+        args (list): The git arguments, without the leading `git`.
+        cwd (str or Path, optional): The working directory to run the command in. Defaults to None.
+        check (bool, optional): Raise if the command exits with a non-zero status. Defaults to True.
+        capture_output (bool, optional): Capture stdout/stderr instead of passing them through. Defaults to False.
+
+    Returns:
+        subprocess.CompletedProcess: The completed git process.
+
+    Raises:
+        subprocess.CalledProcessError: If `check` is True and the command fails.
+    """
+    argv = ['git', *[str(arg) for arg in args]]
+    with span(f"git {argv[1]}", "git", argv=argv, cwd=str(cwd) if cwd else None) as trace:
+        try:
+            result = subprocess.run(argv, cwd=cwd, check=check, capture_output=capture_output, text=True)
+        except subprocess.CalledProcessError as e:
+            trace["exit_code"] = e.returncode
+            raise
+        trace["exit_code"] = result.returncode
+    return result
+
+
+def read_head(repo_path):
+    """
+    Returns the commit a repo's HEAD points at, reading `.git` directly instead of starting git.
+
+    Args:
+        repo_path (str or Path): The repo's working tree.
+
+    Returns:
+        str: The commit SHA, or None if the repo is missing or has no commits.
+    """
+    git_dir = Path(repo_path) / ".git"
+    try:
+        with open(git_dir / "HEAD", "r") as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    if not head.startswith("ref: "):
+        return head
+    ref = head[len("ref: "):]
+    try:
+        with open(git_dir / ref, "r") as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    try:
+        with open(git_dir / "packed-refs", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
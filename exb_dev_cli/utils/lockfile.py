@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+from exb_dev_cli.utils.extract import MANIFEST_NAME
+from exb_dev_cli.utils.git import read_head, run_git
+
+
+LOCK_FILE_NAME = "exb-dev.lock"
+LOCK_FORMAT = 1
+INSTALL_STAMP_NAME = ".exb-dev-install.json"
+
+
+class LockMismatchError(ValueError):
+    """Raised in frozen mode when the workspace or configuration does not match the lockfile."""
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _exb_marker(destination):
+    """Returns a file every Experience Builder tree has, whose mtime shows the tree was not replaced or removed."""
+    from exb_dev_cli.utils.app_manager import EXB_FOLDER_NAME
+
+    return Path(destination) / EXB_FOLDER_NAME / "client" / "package.json"
+
+
+class Lockfile:
+    """
+    Class to record what a workspace was provisioned with, so later runs only do what is missing.
+
+    The lockfile (`exb-dev.lock`, JSON) records the Experience Builder version with its archive hash,
+    each repo's URL, path and checked out commit, and the links that were applied. Checking it only
+    needs a few `stat` calls and reads of `.git/HEAD`, so a warm workspace is verified without
+    starting git or touching the network. In frozen mode the lockfile is never rewritten and anything
+    that would differ from it is an error, so every machine gets the same commits and archive.
+
+    Attributes:
+        path (Path): The lockfile.
+        frozen (bool): Reproduce the lockfile exactly instead of updating it.
+        data (dict): The lockfile contents.
+    """
+
+    def __init__(self, path: Path, frozen: bool = False):
+        """
+        Initializes the Lockfile instance, loading the file if it exists.
+
+        Args:
+            path (Path): The lockfile.
+            frozen (bool, optional): Reproduce the lockfile exactly. Defaults to False.
+
+        Raises:
+            LockMismatchError: If `frozen` is set and the lockfile does not exist.
+        """
+        self.path = Path(path)
+        self.frozen = frozen
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r") as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            if frozen:
+                raise LockMismatchError(f"--frozen needs an existing lockfile, but {self.path} was not found.")
+            self.data = {}
+        self.data.setdefault("format", LOCK_FORMAT)
+        self.data.setdefault("repos", {})
+        self.data.setdefault("links", {})
+
+    @classmethod
+    def for_config(cls, config_file, path=None, frozen: bool = False):
+        """
+        Opens the lockfile belonging to a configuration file.
+
+        Args:
+            config_file (str or Path): The applications configuration file.
+            path (str or Path, optional): The lockfile. Defaults to `exb-dev.lock` next to `config_file`.
+            frozen (bool, optional): Reproduce the lockfile exactly. Defaults to False.
+
+        Returns:
+            Lockfile: The loaded lockfile.
+        """
+        return cls(path or Path(config_file).parent / LOCK_FILE_NAME, frozen=frozen)
+
+    def _relative(self, path):
+        """Returns a path relative to the lockfile's folder, so the lockfile can be shared between machines."""
+        try:
+            return Path(os.path.relpath(os.path.abspath(path), os.path.abspath(self.path.parent))).as_posix()
+        except ValueError:
+            # Different drives on Windows
+            return Path(os.path.abspath(path)).as_posix()
+
+    def _mismatch(self, message):
+        raise LockMismatchError(f"{message} Run without --frozen to update {self.path}.")
+
+    def exb_is_current(self, version: str, destination):
+        """
+        Checks whether the locked Experience Builder is installed in a directory and unchanged since.
+
+        The installation is described by a stamp file written next to the extraction manifest, so the
+        lockfile itself holds nothing specific to one machine. The stamp also records the mtime of the
+        tree's `client/package.json`, so a deleted or replaced tree is not mistaken for a current one.
+
+        Args:
+            version (str): The Experience Builder version.
+            destination (str or Path): The directory Experience Builder is installed in.
+
+        Returns:
+            bool: True if the locked version and archive were installed there and the manifest has not
+            been rewritten since.
+        """
+        exb = self.data.get("exb")
+        try:
+            with open(Path(destination) / INSTALL_STAMP_NAME, "r") as f:
+                stamp = json.load(f)
+        except (OSError, ValueError):
+            return False
+        marker = _exb_marker(destination)
+        return bool(exb) and exb["version"] == version and stamp.get("sha256") == exb["sha256"] \
+            and stamp.get("manifest_mtime_ns") == _mtime_ns(Path(destination) / MANIFEST_NAME) \
+            and marker.parent.parent.is_dir() and stamp.get("marker_mtime_ns") == _mtime_ns(marker)
+
+    def locked_exb_sha256(self, version: str):
+        """
+        Returns the archive hash the lockfile requires for a version.
+
+        Args:
+            version (str): The Experience Builder version.
+
+        Returns:
+            str: The locked sha256, or None if the lockfile does not lock this version.
+
+        Raises:
+            LockMismatchError: In frozen mode, if the lockfile locks a different version.
+        """
+        exb = self.data.get("exb")
+        if exb and exb["version"] == version:
+            return exb["sha256"]
+        if self.frozen:
+            self._mismatch(f"Experience Builder {version} is not the locked version "
+                           f"({exb['version'] if exb else 'none'}).")
+        return None
+
+    def record_exb(self, version: str, sha256: str, destination):
+        """Records an installed Experience Builder version and stamps the installation with it."""
+        stamp = {"version": version, "sha256": sha256, "manifest_mtime_ns": _mtime_ns(Path(destination) / MANIFEST_NAME),
+                 "marker_mtime_ns": _mtime_ns(_exb_marker(destination))}
+        with open(Path(destination) / INSTALL_STAMP_NAME, "w") as f:
+            json.dump(stamp, f)
+        with self._lock:
+            self.data["exb"] = {"version": version, "sha256": sha256}
+
+    def repo_is_current(self, name: str, repo_url: str, destination):
+        """
+        Checks whether a repo is checked out at its locked commit.
+
+        Args:
+            name (str): The name of the application or core widgets repo.
+            repo_url (str): The configured URL of the repo.
+            destination (str or Path): The repo's working tree.
+
+        Returns:
+            bool: True if the repo is at the locked path and commit and its URL has not changed.
+        """
+        entry = self.data["repos"].get(name)
+        return bool(entry) and entry["url"] == repo_url and entry["path"] == self._relative(destination) \
+            and read_head(destination) == entry["commit"]
+
+    def locked_commit(self, name: str, repo_url: str):
+        """
+        Returns the commit the lockfile requires for a repo.
+
+        Args:
+            name (str): The name of the application or core widgets repo.
+            repo_url (str): The configured URL of the repo.
+
+        Returns:
+            str: The locked commit, or None if the repo is not locked.
+
+        Raises:
+            LockMismatchError: In frozen mode, if the repo is not locked or its URL changed.
+        """
+        entry = self.data["repos"].get(name)
+        if entry and entry["url"] == repo_url:
+            return entry["commit"]
+        if self.frozen:
+            self._mismatch(f"{name} ({repo_url}) is not in the lockfile.")
+        return None
+
+    def record_repo(self, name: str, repo_url: str, destination, commit: str):
+        """Records a repo's URL, path and checked out commit."""
+        with self._lock:
+            self.data["repos"][name] = {"url": repo_url, "path": self._relative(destination), "commit": commit}
+
+    def record_links(self, desired: dict):
+        """Records applied links, as returned by `plan_links`."""
+        with self._lock:
+            for link, target in desired.items():
+                self.data["links"][self._relative(link)] = self._relative(target)
+
+    def save(self):
+        """Writes the lockfile, unless in frozen mode."""
+        if self.frozen:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self.data, f, indent=2, sort_keys=True)
+                f.write("\n")
+            os.replace(tmp_path, self.path)
+
+
+def checkout_commit(repo_path, commit: str):
+    """
+    Checks out an exact commit, fetching it first if the repo does not have it.
+
+    Args:
+        repo_path (Path): The repo's working tree.
+        commit (str): The commit to check out. HEAD is detached at it.
+
+    Raises:
+        LockMismatchError: If the repo has uncommitted changes.
+        subprocess.CalledProcessError: If the commit cannot be fetched or checked out.
+    """
+    from exb_dev_cli.utils.sync import is_dirty, is_shallow
+
+    if is_dirty(repo_path):
+        raise LockMismatchError(f"{repo_path} has uncommitted changes and cannot be moved to the locked commit {commit[:12]}.")
+    if run_git(['cat-file', '-e', f'{commit}^{{commit}}'], cwd=repo_path, check=False, capture_output=True).returncode:
+        depth = ['--depth', '1'] if is_shallow(repo_path) else []
+        run_git(['fetch', *depth, 'origin', commit], cwd=repo_path, capture_output=True)
+    run_git(['checkout', '-q', '--detach', commit], cwd=repo_path, capture_output=True)
@@ -0,0 +1,43 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Holds an exclusive, blocking lock on a file for the duration of a `with` block.
+
+    The lock is advisory and shared between processes on the same host, so parallel CLI runs (e.g.
+    several CI jobs) can coordinate access to a shared cache directory.
+
+    Args:
+        lock_path (str or Path): The lock file. It is created if it does not exist.
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if os.name == "nt":
+            f.seek(0)
+            # LK_LOCK retries for ~10 seconds before failing, so keep trying until it succeeds
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,85 @@
+import hashlib
+import re
+from pathlib import Path
+
+from exb_dev_cli.utils.cache import default_cache_dir
+from exb_dev_cli.utils.git import run_git
+from exb_dev_cli.utils.locking import file_lock
+
+
+class MirrorCache:
+    """
+    Class to manage a shared cache of bare `--mirror` repositories, one per remote URL.
+
+    Clones are made from the local mirror, so only the first clone of a repo on a machine transfers
+    its history over the network; later clones only fetch what is new.
+
+    Attributes:
+        root (Path): The directory holding the mirrors.
+    """
+
+    def __init__(self, root: Path = None):
+        """
+        Initializes the MirrorCache instance.
+
+        Args:
+            root (Path, optional): The mirror directory. Defaults to `git-mirrors` in the shared cache directory.
+        """
+        self.root = Path(root) if root else default_cache_dir() / "git-mirrors"
+
+    def mirror_path(self, repo_url: str):
+        """
+        Returns the mirror directory for a remote URL.
+
+        Args:
+            repo_url (str): The URL of the Git repository.
+
+        Returns:
+            Path: A directory named after the repo with a short hash of the full URL.
+        """
+        name = re.sub(r"\.git$", "", repo_url.rstrip("/").rsplit("/", 1)[-1]) or "repo"
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", name)
+        digest = hashlib.sha1(repo_url.encode("utf-8")).hexdigest()[:12]
+        return self.root / f"{name}-{digest}.git"
+
+    def ensure_mirror(self, repo_url: str, quiet: bool = False):
+        """
+        Creates the mirror for a URL, or fetches new commits into an existing one.
+
+        Args:
+            repo_url (str): The URL of the Git repository.
+            quiet (bool, optional): Capture git output instead of printing it. Defaults to False.
+
+        Returns:
+            Path: The up to date mirror.
+
+        Raises:
+            subprocess.CalledProcessError: If the clone or fetch fails.
+        """
+        mirror = self.mirror_path(repo_url)
+        with file_lock(self.root / "locks" / f"{mirror.name}.lock"):
+            if (mirror / "HEAD").exists():
+                run_git(['fetch', '--prune', 'origin'], cwd=mirror, capture_output=quiet)
+            else:
+                mirror.parent.mkdir(parents=True, exist_ok=True)
+                run_git(['clone', '--mirror', repo_url, mirror], capture_output=quiet)
+        return mirror
+
+    def clone(self, repo_url: str, destination_dir, quiet: bool = False):
+        """
+        Clones a repository by way of its local mirror.
+
+        The clone is a plain local clone of the mirror, which hardlinks objects where possible and is
+        independent of the mirror afterwards. Its `origin` is then pointed back at `repo_url`.
+
+        Args:
+            repo_url (str): The URL of the Git repository.
+            destination_dir (str or Path): The directory to clone into.
+            quiet (bool, optional): Capture git output instead of printing it. Defaults to False.
+
+        Raises:
+            subprocess.CalledProcessError: If updating the mirror or cloning fails.
+        """
+        mirror = self.ensure_mirror(repo_url, quiet=quiet)
+        run_git(['clone', mirror, destination_dir], capture_output=quiet)
+        run_git(['remote', 'set-url', 'origin', repo_url], cwd=destination_dir, capture_output=quiet)
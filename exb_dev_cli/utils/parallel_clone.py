@@ -0,0 +1,160 @@
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from exb_dev_cli.utils.tracing import span
+
+
+class CloneResult:
+    """
+    Class to record the outcome of cloning a single repository.
+
+    Attributes:
+        name (str): The name of the application or core widgets repo.
+        repo_url (str): The URL of the Git repository.
+        destination (Path): The directory the repository was cloned into.
+        seconds (float): Wall time spent cloning.
+        size_bytes (int): Size of the cloned directory on disk.
+        error (str): The error message if the clone failed, otherwise None.
+    """
+
+    def __init__(self, name: str, repo_url: str, destination: Path):
+        """
+        Initializes the CloneResult instance.
+
+        Args:
+            name (str): The name of the application or core widgets repo.
+            repo_url (str): The URL of the Git repository.
+            destination (Path): The directory the repository is cloned into.
+        """
+        self.name = name
+        self.repo_url = repo_url
+        self.destination = destination
+        self.seconds = 0.0
+        self.size_bytes = 0
+        self.error = None
+
+    @property
+    def ok(self):
+        """Returns True if the clone succeeded."""
+        return self.error is None
+
+
+def directory_size(path):
+    """
+    Returns the total size in bytes of all files below a directory.
+
+    Args:
+        path (str or Path): The directory to measure.
+
+    Returns:
+        int: The total file size in bytes. Symlinks are not followed.
+    """
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+def _format_error(exc):
+    """Returns a one-line description of a failed clone."""
+    if isinstance(exc, subprocess.CalledProcessError) and exc.stderr:
+        lines = [line for line in exc.stderr.strip().splitlines() if line.strip()]
+        if lines:
+            return lines[-1].strip()
+    return str(exc)
+
+
+def clone_repos_parallel(repos, clone_func, jobs=4, branch=None):
+    """
+    Clones several repositories with a bounded pool of worker threads.
+
+    A failing clone is recorded on its result and does not stop the remaining clones.
+
+    Args:
+        repos (list): (name, repo_url, destination) tuples to clone.
+        clone_func (callable): Called as `clone_func(repo_url, destination, branch, quiet=True)` for each repo.
+        jobs (int, optional): Maximum number of clones to run at once. Defaults to 4.
+        branch (str, optional): The branch to check out for each repository. Defaults to None.
+
+    Returns:
+        list: A CloneResult per repository, in the same order as `repos`.
+    """
+    results = [CloneResult(name, url, Path(dest)) for name, url, dest in repos]
+    if not results:
+        return results
+
+    print_lock = threading.Lock()
+    finished = 0
+
+    def run(result):
+        with span(f"clone {result.name}", "clone", url=result.repo_url) as trace:
+            start = time.perf_counter()
+            try:
+                clone_func(result.repo_url, result.destination, branch, quiet=True)
+            except Exception as e:
+                result.error = _format_error(e)
+            result.seconds = time.perf_counter() - start
+            if result.ok:
+                result.size_bytes = directory_size(result.destination)
+            trace.update(bytes=result.size_bytes, error=result.error)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [executor.submit(run, result) for result in results]
+        for future in as_completed(futures):
+            result = future.result()
+            with print_lock:
+                finished += 1
+                status = "cloned" if result.ok else f"FAILED ({result.error})"
+                print(f"[{finished}/{len(results)}] {result.name} {status} in {result.seconds:.1f}s")
+
+    return results
+
+
+def format_size(num_bytes):
+    """
+    Formats a byte count for display.
+
+    Args:
+        num_bytes (int): The number of bytes.
+
+    Returns:
+        str: The size with a binary unit suffix, e.g. `1.5 MiB`.
+    """
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def print_clone_summary(results):
+    """
+    Prints a table of time and bytes per cloned repository.
+
+    Args:
+        results (list): CloneResult instances returned by `clone_repos_parallel`.
+    """
+    if not results:
+        return
+    name_width = max(len("Repository"), *(len(r.name) for r in results))
+    print(f"{'Repository':<{name_width}}  {'Status':<6}  {'Time':>8}  {'Size':>10}")
+    for r in results:
+        status = "ok" if r.ok else "failed"
+        print(f"{r.name:<{name_width}}  {status:<6}  {r.seconds:>7.1f}s  {format_size(r.size_bytes):>10}")
+    total_seconds = sum(r.seconds for r in results)
+    total_bytes = sum(r.size_bytes for r in results)
+    print(f"{'Total':<{name_width}}  {'':<6}  {total_seconds:>7.1f}s  {format_size(total_bytes):>10}")
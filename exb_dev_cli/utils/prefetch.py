@@ -0,0 +1,160 @@
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from exb_dev_cli.utils.git import run_git
+from exb_dev_cli.utils.tracing import span
+
+
+NICE_INCREMENT = 10
+# From the Windows API; processes started afterwards inherit it
+BELOW_NORMAL_PRIORITY_CLASS = 0x00004000
+
+PREFETCH_DOWNLOADED = "downloaded"
+PREFETCH_CLONED = "cloned"
+PREFETCH_UPDATED = "updated"
+PREFETCH_CURRENT = "current"
+PREFETCH_FAILED = "failed"
+
+
+def lower_priority():
+    """
+    Lowers the scheduling priority of this process and of every git process it starts afterwards.
+
+    On Linux the I/O priority of the default schedulers follows the CPU priority, so disk work is
+    deprioritized as well.
+
+    Returns:
+        bool: True if the priority was lowered.
+    """
+    try:
+        if os.name == "nt":
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            return bool(kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), BELOW_NORMAL_PRIORITY_CLASS))
+        os.nice(NICE_INCREMENT)
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+class PrefetchResult:
+    """
+    Class to collect what a prefetch changed, for a report at the end.
+
+    Attributes:
+        entries (list): (kind, name, action, detail) tuples, where kind is `archive` or `mirror` and
+            action is one of the PREFETCH_* constants.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def add(self, kind, name, action, detail=""):
+        """Records the outcome for one archive or mirror."""
+        with self._lock:
+            self.entries.append((kind, name, action, detail))
+
+    @property
+    def changed(self):
+        """Returns the entries that downloaded or fetched something."""
+        return [entry for entry in self.entries if entry[2] in (PREFETCH_DOWNLOADED, PREFETCH_CLONED, PREFETCH_UPDATED)]
+
+    @property
+    def failed(self):
+        """Returns the entries that failed."""
+        return [entry for entry in self.entries if entry[2] == PREFETCH_FAILED]
+
+    def print_summary(self):
+        """Prints what changed and what failed, and a one-line total."""
+        for kind, name, action, detail in self.entries:
+            if action != PREFETCH_CURRENT:
+                print(f"{kind:<8} {name}: {action}{f' ({detail})' if detail else ''}")
+        current = len(self.entries) - len(self.changed) - len(self.failed)
+        print(f"Prefetch: {len(self.changed)} changed, {current} already up to date, {len(self.failed)} failed.")
+
+
+def _mirror_refs(mirror):
+    """Returns a dict from ref name to commit for a mirror, or None if the mirror does not exist yet."""
+    if not (mirror / "HEAD").exists():
+        return None
+    output = run_git(['for-each-ref', '--format=%(objectname) %(refname)'], cwd=mirror, capture_output=True).stdout
+    refs = {}
+    for line in output.splitlines():
+        commit, ref = line.split(" ", 1)
+        refs[ref] = commit
+    return refs
+
+
+def prefetch_archives(versions, cache, rate_limit=None, result=None):
+    """
+    Downloads the archives of versions that are not in the archive cache yet, one at a time.
+
+    Args:
+        versions (list): (version, url, sha256) tuples; sha256 may be None.
+        cache (ArchiveCache): The cache to download into.
+        rate_limit (int, optional): Cap each download at this many bytes per second. Defaults to None.
+        result (PrefetchResult, optional): Collects the outcomes. Defaults to a new PrefetchResult.
+
+    Returns:
+        PrefetchResult: The collected outcomes.
+    """
+    from exb_dev_cli.utils.parallel_clone import format_size
+
+    result = result or PrefetchResult()
+    for version, url, sha256 in versions:
+        if cache.contains(version, sha256, url):
+            result.add("archive", version, PREFETCH_CURRENT)
+            continue
+        with span("prefetch archive", "prefetch", version=version):
+            try:
+                path = cache.fetch(version, url, sha256=sha256, rate_limit=rate_limit)
+                result.add("archive", version, PREFETCH_DOWNLOADED, format_size(path.stat().st_size))
+            except Exception as e:
+                result.add("archive", version, PREFETCH_FAILED, str(e))
+    return result
+
+
+def prefetch_mirrors(repo_urls, mirrors, jobs=1, result=None):
+    """
+    Fetches new commits into the local mirror of each repo, creating missing mirrors.
+
+    Args:
+        repo_urls (dict): Maps names to repository URLs.
+        mirrors (MirrorCache): The mirror cache.
+        jobs (int, optional): Maximum number of mirrors fetched at once. Defaults to 1.
+        result (PrefetchResult, optional): Collects the outcomes. Defaults to a new PrefetchResult.
+
+    Returns:
+        PrefetchResult: The collected outcomes.
+    """
+    result = result or PrefetchResult()
+
+    def fetch(item):
+        name, repo_url = item
+        mirror = mirrors.mirror_path(repo_url)
+        with span("prefetch mirror", "prefetch", repo=name):
+            try:
+                before = _mirror_refs(mirror)
+                mirrors.ensure_mirror(repo_url, quiet=True)
+                after = _mirror_refs(mirror)
+            except subprocess.CalledProcessError as e:
+                detail = e.stderr.strip().splitlines()[-1] if e.stderr else str(e)
+                result.add("mirror", name, PREFETCH_FAILED, detail)
+                return
+        if before is None:
+            result.add("mirror", name, PREFETCH_CLONED, f"{len(after)} ref(s)")
+            return
+        changed = sum(1 for ref, commit in after.items() if before.get(ref) != commit)
+        removed = len(before.keys() - after.keys())
+        if changed or removed:
+            result.add("mirror", name, PREFETCH_UPDATED, f"{changed} ref(s) updated, {removed} removed")
+        else:
+            result.add("mirror", name, PREFETCH_CURRENT)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        list(executor.map(fetch, repo_urls.items()))
+    return result
@@ -0,0 +1,242 @@
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from exb_dev_cli.utils.tracing import span
+
+
+TRASH_DIR_NAME = ".exb-trash"
+
+
+class RemoveResult:
+    """
+    Class to summarize a deletion.
+
+    Attributes:
+        files (int): Files and symlinks removed.
+        dirs (int): Folders removed.
+        seconds (float): Wall time spent.
+        trashed (list): Paths moved to the trash for background deletion instead.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.dirs = 0
+        self.seconds = 0.0
+        self.trashed = []
+        self._lock = threading.Lock()
+
+    def add(self, files=0, dirs=0):
+        """Adds removed file and folder counts."""
+        with self._lock:
+            self.files += files
+            self.dirs += dirs
+
+    def __repr__(self):
+        return f"RemoveResult(files={self.files}, dirs={self.dirs}, trashed={len(self.trashed)})"
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except PermissionError:
+        # Git marks its object files read-only, which blocks deleting them on Windows; elsewhere it is
+        # the folder's write permission that matters
+        if os.name == "nt":
+            os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        else:
+            os.chmod(os.path.dirname(path), stat.S_IRWXU)
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _rmdir(path):
+    try:
+        os.rmdir(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD | stat.S_IEXEC)
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
+
+
+def _clear_folder(folder):
+    """Unlinks a folder's files and symlinks. Returns its subfolders and the number of files removed."""
+    subfolders, files = [], 0
+    try:
+        entries = list(os.scandir(folder))
+    except FileNotFoundError:
+        return subfolders, files
+    except PermissionError:
+        # A folder without read or execute permission cannot be listed until it is made accessible
+        os.chmod(folder, stat.S_IWRITE | stat.S_IREAD | stat.S_IEXEC)
+        entries = list(os.scandir(folder))
+    for entry in entries:
+        # Symlinks (e.g. app links in an Experience Builder tree) are removed, never followed
+        if entry.is_dir(follow_symlinks=False):
+            subfolders.append(entry.path)
+        else:
+            _unlink(entry.path)
+            files += 1
+    return subfolders, files
+
+
+def remove_tree(path, jobs=8, result=None):
+    """
+    Deletes a folder tree, listing and unlinking its folders in parallel.
+
+    Every folder is read with a single `os.scandir` pass and its subfolders are handed to the next free
+    worker, so deep and wide trees such as `node_modules` or a repo's `.git/objects` are deleted by
+    several threads at once. Read-only files are made writable and deleted. Symlinks are removed
+    without following them. A symlink or file passed as `path` is simply unlinked.
+
+    Args:
+        path (str or Path): The folder to delete. Missing paths are ignored.
+        jobs (int, optional): Maximum number of folders processed at once. Defaults to 8.
+        result (RemoveResult, optional): Collects the counts. Defaults to a new RemoveResult.
+
+    Returns:
+        RemoveResult: The files and folders removed.
+    """
+    result = result or RemoveResult()
+    path = Path(path)
+    start = time.perf_counter()
+    if path.is_symlink() or path.is_file():
+        _unlink(path)
+        result.add(files=1)
+        return result
+    if not path.is_dir():
+        return result
+
+    with span("remove tree", "remove", path=str(path)) as trace:
+        folders = [str(path)]
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            pending = {executor.submit(_clear_folder, str(path))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subfolders, files = future.result()
+                    result.add(files=files)
+                    folders.extend(subfolders)
+                    pending.update(executor.submit(_clear_folder, subfolder) for subfolder in subfolders)
+
+        # Every folder is empty of files now; remove the deepest first
+        for folder in sorted(folders, key=lambda folder: folder.count(os.sep), reverse=True):
+            _rmdir(folder)
+        result.add(dirs=len(folders))
+        trace.update(files=result.files, dirs=result.dirs)
+    result.seconds += time.perf_counter() - start
+    return result
+
+
+def move_to_trash(path, trash_dir=None):
+    """
+    Renames a folder into a trash folder on the same file system, which takes milliseconds at any size.
+
+    Args:
+        path (str or Path): The folder to move.
+        trash_dir (str or Path, optional): The trash folder. Defaults to `.exb-trash` next to `path`.
+
+    Returns:
+        Path: The new location, inside the trash folder.
+
+    Raises:
+        OSError: If the folder cannot be renamed there, e.g. because the trash is on another drive.
+    """
+    path = Path(path)
+    trash_dir = Path(trash_dir) if trash_dir else path.parent / TRASH_DIR_NAME
+    trash_dir.mkdir(parents=True, exist_ok=True)
+    target = trash_dir / f"{path.name}-{uuid.uuid4().hex[:8]}"
+    os.replace(path, target)
+    return target
+
+
+def spawn_background_delete(trash_dir):
+    """
+    Starts a detached process that empties a trash folder, so the caller can exit immediately.
+
+    Args:
+        trash_dir (str or Path): The trash folder to empty and remove.
+
+    Returns:
+        subprocess.Popen: The deleting process.
+    """
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    return subprocess.Popen([sys.executable, "-m", "exb_dev_cli.utils.remove", str(trash_dir)],
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+
+
+def remove_paths(paths, background=False, jobs=8):
+    """
+    Deletes several files or folder trees, now or in the background.
+
+    In background mode each folder is renamed into a `.exb-trash` folder next to it and a detached
+    process deletes the trash, so the call returns in milliseconds even for trees with hundreds of
+    thousands of files. Folders that cannot be renamed (e.g. the trash would be on another drive) and
+    plain files or symlinks are deleted right away.
+
+    Args:
+        paths (list): The files, symlinks and folders to delete. Missing paths are ignored.
+        background (bool, optional): Move folders to the trash and delete them in the background. Defaults to False.
+        jobs (int, optional): Maximum number of folders processed at once when deleting now. Defaults to 8.
+
+    Returns:
+        RemoveResult: What was removed or moved to the trash.
+    """
+    result = RemoveResult()
+    trash_dirs = set()
+    for path in paths:
+        path = Path(path)
+        if background and path.is_dir() and not path.is_symlink():
+            try:
+                result.trashed.append(move_to_trash(path))
+                trash_dirs.add(result.trashed[-1].parent)
+                continue
+            except OSError:
+                pass
+        remove_tree(path, jobs=jobs, result=result)
+    for trash_dir in sorted(trash_dirs):
+        spawn_background_delete(trash_dir)
+    return result
+
+
+def empty_trash(trash_dir, jobs=8):
+    """
+    Deletes everything in a trash folder, then the folder itself.
+
+    Args:
+        trash_dir (str or Path): The trash folder.
+        jobs (int, optional): Maximum number of folders processed at once. Defaults to 8.
+
+    Returns:
+        RemoveResult: What was removed.
+    """
+    result = RemoveResult()
+    trash_dir = Path(trash_dir)
+    try:
+        entries = sorted(trash_dir.iterdir())
+    except FileNotFoundError:
+        return result
+    for entry in entries:
+        remove_tree(entry, jobs=jobs, result=result)
+    try:
+        trash_dir.rmdir()
+    except OSError:
+        # Another background process added to the trash in the meantime and will remove it
+        pass
+    return result
+
+
+if __name__ == "__main__":
+    empty_trash(sys.argv[1])
@@ -0,0 +1,172 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from exb_dev_cli.utils.tracing import span
+
+
+TASK_PENDING = "pending"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+TASK_SKIPPED = "skipped"
+TASK_CANCELLED = "cancelled"
+
+
+class Task:
+    """
+    Class to describe one step of a pipeline and record how it went.
+
+    Attributes:
+        name (str): A unique name, used by other tasks to depend on this one.
+        func (callable): Called with no arguments to run the step.
+        deps (tuple): Names of the tasks that must finish first.
+        pool (str): The worker pool the task runs in; each pool has its own concurrency limit.
+        fatal (bool): Whether a failure cancels the whole pipeline. Non-fatal failures only skip the
+            tasks that depend on this one.
+        state (str): TASK_PENDING, TASK_DONE, TASK_FAILED, TASK_SKIPPED or TASK_CANCELLED.
+        error (str): The error message if the task failed, otherwise None.
+        seconds (float): Wall time spent running the task.
+    """
+
+    def __init__(self, name: str, func, deps=(), pool: str = "default", fatal: bool = True):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.pool = pool
+        self.fatal = fatal
+        self.state = TASK_PENDING
+        self.error = None
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return f"Task({self.name!r}, state={self.state!r})"
+
+
+def _check_graph(tasks):
+    """Raises ValueError for duplicate names, unknown dependencies or cycles."""
+    by_name = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"Duplicate task name: {task.name}")
+        by_name[task.name] = task
+    for task in tasks:
+        for dep in task.deps:
+            if dep not in by_name:
+                raise ValueError(f"Task {task.name} depends on unknown task {dep}")
+
+    visiting, visited = set(), set()
+
+    def visit(task):
+        if task.name in visited:
+            return
+        if task.name in visiting:
+            raise ValueError(f"Dependency cycle through task {task.name}")
+        visiting.add(task.name)
+        for dep in task.deps:
+            visit(by_name[dep])
+        visiting.discard(task.name)
+        visited.add(task.name)
+
+    for task in tasks:
+        visit(task)
+    return by_name
+
+
+def run_tasks(tasks, limits=None, default_limit=4, cancel_event=None):
+    """
+    Runs tasks as soon as their dependencies finish, with a concurrency limit per pool.
+
+    On the first fatal failure no further tasks are started, tasks waiting in a pool are cancelled and
+    `cancel_event` is set. Tasks already running are not interrupted; they are waited for before the
+    error is raised. Ctrl+C cancels the same way.
+
+    Args:
+        tasks (list): Task instances.
+        limits (dict, optional): Maps pool names to their maximum number of concurrent tasks.
+        default_limit (int, optional): The limit for pools missing from `limits`. Defaults to 4.
+        cancel_event (threading.Event, optional): Set when the pipeline is cancelled. Defaults to a new event.
+
+    Returns:
+        list: The tasks, with their state, error and timing filled in.
+
+    Raises:
+        ValueError: If the task graph has duplicate names, unknown dependencies or a cycle.
+        RuntimeError: If a fatal task failed.
+    """
+    by_name = _check_graph(tasks)
+    limits = limits or {}
+    cancel_event = cancel_event or threading.Event()
+    executors = {}
+    running = {}
+    fatal = None
+
+    def run(task):
+        with span(f"task {task.name}", "setup", pool=task.pool):
+            start = time.perf_counter()
+            try:
+                task.func()
+            finally:
+                task.seconds = time.perf_counter() - start
+
+    def submit_ready():
+        for task in tasks:
+            if task.state != TASK_PENDING or task in running.values():
+                continue
+            dep_states = [by_name[dep].state for dep in task.deps]
+            if any(state in (TASK_FAILED, TASK_SKIPPED, TASK_CANCELLED) for state in dep_states):
+                task.state = TASK_SKIPPED
+                task.error = "a dependency did not complete"
+                print(f"[setup] {task.name} skipped")
+            elif all(state == TASK_DONE for state in dep_states):
+                if task.pool not in executors:
+                    executors[task.pool] = ThreadPoolExecutor(
+                        max_workers=max(1, limits.get(task.pool, default_limit)), thread_name_prefix=task.pool)
+                running[executors[task.pool].submit(run, task)] = task
+
+    def cancel(reason):
+        cancel_event.set()
+        for future, task in list(running.items()):
+            if future.cancel():
+                task.state = TASK_CANCELLED
+                task.error = reason
+                del running[future]
+
+    try:
+        while True:
+            if fatal is None:
+                # Skipping a task also skips the tasks that depend on it, so repeat until nothing changes
+                while True:
+                    states = [task.state for task in tasks]
+                    submit_ready()
+                    if states == [task.state for task in tasks]:
+                        break
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    task.state = TASK_DONE
+                    print(f"[setup] {task.name} done in {task.seconds:.1f}s")
+                    continue
+                task.state = TASK_FAILED
+                task.error = str(error) or type(error).__name__
+                print(f"[setup] {task.name} FAILED: {task.error}")
+                if task.fatal and fatal is None:
+                    fatal = task
+                    cancel(f"cancelled after {task.name} failed")
+    except KeyboardInterrupt:
+        cancel("interrupted")
+        wait(list(running))
+        raise
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+        for task in tasks:
+            if task.state == TASK_PENDING:
+                task.state = TASK_CANCELLED
+
+    if fatal is not None:
+        raise RuntimeError(f"{fatal.name} failed: {fatal.error}")
+    return tasks
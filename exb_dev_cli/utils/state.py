@@ -0,0 +1,187 @@
+import json
+import os
+from pathlib import Path
+
+
+STATE_FILE_NAME = ".exb-dev-state.json"
+STATE_FORMAT = 1
+
+
+class AppRecord:
+    """
+    Compact record of an app installed into an Experience Builder installation.
+
+    Attributes:
+        name (str): The name of the application.
+        app_id (str): The app folder name under `server/public/apps`.
+        repo_path (Path): The path to the application's repo, or None if unknown.
+        config_link (str): The target of the `server/public/apps/<app_id>` symlink, or None if it is a plain folder.
+        widgets_link (str): The target of the `client/<name>_widgets` symlink, or None.
+    """
+
+    __slots__ = ("name", "app_id", "repo_path", "config_link", "widgets_link")
+
+    def __init__(self, name: str, app_id: str, repo_path: Path = None, config_link: str = None, widgets_link: str = None):
+        self.name = name
+        self.app_id = app_id
+        self.repo_path = Path(repo_path) if repo_path else None
+        self.config_link = config_link
+        self.widgets_link = widgets_link
+
+    def to_dict(self):
+        """Returns the record as a JSON-serializable dict."""
+        return {
+            "name": self.name,
+            "app_id": self.app_id,
+            "repo_path": str(self.repo_path) if self.repo_path else None,
+            "config_link": self.config_link,
+            "widgets_link": self.widgets_link,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Creates a record from a dict produced by `to_dict`."""
+        return cls(data["name"], data["app_id"], data.get("repo_path"), data.get("config_link"), data.get("widgets_link"))
+
+    def __eq__(self, other):
+        return isinstance(other, AppRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"AppRecord(name={self.name!r}, app_id={self.app_id!r}, repo_path={self.repo_path!r})"
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def link_target(path):
+    """
+    Returns the target of a symlink as an absolute, normalized path string.
+
+    Relative targets are resolved against the link's folder, the way the OS follows them.
+
+    Args:
+        path (Path): The symlink.
+
+    Returns:
+        str: The target, or None if `path` is not a symlink.
+    """
+    if not os.path.islink(path):
+        return None
+    target = os.readlink(path)
+    return target if os.path.isabs(target) else os.path.normpath(os.path.join(os.path.dirname(path), target))
+
+
+def scan_installed_apps(exb_path: Path, repos_dir: Path = Path("repos")):
+    """
+    Builds app records by scanning an Experience Builder installation.
+
+    Every folder or symlink in `server/public/apps` is an app. For symlinks to a repo's `AppConfig`
+    folder the repo is the link target's parent; for plain folders `repos_dir/<app_id>` is used when it
+    exists. `client/<name>_widgets` symlinks are matched to apps by name.
+
+    Args:
+        exb_path (Path): The path to the Experience Builder installation.
+        repos_dir (Path, optional): Where plain app folders' repos are looked up. Defaults to `repos`.
+
+    Returns:
+        dict: Maps app names to AppRecord instances.
+    """
+    apps_dir = Path(exb_path) / "server" / "public" / "apps"
+    client_dir = Path(exb_path) / "client"
+
+    widget_links = {}
+    if client_dir.is_dir():
+        with os.scandir(client_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith("_widgets") and entry.is_symlink():
+                    widget_links[entry.name[:-len("_widgets")]] = link_target(entry.path)
+
+    apps = {}
+    if apps_dir.is_dir():
+        with os.scandir(apps_dir) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    config_link = link_target(entry.path)
+                    repo_path = Path(config_link).parent
+                    name = repo_path.name
+                elif entry.is_dir():
+                    config_link = None
+                    name = entry.name
+                    candidate = Path(repos_dir) / name
+                    repo_path = candidate if candidate.exists() else None
+                else:
+                    continue
+                apps[name] = AppRecord(name, entry.name, repo_path, config_link, widget_links.get(name))
+    return apps
+
+
+class InstallationState:
+    """
+    Class to persist the installed apps of an Experience Builder installation.
+
+    The state is stored in `<exb_path>/.exb-dev-state.json` together with the modification times of
+    `server/public/apps` and `client`. Adding or removing an entry in either folder changes its mtime,
+    so a matching pair of mtimes means the stored records are still valid and no scan is needed.
+
+    Attributes:
+        exb_path (Path): The path to the Experience Builder installation.
+        repos_dir (Path): Where plain app folders' repos are looked up when scanning.
+    """
+
+    def __init__(self, exb_path: Path, repos_dir: Path = Path("repos")):
+        self.exb_path = Path(exb_path)
+        self.repos_dir = Path(repos_dir)
+
+    @property
+    def state_path(self):
+        """Returns the path of the state file."""
+        return self.exb_path / STATE_FILE_NAME
+
+    def _fingerprint(self):
+        return [
+            _mtime_ns(self.exb_path / "server" / "public" / "apps"),
+            _mtime_ns(self.exb_path / "client"),
+        ]
+
+    def load(self):
+        """
+        Returns the installed apps, rescanning only if the installation changed since the last save.
+
+        Loading never writes the state file; after a rescan the caller decides whether to `save`.
+
+        Returns:
+            tuple: A dict mapping app names to AppRecord instances, and True if the apps were rescanned.
+        """
+        fingerprint = self._fingerprint()
+        try:
+            with open(self.state_path, "r") as f:
+                data = json.load(f)
+            if data.get("format") == STATE_FORMAT and data.get("fingerprint") == fingerprint:
+                return {record["name"]: AppRecord.from_dict(record) for record in data["apps"]}, False
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+        return scan_installed_apps(self.exb_path, self.repos_dir), True
+
+    def save(self, apps: dict):
+        """
+        Writes the app records along with the current folder modification times.
+
+        Args:
+            apps (dict): Maps app names to AppRecord instances.
+        """
+        if not self.exb_path.is_dir():
+            return
+        data = {
+            "format": STATE_FORMAT,
+            "fingerprint": self._fingerprint(),
+            "apps": [record.to_dict() for record in apps.values()],
+        }
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,273 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from exb_dev_cli.utils.cache import default_cache_dir
+from exb_dev_cli.utils.git import run_git
+
+
+STATUS_CACHE_NAME = "status.json"
+
+
+class RepoStatus:
+    """
+    Class to record the state of one repository's working tree.
+
+    Attributes:
+        name (str): The name of the application or core widgets repo.
+        path (Path): The repo's working tree.
+        branch (str): The checked out branch, or `(detached)`.
+        upstream (str): The upstream branch, or None.
+        ahead (int): Commits ahead of the upstream.
+        behind (int): Commits behind the upstream.
+        staged (int): Files with staged changes.
+        modified (int): Files with unstaged changes.
+        untracked (int): Untracked files.
+        conflicts (int): Files with merge conflicts.
+        error (str): Why the status could not be read (e.g. the repo is missing), otherwise None.
+        cached (bool): Whether the status came from the cache.
+    """
+
+    FIELDS = ("branch", "upstream", "ahead", "behind", "staged", "modified", "untracked", "conflicts", "error")
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = Path(path)
+        self.branch = None
+        self.upstream = None
+        self.ahead = 0
+        self.behind = 0
+        self.staged = 0
+        self.modified = 0
+        self.untracked = 0
+        self.conflicts = 0
+        self.error = None
+        self.cached = False
+
+    @property
+    def dirty(self):
+        """Returns True if the working tree has any uncommitted change."""
+        return bool(self.staged or self.modified or self.untracked or self.conflicts)
+
+    @property
+    def state(self):
+        """Returns a one-word summary: `error`, `dirty`, `diverged`, `ahead`, `behind` or `clean`."""
+        if self.error:
+            return "error"
+        if self.dirty:
+            return "dirty"
+        if self.ahead and self.behind:
+            return "diverged"
+        if self.ahead:
+            return "ahead"
+        if self.behind:
+            return "behind"
+        return "clean"
+
+    def to_dict(self):
+        """Returns the status as a JSON-serializable dict."""
+        data = {"name": self.name, "path": str(self.path), "state": self.state}
+        data.update({field: getattr(self, field) for field in self.FIELDS})
+        return data
+
+    @classmethod
+    def from_dict(cls, name: str, path: Path, data: dict):
+        """Creates a status from a dict produced by `to_dict`."""
+        status = cls(name, path)
+        for field in cls.FIELDS:
+            setattr(status, field, data.get(field))
+        return status
+
+
+def parse_porcelain_v2(output, status):
+    """
+    Fills in a RepoStatus from `git status --porcelain=v2 --branch` output.
+
+    Args:
+        output (str): The command's stdout.
+        status (RepoStatus): The status to update.
+
+    Returns:
+        RepoStatus: The updated status.
+    """
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            status.branch = line[len("# branch.head "):]
+        elif line.startswith("# branch.upstream "):
+            status.upstream = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line[len("# branch.ab "):].split()
+            status.ahead, status.behind = int(ahead), -int(behind)
+        elif line.startswith(("1 ", "2 ")):
+            xy = line[2:4]
+            status.staged += xy[0] != "."
+            status.modified += xy[1] != "."
+        elif line.startswith("u "):
+            status.conflicts += 1
+        elif line.startswith("? "):
+            status.untracked += 1
+    return status
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def fingerprint(repo_path):
+    """
+    Returns the file modification times that change whenever a repo's status can change.
+
+    `git status`, `add`, `commit`, `checkout` and friends rewrite `.git/index`; moving the branch
+    rewrites `HEAD` or its ref; `fetch` rewrites `FETCH_HEAD`. An edit to a tracked file that nothing
+    has looked at yet does not change any of these, so such edits show up once git next refreshes the
+    index, or immediately with `status --refresh`.
+
+    Args:
+        repo_path (Path): The repo's working tree.
+
+    Returns:
+        list: The mtimes, or None if the repo has no `.git` folder.
+    """
+    git_dir = Path(repo_path) / ".git"
+    if not git_dir.is_dir():
+        return None
+    head = git_dir / "HEAD"
+    ref = None
+    try:
+        with open(head, "r") as f:
+            content = f.read().strip()
+        if content.startswith("ref: "):
+            ref = git_dir / content[len("ref: "):]
+    except OSError:
+        return None
+    return [
+        _mtime_ns(git_dir / "index"),
+        _mtime_ns(head),
+        _mtime_ns(ref) if ref else None,
+        _mtime_ns(git_dir / "FETCH_HEAD"),
+        _mtime_ns(git_dir / "packed-refs"),
+    ]
+
+
+def read_status(name, repo_path):
+    """
+    Reads the status of one repository with `git status --porcelain=v2 --branch`.
+
+    Args:
+        name (str): The name of the application or core widgets repo.
+        repo_path (Path): The repo's working tree.
+
+    Returns:
+        RepoStatus: The repo's status. Missing repos and git errors are recorded in `error`.
+    """
+    status = RepoStatus(name, repo_path)
+    if not (Path(repo_path) / ".git").exists():
+        status.error = "not cloned"
+        return status
+    result = run_git(['status', '--porcelain=v2', '--branch'], cwd=repo_path, check=False, capture_output=True)
+    if result.returncode != 0:
+        status.error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "git status failed"
+        return status
+    return parse_porcelain_v2(result.stdout, status)
+
+
+class StatusCache:
+    """
+    Class to remember repo statuses between runs, keyed on each repo's git metadata mtimes.
+
+    Attributes:
+        path (Path): The cache file.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else default_cache_dir() / STATUS_CACHE_NAME
+        try:
+            with open(self.path, "r") as f:
+                self._entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+
+    def get(self, name, repo_path, current_fingerprint):
+        """Returns the cached status if the repo's fingerprint still matches, otherwise None."""
+        entry = self._entries.get(os.path.abspath(repo_path))
+        if current_fingerprint is None or not entry or entry["fingerprint"] != current_fingerprint:
+            return None
+        status = RepoStatus.from_dict(name, repo_path, entry["status"])
+        status.cached = True
+        return status
+
+    def put(self, status, current_fingerprint):
+        """Stores a status under the repo's current fingerprint."""
+        if current_fingerprint is not None and not status.error:
+            self._entries[os.path.abspath(status.path)] = {"fingerprint": current_fingerprint, "status": status.to_dict()}
+
+    def save(self):
+        """Writes the cache file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per thread too, since several threads may save their own instance at once
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+
+def repo_statuses(repos, jobs=8, refresh=False, cache=None):
+    """
+    Reads the status of several repositories in parallel, reusing cached results where possible.
+
+    Args:
+        repos (list): (name, repo_path) tuples.
+        jobs (int, optional): Maximum number of `git status` processes at once. Defaults to 8.
+        refresh (bool, optional): Ignore cached results. Defaults to False.
+        cache (StatusCache, optional): The cache to use. Defaults to the user's default cache.
+
+    Returns:
+        list: A RepoStatus per repository, in the same order as `repos`.
+    """
+    cache = cache or StatusCache()
+
+    def check(repo):
+        name, repo_path = repo
+        if not refresh:
+            cached = cache.get(name, repo_path, fingerprint(repo_path))
+            if cached:
+                return cached, None
+        status = read_status(name, repo_path)
+        # Taken after running git, because `git status` itself may rewrite the index while refreshing it
+        return status, fingerprint(repo_path)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        results = list(executor.map(check, repos))
+
+    for status, current_fingerprint in results:
+        if not status.cached:
+            cache.put(status, current_fingerprint)
+    cache.save()
+    return [status for status, _ in results]
+
+
+def print_status_table(statuses):
+    """
+    Prints one compact line per repository.
+
+    Args:
+        statuses (list): RepoStatus instances returned by `repo_statuses`.
+    """
+    if not statuses:
+        return
+    name_width = max(len("Repository"), *(len(s.name) for s in statuses))
+    branch_width = max(len("Branch"), *(len(s.branch or "") for s in statuses))
+    print(f"{'Repository':<{name_width}}  {'Branch':<{branch_width}}  {'State':<8}  {'+/-':>7}  {'Staged':>6}  "
+          f"{'Modified':>8}  {'Untracked':>9}")
+    for s in statuses:
+        if s.error:
+            print(f"{s.name:<{name_width}}  {'':<{branch_width}}  {'error':<8}  {s.error}")
+            continue
+        ahead_behind = f"+{s.ahead}/-{s.behind}" if s.upstream else "-"
+        print(f"{s.name:<{name_width}}  {s.branch or '':<{branch_width}}  {s.state:<8}  {ahead_behind:>7}  "
+              f"{s.staged:>6}  {s.modified:>8}  {s.untracked:>9}")
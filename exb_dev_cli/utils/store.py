@@ -0,0 +1,313 @@
+import errno
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import zipfile
+from pathlib import Path
+
+from exb_dev_cli.utils.cache import default_cache_dir
+from exb_dev_cli.utils.extract import MANIFEST_NAME, READ_SIZE, member_path
+from exb_dev_cli.utils.locking import file_lock
+from exb_dev_cli.utils.tracing import span
+
+
+# Files Experience Builder rewrites in place (apps saved by the builder, extensions added by
+# developers, npm's package files) are copied into workspaces instead of being shared with the store.
+COPY_PATTERNS = (
+    "*/server/public/apps/*",
+    "*/client/your-extensions/*",
+    "*/package.json",
+    "*/package-lock.json",
+)
+# Linux FICLONE ioctl, which clones a file on copy-on-write file systems such as Btrfs and XFS
+FICLONE = 0x40049409
+
+
+def is_copied(name: str):
+    """Returns True if a workspace file is copied rather than linked from the store."""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in COPY_PATTERNS)
+
+
+def _reflink(source, target):
+    """Clones `source` to `target` sharing data blocks. Raises OSError where unsupported."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+    import fcntl
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.unlink(target)
+            raise
+
+
+def _same_file(path, object_stat):
+    try:
+        st = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return False
+    return (st.st_ino, st.st_dev) == (object_stat.st_ino, object_stat.st_dev)
+
+
+class MaterializeResult:
+    """
+    Class to summarize a workspace built from the store.
+
+    Attributes:
+        linked (int): Files hardlinked or reflinked from the store.
+        copied (int): Files copied because EXB modifies them or linking was not possible.
+        skipped (int): Files that were already in place.
+        bytes_copied (int): Bytes written by copies.
+    """
+
+    def __init__(self):
+        self.linked = 0
+        self.copied = 0
+        self.skipped = 0
+        self.bytes_copied = 0
+
+    def __repr__(self):
+        return f"MaterializeResult(linked={self.linked}, copied={self.copied}, skipped={self.skipped})"
+
+
+class FileStore:
+    """
+    Class to manage a content-addressed, read-only store of extracted Experience Builder files.
+
+    Each distinct file is stored once as `objects/<sha256[:2]>/<sha256>`, whichever version it came
+    from, and each imported version is described by `trees/<version>.json`, which maps member names to
+    digests. Workspaces are built from a tree as hardlinks (or reflinks where the file system supports
+    them) to the objects, so several versions and workspaces share one copy of every unchanged file.
+    Objects are read-only, so an in-place write to a linked file fails instead of changing the store.
+
+    Attributes:
+        root (Path): The store directory.
+    """
+
+    def __init__(self, root: Path = None):
+        """
+        Initializes the FileStore instance.
+
+        Args:
+            root (Path, optional): The store directory. Defaults to `store` in the shared cache directory.
+        """
+        self.root = Path(root) if root else default_cache_dir() / "store"
+
+    def object_path(self, sha256: str):
+        """Returns the path of the stored object with the given digest."""
+        return self.root / "objects" / sha256[:2] / sha256
+
+    def tree_path(self, version: str):
+        """Returns the path of the tree describing a version."""
+        return self.root / "trees" / f"{version}.json"
+
+    def load_tree(self, version: str):
+        """
+        Loads the tree of an imported version.
+
+        Args:
+            version (str): The Experience Builder version.
+
+        Returns:
+            dict: The tree, or None if the version has not been imported.
+        """
+        try:
+            with open(self.tree_path(version), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def versions(self):
+        """Returns the imported versions."""
+        trees_dir = self.root / "trees"
+        return sorted(p.stem for p in trees_dir.glob("*.json")) if trees_dir.is_dir() else []
+
+    def _add_object(self, src, info):
+        """Streams a member into the store. Returns its digest and whether a new object was written."""
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / f"{os.getpid()}-{info.CRC:08x}-{info.file_size}"
+        digest = hashlib.sha256()
+        with open(tmp_path, "wb") as dst:
+            for chunk in iter(lambda: src.read(READ_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+        sha256 = digest.hexdigest()
+
+        target = self.object_path(sha256)
+        if target.exists():
+            tmp_path.unlink()
+            return sha256, False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        executable = (info.external_attr >> 16) & 0o111
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH | executable)
+        os.replace(tmp_path, target)
+        return sha256, True
+
+    def import_archive(self, zip_path, version: str, sha256: str = None):
+        """
+        Adds the files of an archive to the store, unless the same archive was already imported.
+
+        Args:
+            zip_path (str or Path): The Experience Builder archive.
+            version (str): The version the archive belongs to.
+            sha256 (str, optional): The archive's digest, e.g. from the archive cache. Computed if not given.
+
+        Returns:
+            dict: The version's tree.
+
+        Raises:
+            zipfile.BadZipFile: If the archive is not a valid zip file.
+            ValueError: If a member would be written outside the workspace.
+        """
+        if sha256 is None:
+            with open(zip_path, "rb") as f:
+                sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+        sha256 = sha256.lower()
+        # The gc lock keeps `gc` from deleting new objects before the tree referring to them is written
+        with file_lock(self.root / "locks" / f"tree-{version}.lock"), file_lock(self.root / "locks" / "gc.lock"):
+            tree = self.load_tree(version)
+            if tree and tree.get("archive_sha256") == sha256:
+                return tree
+
+            with span("store import", "store", version=version) as trace:
+                files, added, added_bytes = {}, 0, 0
+                with zipfile.ZipFile(zip_path) as zf:
+                    for info in zf.infolist():
+                        if info.is_dir():
+                            continue
+                        member_path(".", info.filename)
+                        with zf.open(info) as src:
+                            member_sha256, new = self._add_object(src, info)
+                        files[info.filename] = {"sha256": member_sha256, "size": info.file_size, "crc32": info.CRC}
+                        if new:
+                            added += 1
+                            added_bytes += info.file_size
+                trace.update(members=len(files), added=added, bytes=added_bytes)
+
+            tree = {"version": version, "archive": Path(zip_path).name, "archive_sha256": sha256, "files": files}
+            self.tree_path(version).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.tree_path(version).with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(tree, f)
+            os.replace(tmp_path, self.tree_path(version))
+        print(f"Added {added} new file(s) to the store, {len(files) - added} were already stored.")
+        return tree
+
+    def materialize(self, version: str, destination, reflink: bool = True):
+        """
+        Builds a workspace for an imported version out of links to the store.
+
+        Files matching `COPY_PATTERNS` are copied so Experience Builder can modify them. Every other
+        file is reflinked or hardlinked, falling back to a copy if the destination is on another file
+        system. Files already linked to the right object, and copied files whose content still matches,
+        are left alone, so re-running over an existing workspace only replaces what changed. An
+        extraction manifest is written so `verify` works on the workspace.
+
+        Args:
+            version (str): The imported version.
+            destination (str or Path): The workspace directory.
+            reflink (bool, optional): Try copy-on-write clones before hardlinks. Defaults to True.
+
+        Returns:
+            MaterializeResult: Counts of linked, copied and skipped files.
+
+        Raises:
+            KeyError: If the version has not been imported.
+        """
+        from exb_dev_cli.utils.extract import file_matches
+
+        tree = self.load_tree(version)
+        if tree is None:
+            raise KeyError(f"Experience Builder {version} has not been imported into the store.")
+        destination = Path(destination)
+        result = MaterializeResult()
+        use_reflink, use_hardlink = reflink, True
+
+        with span("store materialize", "store", version=version) as trace:
+            for name, meta in tree["files"].items():
+                target = member_path(destination, name)
+                source = self.object_path(meta["sha256"])
+                copy = is_copied(name)
+                if copy:
+                    if file_matches(target, meta["size"], meta["crc32"]):
+                        result.skipped += 1
+                        continue
+                elif _same_file(target, os.stat(source)):
+                    result.skipped += 1
+                    continue
+
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.with_name(f".{target.name}.exb-tmp")
+                linked = False
+                if not copy and use_reflink:
+                    try:
+                        _reflink(source, tmp_path)
+                        linked = True
+                    except OSError:
+                        use_reflink = False
+                if not copy and not linked and use_hardlink:
+                    try:
+                        os.link(source, tmp_path)
+                        linked = True
+                    except OSError:
+                        use_hardlink = False
+                if not linked:
+                    shutil.copyfile(source, tmp_path)
+                    os.chmod(tmp_path, 0o644 | (os.stat(source).st_mode & 0o111))
+                    result.copied += 1
+                    result.bytes_copied += meta["size"]
+                else:
+                    result.linked += 1
+                os.replace(tmp_path, target)
+
+            manifest = {
+                "archive": tree["archive"],
+                "files": {name: {"size": meta["size"], "crc32": meta["crc32"]} for name, meta in tree["files"].items()},
+            }
+            with open(destination / MANIFEST_NAME, "w") as f:
+                json.dump(manifest, f)
+            trace.update(linked=result.linked, copied=result.copied, skipped=result.skipped, bytes=result.bytes_copied)
+        return result
+
+    def remove_version(self, version: str):
+        """
+        Forgets an imported version. Its objects are removed by the next `gc`.
+
+        Args:
+            version (str): The version to remove.
+        """
+        self.tree_path(version).unlink(missing_ok=True)
+
+    def gc(self):
+        """
+        Deletes objects that no imported version refers to and no workspace links to.
+
+        Returns:
+            (int, int): The number of objects removed and the bytes freed.
+        """
+        removed = freed = 0
+        objects_dir = self.root / "objects"
+        if not objects_dir.is_dir():
+            return removed, freed
+        with file_lock(self.root / "locks" / "gc.lock"):
+            # Read under the lock, so an import that finishes meanwhile cannot add objects missing from this set
+            referenced = set()
+            for version in self.versions():
+                referenced.update(meta["sha256"] for meta in self.load_tree(version)["files"].values())
+            for shard in os.scandir(objects_dir):
+                for entry in os.scandir(shard.path):
+                    st = entry.stat(follow_symlinks=False)
+                    if entry.name in referenced or st.st_nlink > 1:
+                        continue
+                    os.chmod(entry.path, stat.S_IWUSR | stat.S_IRUSR)
+                    os.unlink(entry.path)
+                    removed += 1
+                    freed += st.st_size
+        return removed, freed
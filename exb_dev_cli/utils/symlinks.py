@@ -1,20 +1,27 @@
+import os
+import shlex
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 import platform
 
+from exb_dev_cli.utils.tracing import span
+
 
 def create_symlink(target: Path, link: Path):
     """
     Create a symbolic link with elevated privileges if necessary.
     """
-    try:
-        link.symlink_to(target)
-        print(f"Symlink created: {link} -> {target}")
-    except PermissionError:
-        # If permission error, attempt elevation
-        print("Admin privileges required to create the symlink.")
-        _create_symlink_with_elevation(target, link)
+    with span("symlink", "symlink", link=str(link), target=str(target)) as trace:
+        try:
+            link.symlink_to(target)
+            print(f"Symlink created: {link} -> {target}")
+        except PermissionError:
+            # If permission error, attempt elevation
+            print("Admin privileges required to create the symlink.")
+            trace["elevated"] = True
+            _create_symlink_with_elevation(target, link)
 
 
 def _create_symlink_with_elevation(target: Path, link: Path):
@@ -44,3 +51,365 @@ def _create_symlink_with_elevation(target: Path, link: Path):
         print(f"Symlink created with elevated privileges: {link} -> {target}")
     except subprocess.CalledProcessError as e:
         print(f"Failed to create symlink with elevated privileges. Error: {e}")
+
+
+def create_symlinks_to_experience_builder(app_repo_path, exb_install_path, app_id=None):
+    """
+    Link a cloned application repo into an Experience Builder installation.
+
+    The repo's `Widgets` folder is linked as `client/<app>_widgets` and its `AppConfig` folder as
+    `server/public/apps/<app_id>`. Links that already point at the right place are left alone and
+    stale or broken ones are replaced.
+
+    Args:
+        app_repo_path (str or Path): The path to the cloned application repo.
+        exb_install_path (str or Path): The path to the Experience Builder installation.
+        app_id (str, optional): The app folder name under `server/public/apps`. Defaults to the repo folder name.
+    """
+    app_repo_path = Path(app_repo_path).resolve()
+    desired = plan_links(exb_install_path, [(app_repo_path.name, app_repo_path, app_id)])
+    apply_links(diff_links(desired))
+
+
+# Link states reported by diff_links
+LINK_OK = "ok"
+LINK_CREATE = "create"
+LINK_REPLACE = "replace"
+LINK_CONFLICT = "conflict"
+
+
+class LinkChange:
+    """
+    Class to describe how one desired symlink compares with the filesystem.
+
+    Attributes:
+        link (Path): The symlink path inside the Experience Builder installation.
+        target (Path): The path the symlink should point at.
+        state (str): LINK_OK, LINK_CREATE, LINK_REPLACE (stale or broken link) or LINK_CONFLICT
+            (a real file or folder is in the way and is never touched).
+        current (str): The current link target for LINK_REPLACE, otherwise None.
+    """
+
+    def __init__(self, link: Path, target: Path, state: str, current: str = None):
+        self.link = link
+        self.target = target
+        self.state = state
+        self.current = current
+
+    def describe(self):
+        """Returns a one-line, diff-style description of the change."""
+        if self.state == LINK_CREATE:
+            return f"+ {self.link} -> {self.target}"
+        if self.state == LINK_REPLACE:
+            return f"~ {self.link} -> {self.target} (was {self.current})"
+        if self.state == LINK_CONFLICT:
+            return f"! {self.link} exists and is not a symlink, skipped"
+        return f"= {self.link}"
+
+
+def plan_links(exb_install_path, apps, core_widgets_path=None, used_widgets=None, used_core_widgets=None):
+    """
+    Build the desired set of symlinks for apps and core widgets.
+
+    Widget folders are normally linked whole. When the widgets an app uses are given, its
+    `client/<app>_widgets` becomes a real folder holding one link per used widget instead, so the
+    Experience Builder dev server only builds and watches those.
+
+    Args:
+        exb_install_path (str or Path): The path to the Experience Builder installation.
+        apps (list): (app_name, app_repo_path, app_id) tuples. `app_id` may be None to use the app name.
+        core_widgets_path (str or Path, optional): The cloned core widgets repo. Defaults to None.
+        used_widgets (dict, optional): Maps app names to the widget folder names to link. Apps missing
+            from it have their whole `Widgets` folder linked. Defaults to None.
+        used_core_widgets (list, optional): The core widget folder names to link. Defaults to None,
+            which links the whole core widgets repo.
+
+    Returns:
+        dict: Maps each link path to its target path. Targets that do not exist are left out.
+    """
+    exb_install_path = Path(exb_install_path)
+    client = exb_install_path / "client"
+    apps_dir = exb_install_path / "server" / "public" / "apps"
+
+    desired = {}
+    for app_name, app_repo_path, app_id in apps:
+        app_repo_path = Path(app_repo_path).resolve()
+        if (app_repo_path / "Widgets").is_dir():
+            if used_widgets is not None and app_name in used_widgets:
+                for widget in used_widgets[app_name]:
+                    desired[client / f"{app_name}_widgets" / widget] = app_repo_path / "Widgets" / widget
+            else:
+                desired[client / f"{app_name}_widgets"] = app_repo_path / "Widgets"
+        if (app_repo_path / "AppConfig").is_dir():
+            desired[apps_dir / str(app_id or app_name)] = app_repo_path / "AppConfig"
+
+    if core_widgets_path and Path(core_widgets_path).is_dir():
+        core_widgets_path = Path(core_widgets_path).resolve()
+        if used_core_widgets is not None:
+            for widget in used_core_widgets:
+                desired[client / "pc_core_widgets" / widget] = core_widgets_path / widget
+        else:
+            desired[client / "pc_core_widgets"] = core_widgets_path
+
+    return desired
+
+
+def prepare_link_layout(exb_install_path, desired, per_widget_dirs=(), dry_run=False, remove_copies=False):
+    """
+    Clears the way when switching a widgets folder between whole and per-widget links.
+
+    A widgets folder that is about to hold per-widget links must not itself be a link, and its links
+    to widgets that are no longer used are removed. A folder holding only per-widget links that is
+    about to be linked whole is removed. Real files are never touched, except copied widget folders
+    when `remove_copies` is set.
+
+    Args:
+        exb_install_path (str or Path): The path to the Experience Builder installation.
+        desired (dict): Maps link paths to target paths, as returned by `plan_links`.
+        per_widget_dirs (list, optional): The widgets folders linked per widget, e.g. `client/<app>_widgets`.
+            Defaults to none.
+        dry_run (bool, optional): Only print the changes. Defaults to False.
+        remove_copies (bool, optional): Also remove copied widget folders that are no longer used,
+            for the copy mode. Defaults to False.
+
+    Returns:
+        list: The paths that were (or would be) removed.
+    """
+    import shutil
+
+    client = Path(exb_install_path) / "client"
+    removed = []
+
+    def remove(path, description):
+        print(f"- {path} ({description})")
+        removed.append(path)
+        if dry_run:
+            return
+        if path.is_symlink() or not path.is_dir():
+            path.unlink()
+        else:
+            shutil.rmtree(path)
+
+    for folder in sorted(Path(folder) for folder in per_widget_dirs):
+        if folder.is_symlink():
+            remove(folder, "replaced by per-widget links")
+            continue
+        try:
+            with os.scandir(folder) as entries:
+                children = [(Path(entry.path), entry.is_symlink()) for entry in entries]
+        except FileNotFoundError:
+            continue
+        for child, is_link in sorted(children):
+            if child in desired:
+                continue
+            if is_link:
+                remove(child, "widget no longer used")
+            elif remove_copies and child.is_dir():
+                remove(child, "copied widget no longer used")
+
+    for link in sorted(desired):
+        link = Path(link)
+        if link.parent != client or link.is_symlink() or not link.is_dir():
+            continue
+        with os.scandir(link) as entries:
+            children = list(entries)
+        if all(entry.is_symlink() for entry in children):
+            for entry in children:
+                if not dry_run:
+                    os.unlink(entry.path)
+            remove(link, "replaced by a link to the whole folder")
+
+    return removed
+
+
+def diff_links(desired):
+    """
+    Compare the desired links with the filesystem.
+
+    Each parent directory is read with a single `os.scandir` pass rather than probing every link.
+
+    Args:
+        desired (dict): Maps link paths to target paths, as returned by `plan_links`.
+
+    Returns:
+        list: A LinkChange per desired link, sorted by link path.
+    """
+    by_parent = {}
+    for link, target in desired.items():
+        by_parent.setdefault(Path(link).parent, {})[Path(link).name] = (Path(link), Path(target))
+
+    changes = []
+    for parent, wanted in by_parent.items():
+        existing = {}
+        try:
+            with os.scandir(parent) as entries:
+                for entry in entries:
+                    if entry.name in wanted:
+                        existing[entry.name] = entry.is_symlink()
+        except FileNotFoundError:
+            pass
+
+        for name, (link, target) in wanted.items():
+            if name not in existing:
+                changes.append(LinkChange(link, target, LINK_CREATE))
+                continue
+            if not existing[name]:
+                changes.append(LinkChange(link, target, LINK_CONFLICT))
+                continue
+            current = os.readlink(link)
+            current_path = Path(current) if os.path.isabs(current) else link.parent / current
+            if os.path.normcase(os.path.abspath(current_path)) == os.path.normcase(os.path.abspath(target)) \
+                    and current_path.exists():
+                changes.append(LinkChange(link, target, LINK_OK))
+            else:
+                changes.append(LinkChange(link, target, LINK_REPLACE, current))
+
+    return sorted(changes, key=lambda change: str(change.link))
+
+
+def _make_link(link: Path, target: Path, replace: bool):
+    with span("symlink", "symlink", link=str(link), target=str(target), replace=replace):
+        if replace:
+            link.unlink()
+        link.parent.mkdir(parents=True, exist_ok=True)
+        os.symlink(target, link, target_is_directory=True)
+
+
+def _powershell_link_script(changes):
+    """Builds a PowerShell script that creates every link in `changes`."""
+    lines = []
+    for change in changes:
+        link = str(change.link).replace("'", "''")
+        target = str(change.target).replace("'", "''")
+        if change.state == LINK_REPLACE:
+            lines.append(f"Remove-Item -LiteralPath '{link}' -Force")
+        lines.append(f"New-Item -ItemType SymbolicLink -Path '{link}' -Target '{target}' | Out-Null")
+    return "\n".join(lines) + "\n"
+
+
+def _run_elevated_batch(changes):
+    """
+    Create every link in `changes` with a single elevated process, platform-specific.
+    """
+    system = platform.system()
+
+    if system == "Windows":
+        # Write all links to one script so UAC prompts only once
+        with tempfile.NamedTemporaryFile("w", suffix=".ps1", delete=False) as f:
+            f.write(_powershell_link_script(changes))
+            script_path = f.name
+        command = (
+            f'powershell -Command "Start-Process powershell -Wait -Verb RunAs '
+            f'-ArgumentList \'-NoProfile\', \'-ExecutionPolicy\', \'Bypass\', \'-File\', \'{script_path}\'"'
+        )
+        try:
+            subprocess.run(command, shell=True, check=True)
+        finally:
+            os.unlink(script_path)
+    elif system in ["Linux", "Darwin"]:
+        script = " && ".join(
+            f"ln -sfn {shlex.quote(str(change.target))} {shlex.quote(str(change.link))}" for change in changes
+        )
+        subprocess.run(["sudo", "sh", "-c", script], check=True)
+    else:
+        raise NotImplementedError(f"Unsupported OS: {system}")
+
+
+def elevate_links(changes):
+    """
+    Creates links that failed with a permission error, all in one elevated process.
+
+    Args:
+        changes (list): LinkChange instances collected by `apply_links`.
+    """
+    if not changes:
+        return
+    print(f"Admin privileges required to create {len(changes)} symlink(s), requesting elevation once.")
+    for change in changes:
+        change.link.parent.mkdir(parents=True, exist_ok=True)
+    with span("symlink elevation", "symlink", links=len(changes)):
+        _run_elevated_batch(changes)
+
+
+def apply_links(changes, dry_run=False, privileged=None):
+    """
+    Create missing links and replace stale or broken ones.
+
+    Links are first created with the current privileges. Any that fail with a permission error are
+    created together in one elevated batch, so a full setup prompts for elevation at most once. Callers
+    that apply links in several passes pass a `privileged` list to collect them instead, and hand it
+    to `elevate_links` once at the end.
+
+    Args:
+        changes (list): LinkChange instances from `diff_links`.
+        dry_run (bool, optional): Only print the changes. Defaults to False.
+        privileged (list, optional): Collects the changes that need elevation instead of elevating
+            right away. Defaults to None.
+
+    Returns:
+        list: The LinkChange instances that were (or, for a dry run, would be) applied.
+    """
+    pending = [c for c in changes if c.state in (LINK_CREATE, LINK_REPLACE)]
+    for change in changes:
+        if change.state != LINK_OK:
+            print(change.describe())
+    if dry_run or not pending:
+        return pending
+
+    needs_elevation = []
+    for change in pending:
+        try:
+            _make_link(change.link, change.target, change.state == LINK_REPLACE)
+        except PermissionError:
+            needs_elevation.append(change)
+        except OSError as e:
+            # ERROR_PRIVILEGE_NOT_HELD on Windows without Developer Mode
+            if getattr(e, "winerror", None) == 1314:
+                needs_elevation.append(change)
+            else:
+                raise
+
+    if privileged is not None:
+        privileged.extend(needs_elevation)
+    else:
+        elevate_links(needs_elevation)
+
+    return pending
+
+
+def release_links(paths, remove_copies=False):
+    """
+    Removes the links an app was given in an Experience Builder installation.
+
+    Symlinks are unlinked without touching their targets, and folders holding only per-widget links
+    are emptied and removed. Real folders are copies made by the copy mode, or work of someone else;
+    they are left in place unless `remove_copies` is set, in which case they are returned so the
+    caller can delete them.
+
+    Args:
+        paths (list): Link paths such as `client/<app>_widgets` and `server/public/apps/<app_id>`.
+        remove_copies (bool, optional): Return real folders for deletion instead of leaving them. Defaults to False.
+
+    Returns:
+        list: The real folders to delete.
+    """
+    copies = []
+    for path in map(Path, paths):
+        if path.is_symlink():
+            path.unlink()
+            print(f"Removed link {path}")
+            continue
+        if not path.is_dir():
+            continue
+        with os.scandir(path) as entries:
+            children = list(entries)
+        if all(entry.is_symlink() for entry in children):
+            for entry in children:
+                os.unlink(entry.path)
+            path.rmdir()
+            print(f"Removed {len(children)} widget link(s) in {path}")
+        elif remove_copies:
+            copies.append(path)
+        else:
+            print(f"{path} is not a link, left in place.")
+    return copies
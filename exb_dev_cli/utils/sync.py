@@ -0,0 +1,221 @@
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from exb_dev_cli.utils.git import run_git
+
+
+class SyncResult:
+    """
+    Class to record what `sync` did to a single repository.
+
+    Attributes:
+        name (str): The name of the application or core widgets repo.
+        destination (Path): The repo's working tree.
+        action (str): One of `cloned`, `updated`, `up-to-date`, `ahead`, `diverged`, `dirty`,
+            `no-upstream`, `unshallowed` or `failed`.
+        detail (str): Extra information, such as the number of new commits or the error message.
+    """
+
+    def __init__(self, name: str, destination: Path, action: str, detail: str = ""):
+        self.name = name
+        self.destination = destination
+        self.action = action
+        self.detail = detail
+
+
+def _git_output(args, cwd):
+    return run_git(args, cwd=cwd, capture_output=True).stdout.strip()
+
+
+def is_dirty(repo_path):
+    """
+    Checks whether a working tree has uncommitted changes.
+
+    Args:
+        repo_path (Path): The repo's working tree.
+
+    Returns:
+        bool: True if `git status --porcelain` reports any change, including untracked files.
+    """
+    return bool(_git_output(['status', '--porcelain'], repo_path))
+
+
+def ahead_behind(repo_path):
+    """
+    Counts commits between HEAD and its upstream branch.
+
+    Args:
+        repo_path (Path): The repo's working tree.
+
+    Returns:
+        (int, int): Commits ahead of and behind the upstream, or None if there is no upstream.
+    """
+    result = run_git(['rev-list', '--left-right', '--count', 'HEAD...@{u}'], cwd=repo_path,
+                     check=False, capture_output=True)
+    if result.returncode != 0:
+        return None
+    ahead, behind = result.stdout.split()
+    return int(ahead), int(behind)
+
+
+def unpushed_commits(repo_path):
+    """
+    Counts commits on local branches or HEAD that no remote-tracking branch contains.
+
+    Args:
+        repo_path (Path): The repo's working tree.
+
+    Returns:
+        int: The number of commits that exist only in this clone.
+    """
+    result = run_git(['rev-list', '--count', 'HEAD', '--branches', '--not', '--remotes'], cwd=repo_path,
+                     check=False, capture_output=True)
+    return int(result.stdout.strip()) if result.returncode == 0 else 0
+
+
+def is_shallow(repo_path):
+    """Returns True if a repo was cloned with limited history."""
+    return (Path(repo_path) / ".git" / "shallow").exists()
+
+
+def is_partial(repo_path):
+    """Returns True if a repo was cloned with a blob filter and fetches missing objects on demand."""
+    result = run_git(['config', '--get', 'remote.origin.promisor'], cwd=repo_path, check=False, capture_output=True)
+    return result.stdout.strip() == "true"
+
+
+def fetch(repo_path, repo_url, mirrors=None):
+    """
+    Updates the remote-tracking branches of a repo.
+
+    With a mirror cache the mirror is refreshed first and the repo fetches from it locally. Shallow and
+    partial clones always fetch from their remote, so they keep their depth and blob filter.
+
+    Args:
+        repo_path (Path): The repo's working tree.
+        repo_url (str): The URL of the Git repository.
+        mirrors (MirrorCache, optional): The mirror cache to fetch through. Defaults to None.
+    """
+    if mirrors and not is_shallow(repo_path) and not is_partial(repo_path):
+        mirror = mirrors.ensure_mirror(repo_url, quiet=True)
+        run_git(['fetch', '--prune', mirror, '+refs/heads/*:refs/remotes/origin/*'], cwd=repo_path, capture_output=True)
+    else:
+        run_git(['fetch', '--prune', 'origin'], cwd=repo_path, capture_output=True)
+
+
+def sync_repo(name, repo_url, destination, clone_func, mirrors=None):
+    """
+    Brings a single repository up to date without re-cloning it.
+
+    Missing repos are cloned. Repos with uncommitted changes are left alone. Otherwise the repo is
+    fetched and fast-forwarded if it is strictly behind its upstream.
+
+    Args:
+        name (str): The name of the application or core widgets repo.
+        repo_url (str): The URL of the Git repository.
+        destination (Path): The repo's working tree.
+        clone_func (callable): Called as `clone_func(repo_url, destination, None, quiet=True)` for missing repos.
+        mirrors (MirrorCache, optional): The mirror cache to fetch through. Defaults to None.
+
+    Returns:
+        SyncResult: What was done.
+    """
+    destination = Path(destination)
+    try:
+        if not (destination / ".git").exists():
+            if destination.exists() and any(destination.iterdir()):
+                return SyncResult(name, destination, "failed", "destination exists but is not a git repository")
+            clone_func(repo_url, destination, None, quiet=True)
+            return SyncResult(name, destination, "cloned")
+
+        if is_dirty(destination):
+            return SyncResult(name, destination, "dirty", "uncommitted changes, skipped")
+
+        fetch(destination, repo_url, mirrors)
+        counts = ahead_behind(destination)
+        if counts is None:
+            return SyncResult(name, destination, "no-upstream", "current branch has no upstream")
+
+        ahead, behind = counts
+        if ahead and behind:
+            return SyncResult(name, destination, "diverged", f"{ahead} ahead, {behind} behind")
+        if ahead:
+            return SyncResult(name, destination, "ahead", f"{ahead} commit(s) not pushed")
+        if behind:
+            run_git(['merge', '--ff-only', '@{u}'], cwd=destination, capture_output=True)
+            return SyncResult(name, destination, "updated", f"fast-forwarded {behind} commit(s)")
+        return SyncResult(name, destination, "up-to-date")
+    except subprocess.CalledProcessError as e:
+        message = (e.stderr or str(e)).strip().splitlines()
+        return SyncResult(name, destination, "failed", message[-1] if message else str(e))
+
+
+def unshallow_repo(name, destination, full=False):
+    """
+    Fetches the full history of a repo cloned with a clone profile.
+
+    Args:
+        name (str): The name of the application or core widgets repo.
+        destination (Path): The repo's working tree.
+        full (bool, optional): Also fetch every blob, stop filtering and check out every folder. Defaults to False.
+
+    Returns:
+        SyncResult: `unshallowed` if anything was fetched or changed, otherwise `up-to-date`.
+    """
+    destination = Path(destination)
+    done = []
+    try:
+        if not (destination / ".git").exists():
+            return SyncResult(name, destination, "failed", "not cloned")
+        if is_shallow(destination):
+            # Shallow clones only track the cloned branch; track them all again along with the history
+            run_git(['config', 'remote.origin.fetch', '+refs/heads/*:refs/remotes/origin/*'], cwd=destination)
+            run_git(['fetch', '--unshallow', 'origin'], cwd=destination, capture_output=True)
+            done.append("fetched full history")
+        if full and is_partial(destination):
+            run_git(['config', '--unset', 'remote.origin.partialclonefilter'], cwd=destination, check=False)
+            run_git(['config', 'remote.origin.promisor', 'false'], cwd=destination)
+            run_git(['fetch', '--refetch', 'origin'], cwd=destination, capture_output=True)
+            done.append("fetched all files")
+        if full and (destination / ".git" / "info" / "sparse-checkout").exists():
+            run_git(['sparse-checkout', 'disable'], cwd=destination, capture_output=True)
+            done.append("checked out every folder")
+    except subprocess.CalledProcessError as e:
+        message = (e.stderr or str(e)).strip().splitlines()
+        return SyncResult(name, destination, "failed", message[-1] if message else str(e))
+    if not done:
+        return SyncResult(name, destination, "up-to-date", "already a full clone" if full else "already has full history")
+    return SyncResult(name, destination, "unshallowed", ", ".join(done))
+
+
+def sync_repos(repos, clone_func, jobs=4, mirrors=None):
+    """
+    Syncs several repositories in parallel.
+
+    Args:
+        repos (list): (name, repo_url, destination) tuples.
+        clone_func (callable): Used to clone repos that are missing.
+        jobs (int, optional): Maximum number of repos to sync at once. Defaults to 4.
+        mirrors (MirrorCache, optional): The mirror cache to fetch through. Defaults to None.
+
+    Returns:
+        list: A SyncResult per repository, in the same order as `repos`.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [executor.submit(sync_repo, name, url, dest, clone_func, mirrors) for name, url, dest in repos]
+        return [future.result() for future in futures]
+
+
+def print_sync_summary(results):
+    """
+    Prints one line per synced repository.
+
+    Args:
+        results (list): SyncResult instances returned by `sync_repos`.
+    """
+    if not results:
+        return
+    name_width = max(len(r.name) for r in results)
+    for r in results:
+        print(f"{r.name:<{name_width}}  {r.action:<11}  {r.detail}".rstrip())
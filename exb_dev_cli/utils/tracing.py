@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+_tracer = None
+
+
+class Tracer:
+    """
+    Class to collect timing spans in Chrome trace event format.
+
+    Each span becomes a complete (`"ph": "X"`) event with its start, duration, thread and any
+    arguments recorded while it was open. Nesting is implied by time ranges on the same thread,
+    which is how Chrome's trace viewer and Perfetto display it.
+
+    Attributes:
+        events (list): The recorded trace events.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        """
+        Records a span around a `with` block.
+
+        Args:
+            name (str): The span name, e.g. `git clone`.
+            category (str): The phase the span belongs to, e.g. `download` or `git`.
+            **args: Arguments stored on the event. More can be added to the yielded dict inside the block.
+
+        Yields:
+            dict: The span's arguments, for recording results such as byte counts or exit codes.
+        """
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args.setdefault("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def write(self, path):
+        """
+        Writes the trace to a file.
+
+        Files ending in `.jsonl` get one event per line; anything else gets a Chrome trace JSON object
+        that can be opened in `chrome://tracing` or https://ui.perfetto.dev.
+
+        Args:
+            path (str or Path): The output file.
+        """
+        events = sorted(self.events, key=lambda e: e["ts"])
+        with open(path, "w") as f:
+            if str(path).endswith(".jsonl"):
+                for event in events:
+                    f.write(json.dumps(event, default=str) + "\n")
+            else:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def summary(self):
+        """
+        Summarizes where the time went, by category and span name.
+
+        Returns:
+            str: A short table of total time, call count and any byte totals per span name.
+        """
+        totals = {}
+        for event in self.events:
+            key = (event["cat"], event["name"])
+            total = totals.setdefault(key, {"dur": 0.0, "count": 0, "bytes": 0})
+            total["dur"] += event["dur"]
+            total["count"] += 1
+            total["bytes"] += event["args"].get("bytes", 0) or 0
+
+        if not totals:
+            return "No spans were recorded."
+        width = max(len(f"{cat}: {name}") for cat, name in totals)
+        lines = [f"{'Span':<{width}}  {'Total':>9}  {'Calls':>5}  Throughput"]
+        for (cat, name), total in sorted(totals.items(), key=lambda item: item[1]["dur"], reverse=True):
+            seconds = total["dur"] / 1e6
+            throughput = ""
+            if total["bytes"] and seconds > 0:
+                throughput = f"{total['bytes'] / seconds / 1024 ** 2:.1f} MiB/s"
+            lines.append(f"{cat + ': ' + name:<{width}}  {seconds:>8.2f}s  {total['count']:>5}  {throughput}".rstrip())
+        return "\n".join(lines)
+
+
+class _NullSpan:
+    """Stand-in returned by `span` when tracing is off, so instrumented code pays almost nothing."""
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, category: str, **args):
+    """
+    Records a span on the active tracer, or does nothing if tracing is off.
+
+    Args:
+        name (str): The span name.
+        category (str): The phase the span belongs to.
+        **args: Arguments stored on the event.
+
+    Returns:
+        A context manager yielding the span's argument dict.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, category, **args)
+
+
+def tracing_enabled():
+    """Returns True if a tracer is active."""
+    return _tracer is not None
+
+
+def start_tracing():
+    """
+    Starts collecting spans in a new global tracer.
+
+    Returns:
+        Tracer: The active tracer.
+    """
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing(path=None):
+    """
+    Stops tracing, optionally writing the trace to a file.
+
+    Args:
+        path (str or Path, optional): Where to write the trace. Defaults to None.
+
+    Returns:
+        Tracer: The tracer that was active, or None.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and path:
+        tracer.write(Path(path))
+    return tracer
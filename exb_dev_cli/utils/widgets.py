@@ -0,0 +1,261 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from exb_dev_cli.utils.cache import default_cache_dir
+from exb_dev_cli.utils.tracing import span
+
+
+WIDGET_INDEX_NAME = "widget-index.json"
+
+
+def widget_refs(config):
+    """
+    Lists the widgets an Experience Builder app config uses.
+
+    Each entry of the config's `widgets` object names its widget through `manifest.name`, or failing
+    that through the last folder of its `uri` (e.g. `widgets/my-widget/`).
+
+    Args:
+        config (dict): A parsed `AppConfig/config.json`.
+
+    Returns:
+        list: The sorted widget names.
+    """
+    names = set()
+    widgets = config.get("widgets") if isinstance(config, dict) else None
+    for widget in (widgets or {}).values():
+        if not isinstance(widget, dict):
+            continue
+        manifest = widget.get("manifest")
+        if isinstance(manifest, dict) and manifest.get("name"):
+            names.add(manifest["name"])
+        elif widget.get("uri"):
+            names.add(widget["uri"].rstrip("/").rsplit("/", 1)[-1])
+    return sorted(names)
+
+
+def manifest_widget_name(manifest, folder_name):
+    """Returns the name a widget is referenced by: its manifest `name`, or its folder name."""
+    if isinstance(manifest, dict) and isinstance(manifest.get("name"), str) and manifest["name"]:
+        return manifest["name"]
+    return folder_name
+
+
+class WidgetIndexCache:
+    """
+    Class to remember what was read from each config and manifest between runs, keyed on file mtime and size.
+
+    Attributes:
+        path (Path): The cache file.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else default_cache_dir() / WIDGET_INDEX_NAME
+        try:
+            with open(self.path, "r") as f:
+                self._entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def read(self, path, summarize):
+        """
+        Returns the summary of a JSON file, parsing it only if it changed since it was last read.
+
+        Args:
+            path (Path): The JSON file.
+            summarize (callable): Reduces the parsed JSON to what the index keeps.
+
+        Returns:
+            The summary, or None if the file is missing or not valid JSON.
+        """
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = [st.st_mtime_ns, st.st_size]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry["stamp"] == stamp:
+                self.hits += 1
+                return entry["summary"]
+            self.misses += 1
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                summary = summarize(json.load(f))
+        except (OSError, ValueError):
+            summary = None
+        with self._lock:
+            self._entries[key] = {"stamp": stamp, "summary": summary}
+        return summary
+
+    def save(self):
+        """Writes the cache file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per thread too, since several threads may save their own instance at once
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+
+def _widget_folders(root):
+    """Returns the subfolders of a widgets folder that have a `manifest.json`."""
+    try:
+        with os.scandir(root) as entries:
+            return sorted(Path(entry.path) for entry in entries
+                          if entry.is_dir() and (Path(entry.path) / "manifest.json").is_file())
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+class WidgetIndex:
+    """
+    Class to map each app to the widget folders its config uses.
+
+    Attributes:
+        refs (dict): Maps app names to the widget names their `AppConfig/config.json` uses.
+        widgets (dict): Maps each widget source (an app name, or the core widgets name) to a dict from
+            widget name to widget folder.
+        core_name (str): The source name of the core widgets, or None if they are not indexed.
+    """
+
+    def __init__(self):
+        self.refs = {}
+        self.widgets = {}
+        self.core_name = None
+
+    @classmethod
+    def build(cls, apps, core_widgets=None, jobs=8, cache=None):
+        """
+        Indexes the app configs and widget manifests of several repos, reading the files in parallel.
+
+        Args:
+            apps (list): (app_name, app_repo_path) tuples.
+            core_widgets (tuple, optional): (name, repo_path) of the core widgets repo. Defaults to None.
+            jobs (int, optional): Maximum number of files read at once. Defaults to 8.
+            cache (WidgetIndexCache, optional): The cache to use. Defaults to the user's default cache.
+
+        Returns:
+            WidgetIndex: The index.
+        """
+        cache = cache or WidgetIndexCache()
+        index = cls()
+        sources = [(name, Path(repo_path) / "Widgets") for name, repo_path in apps]
+        if core_widgets:
+            index.core_name = core_widgets[0]
+            sources.append((core_widgets[0], Path(core_widgets[1])))
+
+        with span("widget index", "widgets", apps=len(apps)) as trace:
+            folders = {name: _widget_folders(root) for name, root in sources}
+            reads = [("config", name, Path(repo_path) / "AppConfig" / "config.json", widget_refs)
+                     for name, repo_path in apps]
+            for name, widget_folders in folders.items():
+                reads += [("manifest", name, folder / "manifest.json",
+                           lambda manifest, folder_name=folder.name: manifest_widget_name(manifest, folder_name))
+                          for folder in widget_folders]
+
+            def read(item):
+                kind, name, path, summarize = item
+                return kind, name, path, cache.read(path, summarize)
+
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+                results = list(executor.map(read, reads))
+
+            for name, _ in sources:
+                index.widgets.setdefault(name, {})
+            for kind, name, path, summary in results:
+                if kind == "config":
+                    index.refs[name] = set(summary or [])
+                elif summary is not None:
+                    index.widgets[name][summary] = path.parent
+            cache.save()
+            trace.update(files=len(reads), parsed=cache.misses)
+        return index
+
+    def _find(self, source, widget_name):
+        """Returns the folder of a widget in a source, matching its manifest name or folder name."""
+        widgets = self.widgets.get(source, {})
+        if widget_name in widgets:
+            return widgets[widget_name]
+        for folder in widgets.values():
+            if folder.name == widget_name:
+                return folder
+        return None
+
+    def used_widgets(self, app_name):
+        """
+        Returns the folder names of the app's own widgets its config uses.
+
+        Args:
+            app_name (str): The app.
+
+        Returns:
+            list: Sorted widget folder names inside the app's `Widgets` folder.
+        """
+        folders = (self._find(app_name, name) for name in self.refs.get(app_name, ()))
+        return sorted({folder.name for folder in folders if folder is not None})
+
+    def used_core_widgets(self, app_names=None):
+        """
+        Returns the folder names of the core widgets that any of the apps use.
+
+        Args:
+            app_names (list, optional): The apps to consider. Defaults to every indexed app.
+
+        Returns:
+            list: Sorted widget folder names inside the core widgets repo.
+        """
+        if self.core_name is None:
+            return []
+        used = set()
+        for app_name in self.refs if app_names is None else app_names:
+            for name in self.refs.get(app_name, ()):
+                folder = self._find(self.core_name, name)
+                if folder is not None:
+                    used.add(folder.name)
+        return sorted(used)
+
+    def graph(self):
+        """
+        Returns the app to widget dependency graph.
+
+        Returns:
+            dict: Maps each app to a dict with the `app` widgets and `core` widgets it uses, and the
+            widget names it uses that no indexed repo provides (normally built-in widgets).
+        """
+        graph = {}
+        for app_name, refs in sorted(self.refs.items()):
+            core = self.used_core_widgets([app_name])
+            resolved = {name for name in refs if self._find(app_name, name) or
+                        (self.core_name and self._find(self.core_name, name))}
+            graph[app_name] = {
+                "app": self.used_widgets(app_name),
+                "core": core,
+                "other": sorted(refs - resolved),
+            }
+        return graph
+
+
+def print_widget_graph(index):
+    """
+    Prints which widgets each app uses and how many of its widgets would be linked.
+
+    Args:
+        index (WidgetIndex): The index to print.
+    """
+    for app_name, uses in index.graph().items():
+        available = len(index.widgets.get(app_name, {}))
+        print(f"{app_name}: {len(uses['app'])} of {available} app widget(s) used")
+        for name in uses["app"]:
+            print(f"  {name}")
+        for name in uses["core"]:
+            print(f"  {name} (core)")
+    if index.core_name is not None:
+        print(f"Core widgets: {len(index.used_core_widgets())} of {len(index.widgets[index.core_name])} used")
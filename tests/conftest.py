@@ -3,3 +3,35 @@ import os
 
 # Add the project root to PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import subprocess
+import pytest
+
+
+def _git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True)
+
+
+@pytest.fixture
+def make_git_repo(tmp_path):
+    """Fixture returning a factory that creates a local git repo with one commit and returns its `file://` URL."""
+    def factory(name, files=None):
+        repo = tmp_path / "origin" / name
+        repo.mkdir(parents=True)
+        _git("init", "-q", "-b", "main", cwd=repo)
+        for rel_path, content in (files or {"README.md": name}).items():
+            path = repo / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        _git("add", "-A", cwd=repo)
+        _git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "initial", cwd=repo)
+        return repo.as_uri()
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Fixture pointing the shared archive cache at a temporary directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("EXB_DEV_CLI_CACHE", str(cache_dir))
+    return cache_dir
@@ -0,0 +1,110 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ArchiveServer:
+    """
+    Local stand-in for the Esri download host, serving in-memory files over HTTP.
+
+    Attributes:
+        files (dict): Maps request paths (e.g. `/exb.zip`) to their bytes.
+        accept_ranges (bool): Whether `Range` requests are honoured and `Accept-Ranges` is advertised.
+        disconnect_after (int): If set, the next GET closes the connection after sending this many body bytes.
+        bytes_per_second (int): If set, throttles each response body to roughly this rate.
+        head_status (int): If set, HEAD requests are refused with this status.
+        requests (list): (method, path, Range header) for every request received.
+    """
+
+    def __init__(self, files, accept_ranges=True, disconnect_after=None, bytes_per_second=None, head_status=None):
+        self.files = files
+        self.accept_ranges = accept_ranges
+        self.disconnect_after = disconnect_after
+        self.bytes_per_second = bytes_per_second
+        self.head_status = head_status
+        self.requests = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, path):
+        """Returns the full URL of a served path."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                if server.head_status:
+                    server.requests.append((self.command, self.path, None))
+                    self.send_error(server.head_status)
+                    return
+                self._respond(send_body=False)
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def _respond(self, send_body):
+                range_header = self.headers.get("Range")
+                server.requests.append((self.command, self.path, range_header))
+                data = server.files.get(self.path)
+                if data is None:
+                    self.send_error(404)
+                    return
+
+                start, end = 0, len(data) - 1
+                status = 200
+                if range_header and server.accept_ranges:
+                    first, _, last = range_header.removeprefix("bytes=").partition("-")
+                    start = int(first)
+                    end = min(int(last), len(data) - 1) if last else len(data) - 1
+                    if start >= len(data):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(data)}")
+                        self.end_headers()
+                        return
+                    status = 206
+
+                body = data[start:end + 1]
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                if server.accept_ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                self.end_headers()
+                if not send_body:
+                    return
+
+                if server.disconnect_after is not None:
+                    cut = server.disconnect_after
+                    server.disconnect_after = None
+                    self.wfile.write(body[:cut])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self._write_body(body)
+
+            def _write_body(self, body):
+                if not server.bytes_per_second:
+                    self.wfile.write(body)
+                    return
+                block = max(1, server.bytes_per_second // 20)
+                for offset in range(0, len(body), block):
+                    self.wfile.write(body[offset:offset + block])
+                    time.sleep(0.05)
+
+        return Handler
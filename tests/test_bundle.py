@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import zipfile
+from pathlib import Path
+from urllib.request import url2pathname
+
+import pytest
+
+from exb_dev_cli.utils import app_manager
+from exb_dev_cli.utils.bundle import BUNDLE_MANIFEST_NAME, BundleError, read_manifest
+from exb_dev_cli.utils.lockfile import LOCK_FILE_NAME, Lockfile
+from tests.http_server import ArchiveServer
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def bundle(make_git_repo, tmp_path, monkeypatch):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("ArcGISExperienceBuilder/client/package.json", "{}")
+        zf.writestr("ArcGISExperienceBuilder/server/public/apps/0/config.json", "{}")
+    url = make_git_repo("app1", {"Widgets/w/manifest.json": "{}", "AppConfig/config.json": "{}"})
+    config_file = tmp_path / "work" / "applications.json"
+    config_file.parent.mkdir()
+    config_file.write_text(json.dumps({"Applications": {"app1": url}}))
+
+    with ArchiveServer({"/exb.zip": buffer.getvalue()}) as server:
+        versions = tmp_path / "versions.json"
+        versions.write_text(json.dumps({"Experience_Builder": {"v1.16": server.url("/exb.zip")}}))
+        monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+        work = config_file.parent
+        lock = Lockfile.for_config(config_file)
+        app_manager.setup_workspace("v1.16", config_file, work / "exb", work / "repos", use_mirrors=False, lock=lock)
+        output = tmp_path / "workspace.exbundle"
+        app_manager.export_workspace_bundle(config_file, output, repos_destination=work / "repos", lock=lock)
+        requests = len(server.requests)
+        yield output, Path(url2pathname(url[len("file://"):])), server, requests
+
+
+def test_import_provisions_workspace_offline(bundle, tmp_path, monkeypatch):
+    output, origin, server, requests = bundle
+    commit = git("rev-parse", "HEAD", cwd=origin)
+    manifest = read_manifest(output)
+    assert manifest["exb"]["version"] == "v1.16"
+    assert manifest["repos"]["app1"]["commit"] == commit
+    assert "client/app1_widgets" in manifest["links"]
+
+    # No remote, no cached archive: everything must come from the bundle
+    shutil.move(origin, tmp_path / "gone")
+    monkeypatch.setenv("EXB_DEV_CLI_CACHE", str(tmp_path / "fresh-cache"))
+    target = tmp_path / "offline"
+    app_manager.import_workspace_bundle(output, target / "applications.json", target / "exb", target / "repos")
+
+    assert len(server.requests) == requests
+    assert (target / "exb" / "ArcGISExperienceBuilder" / "client" / "package.json").is_file()
+    assert git("rev-parse", "HEAD", cwd=target / "repos" / "app1") == commit
+    assert git("remote", "get-url", "origin", cwd=target / "repos" / "app1") == origin.as_uri()
+    link = target / "exb" / "ArcGISExperienceBuilder" / "client" / "app1_widgets"
+    assert os.path.realpath(link) == os.path.realpath(target / "repos" / "app1" / "Widgets")
+    assert json.loads((target / "applications.json").read_text())["Applications"]["app1"] == origin.as_uri()
+    lock = json.loads((target / LOCK_FILE_NAME).read_text())
+    assert lock["repos"]["app1"]["commit"] == commit
+    assert lock["exb"]["sha256"] == manifest["exb"]["sha256"]
+
+
+def test_import_rejects_damaged_member(bundle, tmp_path):
+    output = bundle[0]
+    damaged = tmp_path / "damaged.exbundle"
+    with zipfile.ZipFile(output) as src, zipfile.ZipFile(damaged, "w") as dst:
+        for info in src.infolist():
+            data = b"not a git bundle" if info.filename == "repos/app1.bundle" else src.read(info)
+            dst.writestr(info, data)
+    assert BUNDLE_MANIFEST_NAME in zipfile.ZipFile(damaged).namelist()
+
+    target = tmp_path / "offline"
+    with pytest.raises(BundleError, match="repos/app1.bundle"):
+        app_manager.import_workspace_bundle(damaged, target / "applications.json", target / "exb", target / "repos")
+    assert not (target / "repos" / "app1").exists()
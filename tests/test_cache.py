@@ -0,0 +1,153 @@
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+import click.testing
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils import app_manager
+from exb_dev_cli.utils.cache import ArchiveCache, parse_size
+from tests.http_server import ArchiveServer
+
+
+def make_archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("ArcGISExperienceBuilder/client/package.json", "{}")
+    return buffer.getvalue()
+
+
+def add_entry(cache, tmp_path, version, size):
+    data = os.urandom(size)
+    path = tmp_path / f"{version}.download"
+    path.write_bytes(data)
+    return cache.add(version, f"http://example/{version}.zip", path, hashlib.sha256(data).hexdigest())
+
+
+def age_entries(cache, seconds):
+    index = json.loads(cache.index_path.read_text())
+    for entry in index.values():
+        entry["last_used"] -= seconds
+    cache.index_path.write_text(json.dumps(index))
+
+
+def test_repeat_install_skips_network(tmp_path, monkeypatch):
+    archive = make_archive()
+    with ArchiveServer({"/exb.zip": archive}) as server:
+        versions = tmp_path / "versions.json"
+        versions.write_text(json.dumps({"Experience_Builder": {"v1.16": server.url("/exb.zip")}}))
+        monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+
+        app_manager.install_experience_builder("v1.16", tmp_path / "ws1")
+        app_manager.install_experience_builder("v1.16", tmp_path / "ws2")
+
+    assert len([r for r in server.requests if r[0] == "GET"]) == 1
+    assert (tmp_path / "ws2" / "ArcGISExperienceBuilder" / "client" / "package.json").exists()
+    assert not list((tmp_path / "ws2").glob("*.zip"))
+    entries = ArchiveCache().entries()
+    assert entries[0]["version"] == "v1.16"
+    assert entries[0]["sha256"] == hashlib.sha256(archive).hexdigest()
+
+
+def test_lookup_by_content_hash(tmp_path):
+    cache = ArchiveCache(tmp_path / "c")
+    cached = add_entry(cache, tmp_path, "v1.16", 100)
+    digest = cached.stem
+
+    assert cache.lookup("v1.16", digest) == cached
+    assert cache.lookup("v1.16", "f" * 64) is None
+    assert cache.lookup("v1.17") is None
+
+
+def test_lookup_without_hash_requires_the_same_url(tmp_path):
+    cache = ArchiveCache(tmp_path / "c")
+    cached = add_entry(cache, tmp_path, "v1.16", 100)
+
+    assert cache.lookup("v1.16", url="http://example/v1.16.zip") == cached
+    assert cache.lookup("v1.16", url="http://example/moved/v1.16.zip") is None
+    assert not cache.contains("v1.16", url="http://example/moved/v1.16.zip")
+    assert cache.contains("v1.16", cached.stem, url="http://example/moved/v1.16.zip")
+
+
+def test_fetch_downloads_again_when_the_url_changed(tmp_path):
+    cache = ArchiveCache(tmp_path / "c")
+    add_entry(cache, tmp_path, "v1.16", 100)
+    archive = make_archive()
+
+    with ArchiveServer({"/exb.zip": archive}) as server:
+        fetched = cache.fetch("v1.16", server.url("/exb.zip"))
+
+    assert fetched.read_bytes() == archive
+    assert len(cache.entries()) == 2
+
+
+def test_fetch_does_not_resume_a_partial_download_from_another_url(tmp_path):
+    cache = ArchiveCache(tmp_path / "c")
+    archive = make_archive()
+
+    downloads = cache.root / "downloads"
+    downloads.mkdir(parents=True)
+    (downloads / "v1.16-0123456789abcdef.zip.part").write_bytes(b"start of an older build")
+
+    with ArchiveServer({"/exb.zip": archive}) as server:
+        fetched = cache.fetch("v1.16", server.url("/exb.zip"))
+
+    assert fetched.read_bytes() == archive
+    assert not list(downloads.glob("*.part"))
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = ArchiveCache(tmp_path / "c", max_bytes=250)
+    first = add_entry(cache, tmp_path, "v1", 100)
+    add_entry(cache, tmp_path, "v2", 100)
+    cache.lookup("v1")  # v1 is now the most recently used
+    age_entries(cache, 3600)
+    add_entry(cache, tmp_path, "v3", 100)
+
+    versions = {e["version"] for e in cache.entries()}
+    assert versions == {"v1", "v3"}
+    assert first.exists()
+
+
+def test_prune_all(tmp_path):
+    cache = ArchiveCache(tmp_path / "c")
+    add_entry(cache, tmp_path, "v1", 10)
+    add_entry(cache, tmp_path, "v2", 10)
+    age_entries(cache, 3600)
+
+    removed = cache.prune(0)
+
+    assert {e["version"] for e in removed} == {"v1", "v2"}
+    assert cache.entries() == []
+    assert not list(cache.archives_dir.iterdir())
+
+
+def test_recently_used_archives_are_not_evicted(tmp_path):
+    cache = ArchiveCache(tmp_path / "c", max_bytes=150)
+    first = add_entry(cache, tmp_path, "v1", 100)
+    add_entry(cache, tmp_path, "v2", 100)
+
+    assert first.exists()
+    assert cache.prune(0) == []
+    assert len(cache.prune(0, grace=0)) == 2
+
+
+def test_cache_list_and_prune_commands(tmp_path):
+    add_entry(ArchiveCache(), tmp_path, "v1.16", 10)
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(cli, ["cache", "list"])
+    assert "v1.16" in result.output
+
+    result = runner.invoke(cli, ["cache", "prune", "--all"])
+    assert "Pruned 1 archive(s)." in result.output
+    assert ArchiveCache().entries() == []
+
+
+def test_parse_size():
+    assert parse_size("500") == 500
+    assert parse_size("2K") == 2048
+    assert parse_size("1.5G") == int(1.5 * 1024 ** 3)
+    assert parse_size("10MiB") == 10 * 1024 ** 2
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["requests", "urllib3", "pytest", "concurrent.futures", "exb_dev_cli.utils.app_manager"]
+
+
+def test_cli_import_does_not_load_command_dependencies():
+    code = (
+        "import sys, exb_dev_cli.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+
+    assert result.stdout.strip() == ""
+
+
+def test_help_lists_commands():
+    result = subprocess.run(
+        [sys.executable, "-m", "exb_dev_cli.cli", "--help"], cwd=ROOT, check=True, capture_output=True, text=True
+    )
+
+    assert "install" in result.stdout and "clone" in result.stdout
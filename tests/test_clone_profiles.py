@@ -0,0 +1,75 @@
+import json
+import subprocess
+from pathlib import Path
+from urllib.request import url2pathname
+
+import click.testing
+import pytest
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils.config import ConfigError, clear_config_cache, entry_clone_profile, load_app_config
+from exb_dev_cli.utils.sync import is_partial, is_shallow
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                          cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def app_with_history(make_git_repo):
+    url = make_git_repo("app1", {
+        "Widgets/w/manifest.json": "{}",
+        "AppConfig/config.json": "{}",
+        "assets/big.bin": "x" * 100000,
+    })
+    origin = Path(url2pathname(url[len("file://"):]))
+    git("config", "uploadpack.allowFilter", "true", cwd=origin)
+    (origin / "Widgets" / "w" / "manifest.json").write_text('{"v": 2}')
+    git("commit", "-qam", "second", cwd=origin)
+    return url
+
+
+def test_clone_profile_shorthand_and_validation(tmp_path):
+    assert entry_clone_profile("https://example.com/a.git") is None
+    assert entry_clone_profile({"url": "u", "clone": "sparse"}) == {
+        "filter": "blob:none", "depth": 1, "sparse": ["Widgets", "AppConfig"]}
+    assert entry_clone_profile({"url": "u", "clone": {"depth": 5, "sparse": True}})["sparse"] == ["Widgets", "AppConfig"]
+
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {
+        "app1": {"url": "https://example.com/a.git", "clone": "tiny"},
+        "app2": {"url": "https://example.com/b.git", "clone": {"depth": 0, "sparse": "Widgets"}},
+    }}))
+    clear_config_cache()
+    with pytest.raises(ConfigError) as excinfo:
+        load_app_config(config_file)
+    message = str(excinfo.value)
+    assert "unknown clone profile 'tiny'" in message
+    assert "depth" in message and "sparse" in message
+
+
+def test_sparse_profile_clones_only_linked_folders_and_unshallows(app_with_history, tmp_path):
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": {"url": app_with_history, "clone": "sparse"}}}))
+    repos = tmp_path / "repos"
+    runner = click.testing.CliRunner()
+
+    result = runner.invoke(cli, ["clone", "--config-file", str(config_file), "--destination", str(repos)])
+    assert "Successfully cloned" in result.output, result.output
+    repo = repos / "app1"
+    assert sorted(p.name for p in repo.iterdir() if p.name != ".git") == ["AppConfig", "Widgets"]
+    assert is_shallow(repo) and is_partial(repo)
+    assert git("rev-list", "--count", "HEAD", cwd=repo).strip() == "1"
+    # The big asset's blob was never downloaded
+    missing = git("rev-list", "--objects", "--missing=print", "HEAD", cwd=repo)
+    assert any(line.startswith("?") for line in missing.splitlines())
+
+    result = runner.invoke(cli, ["unshallow", "--config-file", str(config_file), "--destination", str(repos)])
+    assert "fetched full history" in result.output
+    assert git("rev-list", "--count", "HEAD", cwd=repo).strip() == "2"
+
+    result = runner.invoke(cli, ["unshallow", "--config-file", str(config_file), "--destination", str(repos), "--full"])
+    assert "fetched all files" in result.output and "checked out every folder" in result.output
+    assert (repo / "assets" / "big.bin").exists()
+    assert not is_partial(repo)
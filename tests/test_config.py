@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+from exb_dev_cli.utils import config as config_module
+from exb_dev_cli.utils.config import (
+    ConfigError, get_repo_details, is_valid_repo_url, load_app_config, load_config, select_entries,
+)
+
+
+def write(path, text):
+    path.write_text(text)
+    return path
+
+
+def test_load_config_parses_once_until_file_changes(tmp_path, monkeypatch):
+    config_file = write(tmp_path / "applications.json", json.dumps({"Applications": {"a": "https://h/a.git"}}))
+    calls = []
+    original = config_module._parse
+    monkeypatch.setattr(config_module, "_parse", lambda path: calls.append(path) or original(path))
+
+    for _ in range(5):
+        load_config(config_file)
+    assert len(calls) == 1
+
+    write(config_file, json.dumps({"Applications": {"a": "https://h/a.git", "bb": "https://h/b.git"}}))
+    stat = os.stat(config_file)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert "bb" in load_config(config_file)["Applications"]
+    assert len(calls) == 2
+
+
+def test_validation_reports_every_problem_with_locations(tmp_path):
+    config_file = write(tmp_path / "applications.json", """{
+    "Applications": {
+        "good": "https://bitbucket.org/team/good.git",
+        "badurl": "not a url",
+        "GOOD": "https://bitbucket.org/team/other.git",
+        "obj": {"tags": "x"}
+    },
+    "Core_Widgets": 5
+}""")
+
+    with pytest.raises(ConfigError) as excinfo:
+        load_app_config(config_file)
+
+    errors = excinfo.value.errors
+    assert "line 4, Applications.badurl: invalid repository URL 'not a url'" in errors
+    assert any(e.startswith("line 5, Applications.GOOD: duplicate app name") for e in errors)
+    assert any("Applications.obj: missing required 'url'" in e for e in errors)
+    assert any(e.startswith("line 8, Core_Widgets: must be a URL string") for e in errors)
+
+
+def test_duplicate_json_keys_are_rejected(tmp_path):
+    config_file = write(tmp_path / "applications.json",
+                        '{"Applications": {\n"a": "https://h/a.git",\n"a": "https://h/b.git"}}')
+
+    with pytest.raises(ConfigError, match="line 3, document: duplicate key 'a'"):
+        load_app_config(config_file)
+
+
+def test_json_syntax_error_location(tmp_path):
+    config_file = write(tmp_path / "applications.json", '{"Applications": {\n  "a": }\n}')
+
+    with pytest.raises(ConfigError, match="line 2, column 8"):
+        load_config(config_file)
+
+
+def test_object_entries_and_selection(tmp_path):
+    config_file = write(tmp_path / "applications.json", json.dumps({
+        "Applications": {
+            "parcel-viewer": {"url": "https://h/pv.git", "tags": ["gis"], "app_id": 3},
+            "permit-portal": "git@bitbucket.org:team/permits.git",
+            "roads": {"url": "ssh://git@h/roads.git", "tags": ["gis", "public-works"]},
+        },
+        "Core_Widgets": "https://h/widgets.git",
+    }))
+    config = load_app_config(config_file)
+
+    assert list(select_entries(config)) == ["parcel-viewer", "permit-portal", "roads", "core_widgets"]
+    assert list(select_entries(config, patterns=["p*"])) == ["parcel-viewer", "permit-portal"]
+    assert list(select_entries(config, tags=["public-works"])) == ["roads"]
+    assert list(select_entries(config, patterns=["core_*"], tags=["gis"])) == ["parcel-viewer", "roads", "core_widgets"]
+    assert get_repo_details("parcel-viewer", config_file) == ("https://h/pv.git", "application")
+
+
+@pytest.mark.parametrize("url,valid", [
+    ("https://ryanulsberger@bitbucket.org/piercecountywa-ss/apptemplate.git", True),
+    ("git@bitbucket.org:team/repo.git", True),
+    ("file:///srv/git/repo.git", True),
+    ("bitbucket.org:team/repo.git", True),
+    ("/srv/git/app.git", True),
+    ("../app", True),
+    ("C:\\repos\\app", True),
+    ("\\\\server\\share\\app.git", True),
+    ("https://", False),
+    ("bitbucket.org/team/repo.git", False),
+    (" https://h/repo.git", False),
+])
+def test_is_valid_repo_url(url, valid):
+    assert is_valid_repo_url(url) is valid
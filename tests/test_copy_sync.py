@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+
+import click.testing
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils import copy_sync
+from exb_dev_cli.utils.copy_sync import TreeMirror, watch
+
+
+def make_source(root, count=50):
+    for i in range(count):
+        path = root / f"widget{i % 5}" / f"file{i}.js"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"content {i}")
+    return root
+
+
+def test_sync_copies_once_and_uses_hash_for_touched_files(tmp_path):
+    source = make_source(tmp_path / "Widgets")
+    target = tmp_path / "exb" / "client" / "app_widgets"
+    mirror = TreeMirror(source, target)
+
+    first = mirror.sync()
+    assert len(first.copied) == 50 and (target / "widget3" / "file3.js").read_text() == "content 3"
+
+    os.utime(source / "widget1" / "file1.js", ns=(1, 1))
+    (source / "widget2" / "file2.js").write_text("changed!!")
+    (source / "widget4" / "file4.js").unlink()
+    second = TreeMirror(source, target).sync()
+    assert second.copied == ["widget2/file2.js"]
+    assert second.removed == ["widget4/file4.js"]
+    assert second.skipped == 48
+    assert os.stat(target / "widget1" / "file1.js").st_mtime_ns == 1
+
+
+def test_sync_replaces_symlink_with_folder(tmp_path):
+    source = make_source(tmp_path / "Widgets", count=3)
+    target = tmp_path / "app_widgets"
+    target.symlink_to(source, target_is_directory=True)
+
+    TreeMirror(source, target).sync()
+    assert target.is_dir() and not target.is_symlink()
+    assert (source / "widget0" / "file0.js").exists()
+
+
+def test_poll_pushes_only_changed_files(tmp_path):
+    source = make_source(tmp_path / "Widgets")
+    target = tmp_path / "target"
+    mirror = TreeMirror(source, target)
+    mirror.sync()
+
+    assert not mirror.poll().changed
+    (source / "widget0" / "new.js").write_text("new")
+    (source / "widget1" / "file1.js").write_text("edited")
+    (source / "widget2" / "file2.js").unlink()
+    result = mirror.poll()
+    assert sorted(result.copied) == ["widget0/new.js", "widget1/file1.js"]
+    assert result.removed == ["widget2/file2.js"]
+    assert not (target / "widget2" / "file2.js").exists()
+
+
+def test_poll_does_not_relist_unchanged_folders(tmp_path, monkeypatch):
+    source = make_source(tmp_path / "Widgets")
+    for folder in [source, *source.iterdir()]:
+        os.utime(folder, ns=(1, 1))
+    mirror = TreeMirror(source, tmp_path / "target")
+    mirror.sync()
+    listed = []
+    scandir = os.scandir
+    monkeypatch.setattr(copy_sync.os, "scandir", lambda path: listed.append(path) or scandir(path))
+
+    (source / "widget1" / "file1.js").write_text("edited in place")
+    assert mirror.poll().copied == ["widget1/file1.js"]
+    assert listed == []
+
+    (source / "widget2" / "new.js").write_text("new")
+    assert mirror.poll().copied == ["widget2/new.js"]
+    assert listed == [str(source / "widget2")]
+
+
+def test_watch_pushes_changes_within_a_second(tmp_path):
+    source = make_source(tmp_path / "Widgets", count=2000)
+    target = tmp_path / "target"
+    mirror = TreeMirror(source, target)
+    mirror.sync()
+    stop = threading.Event()
+    thread = threading.Thread(target=watch, args=([mirror], 0.05, stop))
+    thread.start()
+    try:
+        (source / "widget0" / "file0.js").write_text("edited while watching")
+        deadline = time.perf_counter() + 1
+        while time.perf_counter() < deadline:
+            if (target / "widget0" / "file0.js").read_text() == "edited while watching":
+                break
+            time.sleep(0.01)
+        assert (target / "widget0" / "file0.js").read_text() == "edited while watching"
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_link_command_copy_mode(make_git_repo, tmp_path):
+    url = make_git_repo("app1", {"Widgets/w/manifest.json": "{}", "AppConfig/config.json": "{}"})
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": url}}))
+    repos = tmp_path / "repos"
+    exb = tmp_path / "exb"
+    (exb / "client").mkdir(parents=True)
+    runner = click.testing.CliRunner()
+    runner.invoke(cli, ["clone", "--config-file", str(config_file), "--destination", str(repos), "--no-mirror"])
+
+    result = runner.invoke(cli, ["link", "--config-file", str(config_file), "--destination", str(repos),
+                                 "--exb-path", str(exb), "--mode", "copy"])
+    assert "2 folder(s) were mirrored." in result.output
+    widgets = exb / "client" / "app1_widgets"
+    assert not widgets.is_symlink() and (widgets / "w" / "manifest.json").read_text() == "{}"
+    assert (exb / "server" / "public" / "apps" / "app1" / "config.json").exists()
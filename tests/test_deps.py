@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import sys
+
+import click.testing
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils.deps import DEPS_CURRENT, DEPS_INSTALLED, DEPS_RESTORED, DepsCache, install_deps, package_folders
+
+
+class FakeInstaller:
+    """Writes a node_modules folder derived from the lockfile, like `npm ci` would, without a network."""
+
+    def __init__(self):
+        self.installed = []
+
+    def key(self):
+        return "fake"
+
+    def install(self, folder):
+        self.installed.append(folder)
+        # `npm ci` starts from an empty node_modules
+        shutil.rmtree(folder / "node_modules", ignore_errors=True)
+        package = folder / "node_modules" / "left-pad"
+        package.mkdir(parents=True)
+        (package / "index.js").write_text((folder / "package-lock.json").read_text())
+        (folder / "node_modules" / ".bin").mkdir()
+        os.symlink("../left-pad/index.js", folder / "node_modules" / ".bin" / "left-pad")
+
+
+def make_widget(folder, lock='{"lockfileVersion": 3}'):
+    folder.mkdir(parents=True)
+    (folder / "package.json").write_text('{"name": "w"}')
+    (folder / "package-lock.json").write_text(lock)
+    return folder
+
+
+def actions(result):
+    return sorted((folder.name, action) for folder, action, _, _ in result.entries)
+
+
+def test_lockfile_keyed_cache_hits_misses_and_restores(tmp_path):
+    installer, cache = FakeInstaller(), DepsCache(tmp_path / "deps-cache")
+    widgets = tmp_path / "ws1" / "app_widgets"
+    make_widget(widgets / "a")
+    make_widget(widgets / "b", lock='{"lockfileVersion": 3, "packages": {}}')
+    (widgets / "notes").mkdir()
+    folders = package_folders([widgets])
+    assert [f.name for f in folders] == ["a", "b"]
+
+    result = install_deps(folders, installer=installer, cache=cache)
+    assert actions(result) == [("a", DEPS_INSTALLED), ("b", DEPS_INSTALLED)]
+    assert result.misses == 2 and result.hits == 0
+
+    # Nothing changed, so nothing is installed or restored
+    result = install_deps(folders, installer=installer, cache=cache)
+    assert actions(result) == [("a", DEPS_CURRENT), ("b", DEPS_CURRENT)]
+    assert len(installer.installed) == 2
+
+    # A fresh workspace with the same lockfile restores from the cache, symlinks included
+    other = make_widget(tmp_path / "ws2" / "app_widgets" / "a")
+    (other / "node_modules").mkdir()
+    (other / "node_modules" / "stale.js").write_text("old")
+    result = install_deps([other], installer=installer, cache=cache)
+    assert actions(result) == [("a", DEPS_RESTORED)]
+    assert len(installer.installed) == 2
+    assert os.readlink(other / "node_modules" / ".bin" / "left-pad") == "../left-pad/index.js"
+    assert (other / "node_modules" / ".bin" / "left-pad").read_text() == '{"lockfileVersion": 3}'
+    assert not (other / "node_modules" / "stale.js").exists()
+    assert not [p for p in other.iterdir() if p.name.endswith(".exb-tmp")]
+
+    # Changing the lockfile is a miss
+    (other / "package-lock.json").write_text('{"lockfileVersion": 3, "changed": true}')
+    result = install_deps([other], installer=FakeInstaller(), cache=cache)
+    assert actions(result) == [("a", DEPS_INSTALLED)]
+
+
+def test_deps_command_installs_linked_widgets(make_git_repo, tmp_path):
+    url = make_git_repo("app1", {
+        "Widgets/w1/package.json": '{"name": "w1"}',
+        "Widgets/w1/package-lock.json": "{}",
+        "Widgets/w2/manifest.json": "{}",
+    })
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": url}}))
+    exb = tmp_path / "exb" / "ArcGISExperienceBuilder"
+    (exb / "client").mkdir(parents=True)
+    (exb / "client" / "package.json").write_text("{}")
+    (exb / "client" / "package-lock.json").write_text("{}")
+    (exb / "server" / "public" / "apps").mkdir(parents=True)
+    repos = tmp_path / "repos"
+    fake_npm = f'{sys.executable} -c "import os; os.makedirs(\'node_modules/pkg\'); open(\'node_modules/pkg/index.js\', \'w\').close()"'
+
+    runner = click.testing.CliRunner()
+    for args in (["clone", "--config-file", str(config_file), "--destination", str(repos), "--no-mirror"],
+                 ["link", "--config-file", str(config_file), "--destination", str(repos), "--exb-path", str(exb)]):
+        result = runner.invoke(cli, args)
+        assert "Error" not in result.output, result.output
+
+    args = ["deps", "--config-file", str(config_file), "--destination", str(repos), "--exb-path", str(exb),
+            "--installer", fake_npm]
+    result = runner.invoke(cli, args)
+    assert "0 up to date, 0 restored from cache in 0.0s, 2 installed" in result.output, result.output
+    assert (repos / "app1" / "Widgets" / "w1" / "node_modules" / "pkg" / "index.js").exists()
+    assert (exb / "client" / "node_modules" / "pkg" / "index.js").exists()
+    assert not (repos / "app1" / "Widgets" / "w2" / "node_modules").exists()
+
+    result = runner.invoke(cli, args)
+    assert "2 up to date" in result.output and "hit rate 100%" in result.output
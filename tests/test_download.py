@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from exb_dev_cli.utils import app_manager
+from exb_dev_cli.utils.download import (
+    ChecksumMismatchError, download_file, download_segmented, part_path, probe_download, split_ranges,
+)
+from tests.http_server import ArchiveServer
+
+
+DATA = os.urandom(256 * 1024)
+DATA_SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+def test_download_streams_and_verifies(tmp_path):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}) as server:
+        digest = download_file(server.url("/exb.zip"), dest, sha256=DATA_SHA256, chunk_size=4096)
+
+    assert digest == DATA_SHA256
+    assert dest.read_bytes() == DATA
+    assert not part_path(dest).exists()
+
+
+def test_download_resumes_after_disconnect(tmp_path):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}, disconnect_after=100_000) as server:
+        download_file(server.url("/exb.zip"), dest, sha256=DATA_SHA256, chunk_size=4096)
+
+    assert dest.read_bytes() == DATA
+    ranges = [r for _, _, r in server.requests]
+    assert ranges[0] is None
+    assert ranges[1] is not None and ranges[1].startswith("bytes=") and ranges[1] != "bytes=0-"
+
+
+def test_download_resumes_existing_part_file(tmp_path):
+    dest = tmp_path / "exb.zip"
+    part_path(dest).write_bytes(DATA[:1000])
+    with ArchiveServer({"/exb.zip": DATA}) as server:
+        download_file(server.url("/exb.zip"), dest, sha256=DATA_SHA256)
+
+    assert server.requests[0][2] == "bytes=1000-"
+    assert dest.read_bytes() == DATA
+
+
+def test_download_restarts_when_ranges_unsupported(tmp_path):
+    dest = tmp_path / "exb.zip"
+    part_path(dest).write_bytes(b"stale")
+    with ArchiveServer({"/exb.zip": DATA}, accept_ranges=False) as server:
+        download_file(server.url("/exb.zip"), dest, sha256=DATA_SHA256)
+
+    assert dest.read_bytes() == DATA
+
+
+def test_download_checksum_mismatch_discards_part(tmp_path):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}) as server:
+        with pytest.raises(ChecksumMismatchError):
+            download_file(server.url("/exb.zip"), dest, sha256="0" * 64)
+
+    assert not dest.exists()
+    assert not part_path(dest).exists()
+
+
+def test_install_uses_sha256_from_versions_json(tmp_path, monkeypatch):
+    import io
+    import zipfile
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("ArcGISExperienceBuilder/client/package.json", "{}")
+    archive = buffer.getvalue()
+
+    with ArchiveServer({"/exb.zip": archive}) as server:
+        versions = tmp_path / "versions.json"
+        versions.write_text(json.dumps({"Experience_Builder": {
+            "v1.16": {"url": server.url("/exb.zip"), "sha256": hashlib.sha256(archive).hexdigest()}
+        }}))
+        monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+        app_manager.install_experience_builder("v1.16", tmp_path)
+
+    assert (tmp_path / "ArcGISExperienceBuilder" / "client" / "package.json").exists()
+
+
+def test_segmented_download_uses_ranges(tmp_path):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}) as server:
+        digest = download_segmented(server.url("/exb.zip"), dest, connections=4, sha256=DATA_SHA256, chunk_size=4096)
+
+    assert digest == DATA_SHA256
+    assert dest.read_bytes() == DATA
+    ranges = sorted(r for method, _, r in server.requests if method == "GET")
+    assert len(ranges) == 4 and all(r.startswith("bytes=") for r in ranges)
+
+
+def test_segmented_download_recovers_dropped_segment(tmp_path):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}, disconnect_after=1000) as server:
+        download_segmented(server.url("/exb.zip"), dest, connections=3, sha256=DATA_SHA256, chunk_size=4096)
+
+    assert dest.read_bytes() == DATA
+
+
+def test_segmented_download_falls_back_without_accept_ranges(tmp_path, capsys):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}, accept_ranges=False) as server:
+        download_segmented(server.url("/exb.zip"), dest, connections=4, sha256=DATA_SHA256)
+
+    assert dest.read_bytes() == DATA
+    assert [r for method, _, r in server.requests if method == "GET"] == [None]
+    assert "single connection" in capsys.readouterr().out
+
+
+def test_segmented_download_probes_with_range_get_when_head_is_refused(tmp_path):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}, head_status=405) as server:
+        assert probe_download(server.url("/exb.zip")) == (len(DATA), True)
+        download_segmented(server.url("/exb.zip"), dest, connections=4, sha256=DATA_SHA256, chunk_size=4096)
+
+    assert dest.read_bytes() == DATA
+    ranges = [r for method, _, r in server.requests if method == "GET"]
+    assert ranges.count("bytes=0-0") == 2 and len(ranges) == 6
+
+
+def test_segmented_download_falls_back_when_head_is_refused_without_ranges(tmp_path):
+    dest = tmp_path / "exb.zip"
+    with ArchiveServer({"/exb.zip": DATA}, accept_ranges=False, head_status=403) as server:
+        assert probe_download(server.url("/exb.zip")) == (len(DATA), False)
+        download_segmented(server.url("/exb.zip"), dest, connections=4, sha256=DATA_SHA256)
+
+    assert dest.read_bytes() == DATA
+
+
+def test_split_ranges_covers_every_byte():
+    assert split_ranges(10, 3) == [(0, 2), (3, 5), (6, 9)]
+    assert split_ranges(2, 8) == [(0, 0), (1, 1)]
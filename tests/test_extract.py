@@ -0,0 +1,97 @@
+import zipfile
+
+import click.testing
+import pytest
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils.extract import MANIFEST_NAME, extract_archive, upgrade_tree, verify_tree
+
+
+def make_zip(path, files):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return path
+
+
+FILES = {f"ArcGISExperienceBuilder/client/file{i}.js": f"content {i}" * 10 for i in range(600)}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_extract_and_skip_unchanged(tmp_path, workers):
+    archive = make_zip(tmp_path / "exb.zip", FILES)
+    dest = tmp_path / "dest"
+
+    first = extract_archive(archive, dest, workers=workers)
+    assert first.written == len(FILES) and first.skipped == 0
+    assert (dest / "ArcGISExperienceBuilder/client/file5.js").read_text() == FILES["ArcGISExperienceBuilder/client/file5.js"]
+
+    (dest / "ArcGISExperienceBuilder/client/file7.js").write_text("edited")
+    second = extract_archive(archive, dest, workers=workers)
+    assert second.written == 1 and second.skipped == len(FILES) - 1
+    assert (dest / "ArcGISExperienceBuilder/client/file7.js").read_text() == FILES["ArcGISExperienceBuilder/client/file7.js"]
+    assert (dest / MANIFEST_NAME).exists()
+
+
+def test_verify_reports_missing_and_modified(tmp_path):
+    archive = make_zip(tmp_path / "exb.zip", FILES)
+    dest = tmp_path / "dest"
+    extract_archive(archive, dest, workers=2)
+
+    assert verify_tree(dest, workers=2) == ([], [])
+
+    (dest / "ArcGISExperienceBuilder/client/file1.js").unlink()
+    (dest / "ArcGISExperienceBuilder/client/file2.js").write_text("changed")
+    missing, modified = verify_tree(dest, workers=2)
+    assert missing == ["ArcGISExperienceBuilder/client/file1.js"]
+    assert modified == ["ArcGISExperienceBuilder/client/file2.js"]
+
+
+def test_verify_command_exit_code(tmp_path):
+    archive = make_zip(tmp_path / "exb.zip", {"a.txt": "a"})
+    dest = tmp_path / "dest"
+    extract_archive(archive, dest)
+    runner = click.testing.CliRunner()
+
+    assert runner.invoke(cli, ["verify", "--destination", str(dest)]).exit_code == 0
+    (dest / "a.txt").write_text("b")
+    result = runner.invoke(cli, ["verify", "--destination", str(dest)])
+    assert result.exit_code == 1
+    assert "modified  a.txt" in result.output
+
+
+def test_rejects_path_traversal(tmp_path):
+    archive = make_zip(tmp_path / "evil.zip", {"../escape.txt": "x"})
+
+    with pytest.raises(ValueError, match="unsafe"):
+        extract_archive(archive, tmp_path / "dest")
+    assert not (tmp_path / "escape.txt").exists()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_upgrade_writes_only_changed_members_and_keeps_links(tmp_path, workers):
+    old_files = dict(FILES, **{"ArcGISExperienceBuilder/client/removed.js": "gone in v2"})
+    new_files = dict(FILES, **{
+        "ArcGISExperienceBuilder/client/file3.js": "changed in v2",
+        "ArcGISExperienceBuilder/client/added/new.js": "new in v2",
+    })
+    old_zip = make_zip(tmp_path / "v1.zip", old_files)
+    new_zip = make_zip(tmp_path / "v2.zip", new_files)
+    dest = tmp_path / "dest"
+    extract_archive(old_zip, dest, workers=workers)
+
+    repo = tmp_path / "repo" / "Widgets"
+    repo.mkdir(parents=True)
+    (repo / "file8.js").write_text("app widget")
+    (dest / "ArcGISExperienceBuilder/client/app_widgets").symlink_to(repo, target_is_directory=True)
+    untouched = (dest / "ArcGISExperienceBuilder/client/file5.js").stat().st_mtime_ns
+
+    result = upgrade_tree(old_zip, new_zip, dest, workers=workers)
+
+    assert result.written == 2 and result.removed == 1
+    assert result.bytes_written == len("changed in v2") + len("new in v2")
+    assert (dest / "ArcGISExperienceBuilder/client/file3.js").read_text() == "changed in v2"
+    assert not (dest / "ArcGISExperienceBuilder/client/removed.js").exists()
+    assert (dest / "ArcGISExperienceBuilder/client/file5.js").stat().st_mtime_ns == untouched
+    assert (dest / "ArcGISExperienceBuilder/client/app_widgets/file8.js").read_text() == "app widget"
+    assert verify_tree(dest, workers=workers) == ([], [])
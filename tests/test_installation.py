@@ -0,0 +1,130 @@
+import os
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from exb_dev_cli.ExperienceBuilderInstallation import ExperienceBuilderInstallation
+from exb_dev_cli.utils import state
+from exb_dev_cli.utils.state import STATE_FILE_NAME, AppRecord
+
+
+def make_installation(tmp_path):
+    exb = tmp_path / "ArcGISExperienceBuilder"
+    (exb / "client").mkdir(parents=True)
+    apps_dir = exb / "server" / "public" / "apps"
+    apps_dir.mkdir(parents=True)
+    repo = tmp_path / "apptemplate"
+    (repo / "Widgets").mkdir(parents=True)
+    (repo / "AppConfig").mkdir(parents=True)
+    os.symlink(repo / "AppConfig", apps_dir / "1")
+    os.symlink(repo / "Widgets", exb / "client" / "apptemplate_widgets")
+    (apps_dir / "0").mkdir()  # a plain app folder created by Experience Builder itself
+    return exb, repo
+
+
+def test_loads_apps_from_links(tmp_path):
+    exb, repo = make_installation(tmp_path)
+
+    installation = ExperienceBuilderInstallation(exb, "v1.16")
+
+    record = installation.apps["apptemplate"]
+    assert isinstance(record, AppRecord)
+    assert record.app_id == "1"
+    assert record.repo_path == repo
+    assert record.widgets_link == str(repo / "Widgets")
+    assert installation.apps["0"].repo_path is None
+    assert (exb / STATE_FILE_NAME).exists()
+
+
+def test_unchanged_installation_skips_scan(tmp_path):
+    exb, _ = make_installation(tmp_path)
+    first = ExperienceBuilderInstallation(exb, "v1.16").apps
+
+    with patch.object(state, "scan_installed_apps") as scan:
+        second = ExperienceBuilderInstallation(exb, "v1.16").apps
+
+    scan.assert_not_called()
+    assert second == first
+
+
+def test_changed_apps_folder_triggers_rescan(tmp_path):
+    exb, _ = make_installation(tmp_path)
+    ExperienceBuilderInstallation(exb, "v1.16")
+
+    other = tmp_path / "other"
+    (other / "AppConfig").mkdir(parents=True)
+    os.symlink(other / "AppConfig", exb / "server" / "public" / "apps" / "2")
+
+    installation = ExperienceBuilderInstallation(exb, "v1.16")
+    assert installation.apps["other"].app_id == "2"
+
+
+def test_directory_properties_are_cached(tmp_path):
+    exb, _ = make_installation(tmp_path)
+    installation = ExperienceBuilderInstallation(exb, "v1.16")
+    assert installation.client_directory == exb / "client"
+
+    with patch("pathlib.Path.exists") as exists:
+        assert installation.client_directory == exb / "client"
+        assert installation.server_directory == exb / "server" / "public" / "apps"
+    assert exists.call_count <= 1
+
+
+def test_app_record_uses_slots():
+    record = AppRecord("app", "1")
+    assert not hasattr(record, "__dict__")
+
+
+def test_remove_app_unlinks_and_deletes_repo(tmp_path):
+    exb, repo = make_installation(tmp_path)
+    installation = ExperienceBuilderInstallation(exb, "v1.16")
+
+    installation.remove_app("apptemplate", delete_repo=True)
+
+    assert not os.path.lexists(exb / "client" / "apptemplate_widgets")
+    assert not os.path.lexists(exb / "server" / "public" / "apps" / "1")
+    assert not repo.exists()
+    assert (exb / "server" / "public" / "apps" / "0").is_dir()
+    assert "apptemplate" not in ExperienceBuilderInstallation(exb, "v1.16").apps
+
+
+def test_remove_app_refuses_to_delete_a_dirty_repo(tmp_path):
+    exb, repo = make_installation(tmp_path)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    (repo / "AppConfig" / "config.json").write_text("{}")
+    installation = ExperienceBuilderInstallation(exb, "v1.16")
+
+    with pytest.raises(ValueError, match="uncommitted changes"):
+        installation.remove_app("apptemplate", delete_repo=True)
+    assert repo.exists()
+    assert os.path.islink(exb / "client" / "apptemplate_widgets")
+    assert "apptemplate" in installation.apps
+
+    installation.remove_app("apptemplate", delete_repo=True, force=True)
+    assert not repo.exists()
+
+
+def test_load_does_not_write_state(tmp_path):
+    exb, _ = make_installation(tmp_path)
+
+    apps, scanned = state.InstallationState(exb).load()
+
+    assert scanned
+    assert "apptemplate" in apps
+    assert not (exb / STATE_FILE_NAME).exists()
+
+
+def test_config_app_records_the_created_link_targets(tmp_path, monkeypatch):
+    exb, _ = make_installation(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "newapp" / "Widgets").mkdir(parents=True)
+    (tmp_path / "newapp" / "AppConfig").mkdir()
+    installation = ExperienceBuilderInstallation(exb, "v1.16")
+
+    installation.config_app("newapp", "https://example.com/newapp.git")
+
+    record = installation.apps["newapp"]
+    rescanned = state.scan_installed_apps(exb)["newapp"]
+    assert record.config_link == rescanned.config_link
+    assert record.widgets_link == rescanned.widgets_link
@@ -0,0 +1,104 @@
+import io
+import json
+import shutil
+import subprocess
+import zipfile
+from pathlib import Path
+from urllib.request import url2pathname
+
+import pytest
+
+from exb_dev_cli.utils import app_manager
+from exb_dev_cli.utils.lockfile import LOCK_FILE_NAME, Lockfile, LockMismatchError
+from tests.http_server import ArchiveServer
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                          cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def workspace(make_git_repo, tmp_path, monkeypatch):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("ArcGISExperienceBuilder/client/package.json", "{}")
+        zf.writestr("ArcGISExperienceBuilder/server/public/apps/0/config.json", "{}")
+    url = make_git_repo("app1", {"Widgets/w/manifest.json": "{}", "AppConfig/config.json": "{}"})
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": url}}))
+
+    with ArchiveServer({"/exb.zip": buffer.getvalue()}) as server:
+        versions = tmp_path / "versions.json"
+        versions.write_text(json.dumps({"Experience_Builder": {"v1.16": server.url("/exb.zip")}}))
+        monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+        yield config_file, Path(url2pathname(url[len("file://"):])), server
+
+
+def setup(config_file, tmp_path, frozen=False):
+    lock = Lockfile.for_config(config_file, frozen=frozen)
+    app_manager.setup_workspace("v1.16", config_file, tmp_path / "exb", tmp_path / "repos", use_mirrors=False,
+                                lock=lock)
+    return lock
+
+
+def test_warm_setup_skips_install_and_clone(workspace, tmp_path, capsys):
+    config_file, origin, server = workspace
+    setup(config_file, tmp_path)
+
+    data = json.loads((tmp_path / LOCK_FILE_NAME).read_text())
+    assert data["exb"]["version"] == "v1.16"
+    assert data["repos"]["app1"] == {"url": origin.as_uri(), "path": "repos/app1", "commit": git("rev-parse", "HEAD", cwd=origin)}
+    assert "exb/ArcGISExperienceBuilder/client/app1_widgets" in data["links"]
+    requests = len(server.requests)
+    capsys.readouterr()
+
+    setup(config_file, tmp_path)
+    output = capsys.readouterr().out
+    assert "already installed" in output and "at its locked commit" in output
+    assert len(server.requests) == requests
+
+
+def test_frozen_checks_out_locked_commit(workspace, tmp_path):
+    config_file, origin, _ = workspace
+    setup(config_file, tmp_path)
+    locked = git("rev-parse", "HEAD", cwd=origin)
+    (origin / "Widgets" / "w" / "manifest.json").write_text('{"v": 2}')
+    git("commit", "-qam", "second", cwd=origin)
+
+    # An unfrozen clone follows the branch and moves the lock
+    app_manager.clone_repos_from_config(config_file, tmp_path / "repos2", use_mirrors=False,
+                                        lock=Lockfile.for_config(config_file, tmp_path / "other.lock"))
+    assert git("rev-parse", "HEAD", cwd=tmp_path / "repos2" / "app1") != locked
+
+    # A frozen clone into a fresh folder reproduces the locked commit and leaves the lockfile alone
+    before = (tmp_path / LOCK_FILE_NAME).read_text()
+    app_manager.clone_repos_from_config(config_file, tmp_path / "repos3", use_mirrors=False,
+                                        lock=Lockfile.for_config(config_file, frozen=True))
+    assert git("rev-parse", "HEAD", cwd=tmp_path / "repos3" / "app1") == locked
+    assert (tmp_path / LOCK_FILE_NAME).read_text() == before
+
+
+def test_frozen_needs_a_matching_lockfile(workspace, tmp_path):
+    config_file, _, _ = workspace
+    with pytest.raises(LockMismatchError, match="not found"):
+        Lockfile.for_config(config_file, frozen=True)
+
+    setup(config_file, tmp_path)
+    config_file.write_text(json.dumps({"Applications": {"app1": "file:///elsewhere/app1.git"}}))
+    from exb_dev_cli.utils.config import clear_config_cache
+    clear_config_cache()
+    with pytest.raises(LockMismatchError, match="app1"):
+        setup(config_file, tmp_path, frozen=True)
+
+
+def test_install_is_repeated_when_the_tree_was_deleted(workspace, tmp_path, capsys):
+    config_file, _, _ = workspace
+    setup(config_file, tmp_path)
+    shutil.rmtree(tmp_path / "exb" / "ArcGISExperienceBuilder")
+    capsys.readouterr()
+
+    app_manager.install_experience_builder("v1.16", tmp_path / "exb", lock=Lockfile.for_config(config_file))
+
+    assert "already installed" not in capsys.readouterr().out
+    assert (tmp_path / "exb" / "ArcGISExperienceBuilder" / "client" / "package.json").is_file()
@@ -0,0 +1,46 @@
+import subprocess
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from exb_dev_cli.utils.app_manager import clone_repo
+from exb_dev_cli.utils.mirrors import MirrorCache
+
+
+def git_output(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_clone_through_mirror_points_origin_at_remote(make_git_repo, tmp_path):
+    url = make_git_repo("apptemplate")
+    mirrors = MirrorCache(tmp_path / "mirrors")
+
+    clone_repo(url, tmp_path / "ws1" / "apptemplate", quiet=True, mirrors=mirrors)
+
+    assert (mirrors.mirror_path(url) / "HEAD").exists()
+    assert git_output("remote", "get-url", "origin", cwd=tmp_path / "ws1" / "apptemplate") == url
+
+
+def test_warm_clone_fetches_new_commits(make_git_repo, tmp_path):
+    url = make_git_repo("apptemplate")
+    origin = Path(url2pathname(urlparse(url).path))
+    mirrors = MirrorCache(tmp_path / "mirrors")
+    clone_repo(url, tmp_path / "ws1" / "apptemplate", quiet=True, mirrors=mirrors)
+
+    (origin / "new.txt").write_text("new")
+    git_output("add", "-A", cwd=origin)
+    git_output("-c", "user.name=t", "-c", "user.email=t@e", "commit", "-m", "second", cwd=origin)
+
+    clone_repo(url, tmp_path / "ws2" / "apptemplate", quiet=True, mirrors=mirrors)
+
+    assert (tmp_path / "ws2" / "apptemplate" / "new.txt").exists()
+    assert git_output("rev-parse", "HEAD", cwd=tmp_path / "ws2" / "apptemplate") == git_output("rev-parse", "HEAD", cwd=origin)
+
+
+def test_mirror_path_is_stable_and_url_specific(tmp_path):
+    mirrors = MirrorCache(tmp_path)
+    a = mirrors.mirror_path("https://user@bitbucket.org/team/apptemplate.git")
+
+    assert a == mirrors.mirror_path("https://user@bitbucket.org/team/apptemplate.git")
+    assert a.name.startswith("apptemplate-") and a.suffix == ".git"
+    assert a != mirrors.mirror_path("https://bitbucket.org/other/apptemplate.git")
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from exb_dev_cli.utils.app_manager import clone_repo, clone_repos_from_config
+from exb_dev_cli.utils.parallel_clone import clone_repos_parallel, format_size
+
+
+def test_clone_repos_from_config_clones_all(make_git_repo, tmp_path, capsys):
+    config = {
+        "Applications": {name: make_git_repo(name) for name in ("app1", "app2", "app3")},
+        "Core_Widgets": make_git_repo("widgets"),
+    }
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps(config))
+    dest = tmp_path / "work"
+
+    results = clone_repos_from_config(config_file, dest, jobs=3)
+
+    assert [r.name for r in results] == ["app1", "app2", "app3", "core_widgets"]
+    assert all(r.ok and r.size_bytes > 0 for r in results)
+    assert (dest / "core_widgets" / "README.md").read_text() == "widgets"
+    assert "Repository" in capsys.readouterr().out
+
+
+def test_failed_clone_does_not_abort_others(make_git_repo, tmp_path):
+    good = make_git_repo("good")
+    repos = [
+        ("missing", (tmp_path / "does-not-exist").as_uri(), tmp_path / "work" / "missing"),
+        ("good", good, tmp_path / "work" / "good"),
+    ]
+
+    results = clone_repos_parallel(repos, clone_repo, jobs=1)
+
+    assert not results[0].ok and results[0].error
+    assert results[1].ok
+    assert (tmp_path / "work" / "good" / "README.md").exists()
+
+
+def test_clone_repos_from_config_reports_failures(make_git_repo, tmp_path):
+    config = {"Applications": {"good": make_git_repo("good"), "bad": (tmp_path / "nope").as_uri()}}
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps(config))
+
+    with pytest.raises(RuntimeError, match="1 of 2 repositories failed to clone: bad"):
+        clone_repos_from_config(config_file, tmp_path / "work", jobs=2)
+    assert (tmp_path / "work" / "good").exists()
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KiB"
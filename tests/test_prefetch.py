@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from urllib.request import url2pathname
+
+import pytest
+
+from exb_dev_cli.utils import app_manager
+from exb_dev_cli.utils.cache import ArchiveCache
+from exb_dev_cli.utils.download import download_file
+from exb_dev_cli.utils.mirrors import MirrorCache
+from exb_dev_cli.utils.prefetch import PREFETCH_CLONED, PREFETCH_CURRENT, PREFETCH_DOWNLOADED, PREFETCH_UPDATED
+from tests.http_server import ArchiveServer
+
+
+DATA = os.urandom(64 * 1024)
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                          cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_rate_limit_caps_download_speed(tmp_path):
+    with ArchiveServer({"/exb.zip": DATA}) as server:
+        start = time.monotonic()
+        download_file(server.url("/exb.zip"), tmp_path / "exb.zip", rate_limit=128 * 1024)
+        elapsed = time.monotonic() - start
+
+    assert (tmp_path / "exb.zip").read_bytes() == DATA
+    assert elapsed >= 0.4
+
+
+def test_prefetch_downloads_new_versions_and_fetches_mirrors(make_git_repo, tmp_path, monkeypatch, capsys):
+    url = make_git_repo("app1")
+    origin = Path(url2pathname(url[len("file://"):]))
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {
+        "app1": url,
+        "sparse": {"url": make_git_repo("sparse"), "clone": "sparse"},
+    }}))
+    old, new = b"old archive", b"new archive"
+
+    with ArchiveServer({"/old.zip": old, "/new.zip": new}) as server:
+        versions = tmp_path / "versions.json"
+        versions.write_text(json.dumps({"Experience_Builder": {
+            "v1.15": server.url("/old.zip"),
+            "v1.16": {"url": server.url("/new.zip"), "sha256": hashlib.sha256(new).hexdigest()},
+        }}))
+        monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+        ArchiveCache().fetch("v1.15", server.url("/old.zip"))
+        requests = len(server.requests)
+
+        result = app_manager.prefetch_from_config(config_file, low_priority=False)
+        actions = {name: action for _, name, action, _ in result.entries}
+        assert actions == {"v1.15": PREFETCH_CURRENT, "v1.16": PREFETCH_DOWNLOADED, "app1": PREFETCH_CLONED}
+        assert [r[1] for r in server.requests[requests:]] == ["/new.zip"]
+
+        result = app_manager.prefetch_from_config(config_file, low_priority=False)
+        assert {action for _, _, action, _ in result.entries} == {PREFETCH_CURRENT}
+
+        (origin / "README.md").write_text("changed")
+        git("commit", "-qam", "second", cwd=origin)
+        result = app_manager.prefetch_from_config(config_file, versions=["v1.16"], low_priority=False)
+        assert [(name, action) for _, name, action, _ in result.entries] == \
+            [("v1.16", PREFETCH_CURRENT), ("app1", PREFETCH_UPDATED)]
+    assert "app1: updated (1 ref(s) updated, 0 removed)" in capsys.readouterr().out
+
+
+def test_prefetch_reports_failures_after_finishing(make_git_repo, tmp_path, monkeypatch):
+    url = make_git_repo("app1")
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"missing": (tmp_path / "nowhere").as_uri(), "app1": url}}))
+    versions = tmp_path / "versions.json"
+    versions.write_text(json.dumps({"Experience_Builder": {}}))
+    monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+
+    with pytest.raises(RuntimeError, match="missing"):
+        app_manager.prefetch_from_config(config_file, low_priority=False)
+    assert (MirrorCache().mirror_path(url) / "HEAD").exists()
@@ -0,0 +1,122 @@
+import json
+import os
+import stat
+import subprocess
+import time
+
+import click.testing
+import pytest
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils.app_manager import _deletable_repo, clone_repos_from_config, remove_app_from_config
+from exb_dev_cli.utils.config import ConfigError, load_app_config
+from exb_dev_cli.utils.remove import TRASH_DIR_NAME, remove_paths, remove_tree
+
+
+def make_tree(root, width=5, depth=3):
+    root.mkdir(parents=True)
+    count = 0
+    for i in range(width):
+        folder = root / f"d{i}"
+        for level in range(depth):
+            folder = folder / f"l{level}"
+            folder.mkdir(parents=True)
+            path = folder / "object"
+            path.write_text("x")
+            # Like git's loose objects
+            os.chmod(path, stat.S_IRUSR)
+            count += 1
+    return count
+
+
+def test_remove_tree_deletes_read_only_files_without_following_links(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    tree = tmp_path / "tree"
+    files = make_tree(tree)
+    os.symlink(outside, tree / "d0" / "link")
+
+    result = remove_tree(tree, jobs=4)
+
+    assert not tree.exists()
+    assert result.files == files + 1
+    assert result.dirs == 1 + 5 * 4
+    assert (outside / "keep.txt").read_text() == "keep"
+    assert remove_tree(tree).files == 0
+
+
+def test_background_remove_returns_before_deleting(tmp_path):
+    tree = tmp_path / "repo"
+    make_tree(tree / "node_modules", width=20)
+
+    result = remove_paths([tree], background=True)
+
+    assert not tree.exists()
+    assert result.trashed and result.trashed[0].parent == tmp_path / TRASH_DIR_NAME
+    deadline = time.monotonic() + 20
+    while (tmp_path / TRASH_DIR_NAME).exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not (tmp_path / TRASH_DIR_NAME).exists()
+
+
+def test_remove_and_teardown_commands(make_git_repo, tmp_path):
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {
+        "app1": make_git_repo("app1", {"Widgets/w/manifest.json": "{}", "AppConfig/config.json": "{}"}),
+        "app2": make_git_repo("app2", {"Widgets/w/manifest.json": "{}", "AppConfig/config.json": "{}"}),
+    }}))
+    exb = tmp_path / "exb" / "ArcGISExperienceBuilder"
+    (exb / "client").mkdir(parents=True)
+    (exb / "server" / "public" / "apps").mkdir(parents=True)
+    repos = tmp_path / "repos"
+    runner = click.testing.CliRunner()
+    for args in (["clone", "--config-file", str(config_file), "--destination", str(repos), "--no-mirror"],
+                 ["link", "--config-file", str(config_file), "--destination", str(repos), "--exb-path", str(exb)]):
+        result = runner.invoke(cli, args)
+        assert "Error" not in result.output, result.output
+
+    result = runner.invoke(cli, ["remove", "--app-name", "app1", "--config-file", str(config_file),
+                                 "--destination", str(repos), "--exb-path", str(exb)])
+    assert "Removed app1" in result.output, result.output
+    assert not os.path.lexists(exb / "client" / "app1_widgets")
+    assert not os.path.lexists(exb / "server" / "public" / "apps" / "app1")
+    assert not (repos / "app1").exists()
+    assert (exb / "client" / "app2_widgets" / "w" / "manifest.json").exists()
+
+    result = runner.invoke(cli, ["teardown", "--config-file", str(config_file), "--destination", str(exb.parent),
+                                 "--repos", str(repos), "--yes"])
+    assert "Removed the workspace" in result.output, result.output
+    assert not exb.exists() and not (repos / "app2").exists()
+
+
+def test_remove_refuses_unpushed_work_and_paths_outside_the_repos_folder(make_git_repo, tmp_path):
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": make_git_repo("app1")}}))
+    exb = tmp_path / "exb"
+    (exb / "client").mkdir(parents=True)
+    repos = tmp_path / "repos"
+    clone_repos_from_config(config_file, repos, use_mirrors=False)
+    repo = repos / "app1"
+
+    (repo / "notes.txt").write_text("draft")
+    with pytest.raises(ValueError, match="uncommitted changes"):
+        remove_app_from_config("app1", config_file, repos, exb)
+    subprocess.run(["git", "add", "-A"], cwd=repo, check=True)
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "wip"],
+                   cwd=repo, check=True)
+    with pytest.raises(ValueError, match="1 unpushed commit"):
+        remove_app_from_config("app1", config_file, repos, exb)
+    assert repo.exists()
+
+    remove_app_from_config("app1", config_file, repos, exb, force=True)
+    assert not repo.exists()
+
+    with pytest.raises(ValueError, match="not a folder inside"):
+        _deletable_repo(repos, "..")
+
+    bad_config = tmp_path / "bad.json"
+    bad_config.write_text(json.dumps({"Applications": {"..": make_git_repo("parent"), ".": make_git_repo("self")}}))
+    with pytest.raises(ConfigError) as e:
+        load_app_config(bad_config)
+    assert len(e.value.errors) == 2
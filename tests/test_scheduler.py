@@ -0,0 +1,124 @@
+import io
+import json
+import threading
+import time
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from exb_dev_cli.utils import app_manager, symlinks
+from exb_dev_cli.utils.scheduler import TASK_CANCELLED, TASK_DONE, TASK_FAILED, TASK_SKIPPED, Task, run_tasks
+from tests.http_server import ArchiveServer
+
+
+def test_tasks_start_as_soon_as_their_dependencies_finish():
+    slow_started, fast_done = threading.Event(), threading.Event()
+    order = []
+
+    def slow():
+        slow_started.set()
+        # Finishes only after the dependent of the fast task has run, proving the pools overlap
+        assert fast_done.wait(5)
+        order.append("slow")
+
+    tasks = [
+        Task("slow", slow, pool="install"),
+        Task("fast", lambda: order.append("fast"), pool="clone"),
+        Task("after fast", lambda: (order.append("after fast"), fast_done.set()), deps=("fast",), pool="link"),
+        Task("after both", lambda: order.append("after both"), deps=("slow", "after fast"), pool="link"),
+    ]
+    run_tasks(tasks)
+
+    assert order == ["fast", "after fast", "slow", "after both"]
+    assert all(task.state == TASK_DONE for task in tasks)
+
+
+def test_non_fatal_failure_skips_only_dependents():
+    def fail():
+        raise OSError("clone failed")
+
+    tasks = [
+        Task("clone a", fail, fatal=False),
+        Task("link a", lambda: None, deps=("clone a",)),
+        Task("clone b", lambda: None, fatal=False),
+        Task("link b", lambda: None, deps=("clone b",)),
+    ]
+    run_tasks(tasks)
+
+    assert [task.state for task in tasks] == [TASK_FAILED, TASK_SKIPPED, TASK_DONE, TASK_DONE]
+
+
+def test_fatal_failure_cancels_waiting_tasks():
+    cancel_event = threading.Event()
+    ran = []
+
+    def fail():
+        raise RuntimeError("download failed")
+
+    tasks = [Task("install", fail, pool="install")]
+    tasks += [Task(f"clone {i}", lambda i=i: (time.sleep(0.05), ran.append(i)), pool="clone") for i in range(10)]
+    tasks += [Task("link", lambda: None, deps=("install",))]
+
+    with pytest.raises(RuntimeError, match="install failed: download failed"):
+        run_tasks(tasks, limits={"clone": 1}, cancel_event=cancel_event)
+
+    assert cancel_event.is_set()
+    assert len(ran) < 10
+    assert tasks[-1].state == TASK_CANCELLED
+    assert TASK_CANCELLED in [task.state for task in tasks[1:-1]]
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        run_tasks([Task("a", lambda: None, deps=("b",)), Task("b", lambda: None, deps=("a",))])
+
+
+def test_setup_installs_clones_and_links(make_git_repo, tmp_path, monkeypatch):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("ArcGISExperienceBuilder/client/package.json", "{}")
+        zf.writestr("ArcGISExperienceBuilder/server/public/apps/0/config.json", "{}")
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({
+        "Applications": {
+            "app1": make_git_repo("app1", {"Widgets/w/manifest.json": "{}", "AppConfig/config.json": "{}"}),
+            "app2": "file:///does/not/exist.git",
+        },
+    }))
+
+    with ArchiveServer({"/exb.zip": buffer.getvalue()}) as server:
+        versions = tmp_path / "versions.json"
+        versions.write_text(json.dumps({"Experience_Builder": {"v1.16": server.url("/exb.zip")}}))
+        monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+
+        with pytest.raises(RuntimeError, match="clone app2"):
+            app_manager.setup_workspace("v1.16", config_file, tmp_path / "exb", tmp_path / "repos", use_mirrors=False)
+
+    exb = tmp_path / "exb" / "ArcGISExperienceBuilder"
+    assert (exb / "client" / "app1_widgets").is_symlink()
+    assert (exb / "server" / "public" / "apps" / "app1" / "config.json").exists()
+    assert not (exb / "client" / "app2_widgets").exists()
+
+
+def test_setup_elevates_links_once_for_all_apps(make_git_repo, tmp_path, monkeypatch):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("ArcGISExperienceBuilder/client/package.json", "{}")
+    files = {"Widgets/w/manifest.json": "{}", "AppConfig/config.json": "{}"}
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({
+        "Applications": {"app1": make_git_repo("app1", files), "app2": make_git_repo("app2", files)},
+    }))
+
+    with ArchiveServer({"/exb.zip": buffer.getvalue()}) as server:
+        versions = tmp_path / "versions.json"
+        versions.write_text(json.dumps({"Experience_Builder": {"v1.16": server.url("/exb.zip")}}))
+        monkeypatch.setattr(app_manager, "VERSIONS_JSON", versions)
+
+        with patch.object(symlinks, "_make_link", side_effect=PermissionError), \
+                patch.object(symlinks, "_run_elevated_batch") as elevate:
+            app_manager.setup_workspace("v1.16", config_file, tmp_path / "exb", tmp_path / "repos", use_mirrors=False)
+
+    elevate.assert_called_once()
+    assert len(elevate.call_args.args[0]) == 4
@@ -0,0 +1,67 @@
+import json
+import subprocess
+
+import click.testing
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils.status import RepoStatus, parse_porcelain_v2, repo_statuses
+
+
+def git(*args, cwd):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def test_parse_porcelain_v2():
+    output = "\n".join([
+        "# branch.oid 1234",
+        "# branch.head main",
+        "# branch.upstream origin/main",
+        "# branch.ab +2 -1",
+        "1 M. N... 100644 100644 100644 abc abc staged.js",
+        "1 .M N... 100644 100644 100644 abc abc modified.js",
+        "2 RM N... 100644 100644 100644 abc abc R100 new.js\told.js",
+        "u UU N... 100644 100644 100644 100644 abc abc abc conflict.js",
+        "? untracked.js",
+    ])
+    status = parse_porcelain_v2(output, RepoStatus("app", "."))
+    assert (status.branch, status.upstream, status.ahead, status.behind) == ("main", "origin/main", 2, 1)
+    assert (status.staged, status.modified, status.conflicts, status.untracked) == (2, 2, 1, 1)
+    assert status.state == "dirty"
+
+
+def test_status_is_cached_until_git_metadata_changes(make_git_repo, tmp_path):
+    repo = tmp_path / "repos" / "app1"
+    git("clone", "-q", make_git_repo("app1"), str(repo), cwd=tmp_path)
+    repos = [("app1", repo), ("missing", tmp_path / "repos" / "missing")]
+
+    first = repo_statuses(repos)
+    assert first[0].state == "clean" and not first[0].cached
+    assert first[1].error == "not cloned"
+    assert repo_statuses(repos)[0].cached
+
+    (repo / "new.js").write_text("x")
+    git("add", "new.js", cwd=repo)
+    staged = repo_statuses(repos)[0]
+    assert not staged.cached and staged.staged == 1
+
+    git("commit", "-q", "-m", "local", cwd=repo)
+    ahead = repo_statuses(repos)[0]
+    assert (ahead.state, ahead.ahead) == ("ahead", 1)
+    assert repo_statuses(repos, refresh=True)[0].cached is False
+
+
+def test_status_command_json(make_git_repo, tmp_path):
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": make_git_repo("app1")}}))
+    repos = tmp_path / "repos"
+    runner = click.testing.CliRunner()
+    runner.invoke(cli, ["clone", "--config-file", str(config_file), "--destination", str(repos), "--no-mirror"])
+    (repos / "app1" / "README.md").write_text("edited")
+
+    table = runner.invoke(cli, ["status", "--config-file", str(config_file), "--destination", str(repos)])
+    assert "app1" in table.output and "dirty" in table.output
+
+    result = runner.invoke(cli, ["status", "--config-file", str(config_file), "--destination", str(repos), "--json"])
+    [entry] = json.loads(result.output)
+    assert entry["name"] == "app1" and entry["modified"] == 1 and entry["branch"] == "main"
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import threading
+import zipfile
+
+import pytest
+
+from exb_dev_cli.utils.extract import verify_tree
+from exb_dev_cli.utils.store import FileStore
+
+
+def make_zip(path, files):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return path
+
+
+V1 = {
+    "ArcGISExperienceBuilder/client/dist/app.js": "shared code",
+    "ArcGISExperienceBuilder/client/dist/old.js": "only in v1",
+    "ArcGISExperienceBuilder/client/package.json": "{}",
+    "ArcGISExperienceBuilder/server/public/apps/0/config.json": "{}",
+}
+V2 = dict(V1, **{"ArcGISExperienceBuilder/client/dist/old.js": "changed in v2"})
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FileStore(tmp_path / "store")
+    store.import_archive(make_zip(tmp_path / "v1.zip", V1), "1.0")
+    store.import_archive(make_zip(tmp_path / "v2.zip", V2), "2.0")
+    return store
+
+
+def test_versions_share_identical_files(store):
+    objects = [p for p in (store.root / "objects").rglob("*") if p.is_file()]
+    # app.js and "{}" are stored once for both versions, plus the two versions of old.js
+    assert len(objects) == 4
+    assert store.versions() == ["1.0", "2.0"]
+
+
+def test_workspaces_link_to_store_and_copy_modified_files(store, tmp_path):
+    first = store.materialize("1.0", tmp_path / "ws1")
+    store.materialize("2.0", tmp_path / "ws2")
+    assert first.linked == 2 and first.copied == 2
+
+    app = tmp_path / "ws1/ArcGISExperienceBuilder/client/dist/app.js"
+    other = tmp_path / "ws2/ArcGISExperienceBuilder/client/dist/app.js"
+    assert os.stat(app).st_ino == os.stat(other).st_ino
+    assert not os.access(app, os.W_OK) or os.geteuid() == 0
+
+    config = tmp_path / "ws1/ArcGISExperienceBuilder/server/public/apps/0/config.json"
+    config.write_text('{"edited": true}')
+    assert (tmp_path / "ws2/ArcGISExperienceBuilder/server/public/apps/0/config.json").read_text() == "{}"
+    assert verify_tree(tmp_path / "ws2", workers=1) == ([], [])
+
+    again = store.materialize("1.0", tmp_path / "ws1")
+    assert again.skipped == 3 and again.copied == 1
+    assert config.read_text() == "{}"
+
+
+def test_gc_keeps_objects_used_by_versions_or_workspaces(store, tmp_path):
+    store.materialize("1.0", tmp_path / "ws1")
+    store.remove_version("1.0")
+    store.remove_version("2.0")
+
+    removed, _ = store.gc()
+    # v2's old.js and the "{}" object (copied, not linked, into the workspace) are unused
+    assert removed == 2
+    assert (tmp_path / "ws1/ArcGISExperienceBuilder/client/dist/old.js").read_text() == "only in v1"
+
+
+def test_gc_does_not_delete_objects_of_a_concurrent_import(store, tmp_path, monkeypatch):
+    store.remove_version("1.0")
+    store.remove_version("2.0")
+    archive = make_zip(tmp_path / "v3.zip", dict(V1, **{"ArcGISExperienceBuilder/client/dist/new.js": "new in v3"}))
+    versions = FileStore.versions
+    importer = []
+
+    def versions_racing_import(self):
+        listed = versions(self)
+        if not importer:
+            importer.append(threading.Thread(target=self.import_archive, args=(archive, "3.0")))
+            importer[0].start()
+            # Unless gc holds its lock by now, the import finishes here, after gc listed the versions
+            importer[0].join(timeout=1)
+        return listed
+
+    monkeypatch.setattr(FileStore, "versions", versions_racing_import)
+    store.gc()
+    importer[0].join()
+
+    for meta in store.load_tree("3.0")["files"].values():
+        assert store.object_path(meta["sha256"]).exists()
+
+
+def test_reimport_of_a_different_archive_with_the_same_size(store, tmp_path):
+    archive = make_zip(tmp_path / "v1-republished.zip", dict(V1, **{"ArcGISExperienceBuilder/client/dist/old.js": "republish!"}))
+    assert archive.stat().st_size == (tmp_path / "v1.zip").stat().st_size
+
+    store.import_archive(archive, "1.0")
+    store.materialize("1.0", tmp_path / "ws")
+    assert (tmp_path / "ws/ArcGISExperienceBuilder/client/dist/old.js").read_text() == "republish!"
+
+
+def test_reimport_of_the_same_archive_returns_early(store, tmp_path, monkeypatch):
+    archive = tmp_path / "v1.zip"
+    with open(archive, "rb") as f:
+        assert store.load_tree("1.0")["archive_sha256"] == hashlib.file_digest(f, "sha256").hexdigest()
+
+    opened = []
+    monkeypatch.setattr(zipfile.ZipFile, "open", lambda self, *args, **kwargs: opened.append(args))
+    store.import_archive(archive, "1.0")
+    assert opened == []
@@ -0,0 +1,95 @@
+import json
+import os
+from unittest.mock import patch
+
+import click.testing
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils import symlinks
+from exb_dev_cli.utils.symlinks import (
+    LINK_CONFLICT, LINK_CREATE, LINK_OK, LINK_REPLACE, apply_links, diff_links, plan_links,
+)
+
+
+def make_workspace(tmp_path):
+    exb = tmp_path / "ArcGISExperienceBuilder"
+    (exb / "client").mkdir(parents=True)
+    (exb / "server" / "public" / "apps").mkdir(parents=True)
+    repos = tmp_path / "repos"
+    for app in ("app1", "app2"):
+        (repos / app / "Widgets").mkdir(parents=True)
+        (repos / app / "AppConfig").mkdir(parents=True)
+    (repos / "core_widgets").mkdir(parents=True)
+    return exb, repos
+
+
+def plan(exb, repos):
+    return plan_links(exb, [("app1", repos / "app1", "1"), ("app2", repos / "app2", None)], repos / "core_widgets")
+
+
+def states(changes):
+    return {change.link.name: change.state for change in changes}
+
+
+def test_plan_covers_widgets_configs_and_core_widgets(tmp_path):
+    exb, repos = make_workspace(tmp_path)
+
+    desired = plan(exb, repos)
+
+    assert desired[exb / "client" / "app1_widgets"] == (repos / "app1" / "Widgets").resolve()
+    assert desired[exb / "server" / "public" / "apps" / "1"] == (repos / "app1" / "AppConfig").resolve()
+    assert desired[exb / "server" / "public" / "apps" / "app2"] == (repos / "app2" / "AppConfig").resolve()
+    assert desired[exb / "client" / "pc_core_widgets"] == (repos / "core_widgets").resolve()
+
+
+def test_apply_creates_then_is_idempotent(tmp_path):
+    exb, repos = make_workspace(tmp_path)
+
+    applied = apply_links(diff_links(plan(exb, repos)))
+    assert len(applied) == 5
+    assert os.readlink(exb / "client" / "app1_widgets") == str((repos / "app1" / "Widgets").resolve())
+
+    assert set(states(diff_links(plan(exb, repos))).values()) == {LINK_OK}
+    assert apply_links(diff_links(plan(exb, repos))) == []
+
+
+def test_stale_broken_and_conflicting_links(tmp_path):
+    exb, repos = make_workspace(tmp_path)
+    os.symlink(repos / "app2" / "Widgets", exb / "client" / "app1_widgets")
+    os.symlink(tmp_path / "gone", exb / "server" / "public" / "apps" / "1")
+    (exb / "client" / "pc_core_widgets").mkdir()
+
+    changes = diff_links(plan(exb, repos))
+    assert states(changes) == {
+        "app1_widgets": LINK_REPLACE, "1": LINK_REPLACE, "pc_core_widgets": LINK_CONFLICT,
+        "app2_widgets": LINK_CREATE, "app2": LINK_CREATE,
+    }
+
+    apply_links(changes)
+    assert (exb / "client" / "app1_widgets").resolve() == (repos / "app1" / "Widgets").resolve()
+    assert (exb / "server" / "public" / "apps" / "1").resolve() == (repos / "app1" / "AppConfig").resolve()
+    assert not (exb / "client" / "pc_core_widgets").is_symlink()
+
+
+def test_permission_errors_are_elevated_in_one_batch(tmp_path):
+    exb, repos = make_workspace(tmp_path)
+
+    with patch.object(symlinks, "_make_link", side_effect=PermissionError), \
+            patch.object(symlinks, "_run_elevated_batch") as elevate:
+        apply_links(diff_links(plan(exb, repos)))
+
+    elevate.assert_called_once()
+    assert len(elevate.call_args.args[0]) == 5
+
+
+def test_link_command_dry_run(tmp_path):
+    exb, repos = make_workspace(tmp_path)
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": "https://example.com/app1.git", "app2": "https://example.com/app2.git"}, "Core_Widgets": "https://example.com/widgets.git"}))
+
+    result = click.testing.CliRunner().invoke(
+        cli, ["link", "--config-file", str(config_file), "--destination", str(repos), "--exb-path", str(exb), "--dry-run"]
+    )
+
+    assert "+ " in result.output and "5 symlink(s) would be created" in result.output
+    assert not (exb / "client" / "app1_widgets").exists()
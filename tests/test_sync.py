@@ -0,0 +1,62 @@
+import json
+import subprocess
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from exb_dev_cli.utils.app_manager import sync_repos_from_config
+
+
+def git(*args, cwd):
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@e", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def commit_file(repo, name, content):
+    (repo / name).write_text(content)
+    git("add", "-A", cwd=repo)
+    git("commit", "-m", f"add {name}", cwd=repo)
+
+
+def write_config(tmp_path, apps):
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": apps}))
+    return config_file
+
+
+def by_name(results):
+    return {r.name: r for r in results}
+
+
+def test_sync_clones_updates_and_skips_dirty(make_git_repo, tmp_path):
+    urls = {name: make_git_repo(name) for name in ("missing", "behind", "dirty", "current")}
+    config_file = write_config(tmp_path, urls)
+    work = tmp_path / "work"
+    for name in ("behind", "dirty", "current"):
+        git("clone", urls[name], str(work / name), cwd=tmp_path)
+
+    commit_file(Path(url2pathname(urlparse(urls["behind"]).path)), "new.txt", "new")
+    commit_file(Path(url2pathname(urlparse(urls["dirty"]).path)), "new.txt", "new")
+    (work / "dirty" / "README.md").write_text("local edit")
+
+    results = by_name(sync_repos_from_config(config_file, work, jobs=4))
+
+    assert results["missing"].action == "cloned"
+    assert results["behind"].action == "updated"
+    assert (work / "behind" / "new.txt").exists()
+    assert results["dirty"].action == "dirty"
+    assert not (work / "dirty" / "new.txt").exists()
+    assert results["current"].action == "up-to-date"
+
+
+def test_sync_reports_ahead_without_touching(make_git_repo, tmp_path):
+    url = make_git_repo("app")
+    config_file = write_config(tmp_path, {"app": url})
+    work = tmp_path / "work"
+    git("clone", url, str(work / "app"), cwd=tmp_path)
+    commit_file(work / "app", "local.txt", "local")
+
+    results = by_name(sync_repos_from_config(config_file, work, use_mirrors=False))
+
+    assert results["app"].action == "ahead"
@@ -0,0 +1,57 @@
+import json
+
+import click.testing
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils import tracing
+from exb_dev_cli.utils.git import run_git
+
+
+def test_spans_are_noops_when_tracing_is_off():
+    with tracing.span("anything", "test") as trace:
+        trace["bytes"] = 1
+    assert not tracing.tracing_enabled()
+
+
+def test_nested_spans_and_summary(tmp_path):
+    tracer = tracing.start_tracing()
+    try:
+        with tracing.span("download", "download") as trace:
+            trace["bytes"] = 2 * 1024 * 1024
+            run_git(["--version"], capture_output=True)
+    finally:
+        tracing.stop_tracing(tmp_path / "trace.json")
+
+    events = {e["name"]: e for e in json.loads((tmp_path / "trace.json").read_text())["traceEvents"]}
+    git_event, download = events["git --version"], events["download"]
+    assert git_event["args"]["exit_code"] == 0
+    assert download["ts"] <= git_event["ts"] and git_event["dur"] <= download["dur"]
+    assert "MiB/s" in tracer.summary()
+
+
+def test_trace_option_records_command_git_and_symlink_spans(make_git_repo, tmp_path):
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({"Applications": {"app1": make_git_repo("app1", {"Widgets/w/manifest.json": "{}"})}}))
+    repos = tmp_path / "repos"
+    exb = tmp_path / "exb"
+    (exb / "client").mkdir(parents=True)
+    trace_file = tmp_path / "trace.jsonl"
+    runner = click.testing.CliRunner()
+
+    runner.invoke(cli, ["clone", "--config-file", str(config_file), "--destination", str(repos), "--no-mirror"])
+    result = runner.invoke(cli, ["--trace", str(trace_file), "link", "--config-file", str(config_file),
+                                 "--destination", str(repos), "--exb-path", str(exb)])
+    assert result.exit_code == 0
+    assert "Trace written to" in result.output
+
+    events = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    names = {e["name"] for e in events}
+    assert "command link" in names and "symlink" in names
+
+    trace_file.unlink()
+    runner.invoke(cli, ["--trace", str(trace_file), "sync", "--config-file", str(config_file),
+                        "--destination", str(repos), "--no-mirror"])
+    events = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    fetches = [e for e in events if e["name"] == "git fetch"]
+    assert fetches and fetches[0]["args"]["exit_code"] == 0
+    assert not tracing.tracing_enabled()
@@ -0,0 +1,109 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import click.testing
+
+from exb_dev_cli.cli import cli
+from exb_dev_cli.utils.widgets import WidgetIndex, WidgetIndexCache, widget_refs
+
+
+def app_config(*uris):
+    return json.dumps({"widgets": {f"widget_{i}": {"uri": uri} for i, uri in enumerate(uris)}})
+
+
+def test_widget_refs_prefers_manifest_name():
+    config = {"widgets": {
+        "widget_1": {"uri": "widgets/common/text/"},
+        "widget_2": {"uri": "app1_widgets/folder/", "manifest": {"name": "renamed"}},
+        "widget_3": "not a widget",
+    }}
+    assert widget_refs(config) == ["renamed", "text"]
+    assert widget_refs([]) == []
+
+
+def test_index_is_cached_by_mtime(tmp_path):
+    repo = tmp_path / "app1"
+    (repo / "AppConfig").mkdir(parents=True)
+    (repo / "AppConfig" / "config.json").write_text(app_config("widgets/a/", "widgets/builtin/"))
+    for name in ("a", "b"):
+        (repo / "Widgets" / name).mkdir(parents=True)
+        (repo / "Widgets" / name / "manifest.json").write_text(json.dumps({"name": name}))
+
+    cache_file = tmp_path / "index.json"
+    cache = WidgetIndexCache(cache_file)
+    index = WidgetIndex.build([("app1", repo)], cache=cache)
+    assert index.used_widgets("app1") == ["a"]
+    assert index.graph() == {"app1": {"app": ["a"], "core": [], "other": ["builtin"]}}
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    cache = WidgetIndexCache(cache_file)
+    WidgetIndex.build([("app1", repo)], cache=cache)
+    assert (cache.hits, cache.misses) == (3, 0)
+
+    config_path = repo / "AppConfig" / "config.json"
+    config_path.write_text(app_config("widgets/a/", "widgets/b/"))
+    os.utime(config_path, ns=(1, 1))
+    cache = WidgetIndexCache(cache_file)
+    assert WidgetIndex.build([("app1", repo)], cache=cache).used_widgets("app1") == ["a", "b"]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_link_only_used_widgets_and_switch_back(make_git_repo, tmp_path):
+    files = {"AppConfig/config.json": app_config("widgets/used/", "widgets/core-used/")}
+    for name in ("used", "unused"):
+        files[f"Widgets/{name}/manifest.json"] = json.dumps({"name": name})
+    core = {f"{name}/manifest.json": json.dumps({"name": name}) for name in ("core-used", "core-unused")}
+    config_file = tmp_path / "applications.json"
+    config_file.write_text(json.dumps({
+        "Applications": {"app1": make_git_repo("app1", files)},
+        "Core_Widgets": make_git_repo("core_widgets", core),
+    }))
+    exb = tmp_path / "exb"
+    (exb / "client").mkdir(parents=True)
+    repos = tmp_path / "repos"
+    runner = click.testing.CliRunner()
+    result = runner.invoke(cli, ["clone", "--config-file", str(config_file), "--destination", str(repos), "--no-mirror"])
+    assert "Error" not in result.output, result.output
+
+    link = ["link", "--config-file", str(config_file), "--destination", str(repos), "--exb-path", str(exb)]
+    result = runner.invoke(cli, link)
+    assert (exb / "client" / "app1_widgets").is_symlink()
+
+    result = runner.invoke(cli, link + ["--only-used-widgets"])
+    assert "replaced by per-widget links" in result.output, result.output
+    widgets_dir = exb / "client" / "app1_widgets"
+    assert not widgets_dir.is_symlink()
+    assert sorted(p.name for p in widgets_dir.iterdir()) == ["used"]
+    assert (widgets_dir / "used").is_symlink()
+    assert sorted(p.name for p in (exb / "client" / "pc_core_widgets").iterdir()) == ["core-used"]
+    assert (exb / "server" / "public" / "apps" / "app1").is_symlink()
+
+    # A widget dropped from the config is unlinked on the next run
+    config_path = repos / "app1" / "AppConfig" / "config.json"
+    config_path.write_text(app_config("widgets/core-used/"))
+    os.utime(config_path, ns=(1, 1))
+    result = runner.invoke(cli, link + ["--only-used-widgets"])
+    assert "widget no longer used" in result.output
+    assert list(widgets_dir.iterdir()) == []
+
+    result = runner.invoke(cli, ["widgets", "--config-file", str(config_file), "--destination", str(repos), "--json"])
+    assert json.loads(result.output)["app1"] == {"app": [], "core": ["core-used"], "other": []}
+
+    # Linking everything again replaces the per-widget folders with whole-folder links
+    result = runner.invoke(cli, link)
+    assert "replaced by a link to the whole folder" in result.output
+    assert (exb / "client" / "app1_widgets").is_symlink()
+    assert (exb / "client" / "pc_core_widgets").is_symlink()
+
+
+def test_index_cache_can_be_saved_from_several_threads(tmp_path):
+    path = tmp_path / "widget-index.json"
+
+    def save(_):
+        for _ in range(20):
+            WidgetIndexCache(path).save()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(save, range(8)))
+    assert json.loads(path.read_text()) == {}